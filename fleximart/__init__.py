@@ -0,0 +1,6 @@
+"""
+FlexiMart shared runtime helpers
+Code used by more than one part of the project (part1 ETL, part2 document
+store, part3 warehouse) lives here; the part directories stay runnable as
+plain scripts
+"""
@@ -0,0 +1,10 @@
+import os
+import sys
+
+# Also runnable as `python path/to/fleximart ...` from any directory
+if not __package__:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from fleximart.cli import main
+
+raise SystemExit(main())
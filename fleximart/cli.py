@@ -0,0 +1,236 @@
+"""
+FlexiMart Command-Line Interface
+python -m fleximart etl|docstore|warehouse|serve ...
+Only argparse is imported up front; each command imports its part's modules
+(and pandas/numpy where needed) when it runs, so --help and the SQLite-only
+warehouse commands start without loading the dataframe stack.
+"""
+
+import argparse
+import importlib
+import os
+import sys
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+PART_DIRS = {
+    'etl': os.path.join(PROJECT_ROOT, 'part1-database-etl'),
+    'docstore': os.path.join(PROJECT_ROOT, 'part2-nosql'),
+    'warehouse': os.path.join(PROJECT_ROOT, 'part3-datawarehouse'),
+}
+
+
+def load_part_module(part, name):
+    """Import a script module from a part directory (the directories are not packages)"""
+    directory = PART_DIRS[part]
+    if directory not in sys.path:
+        sys.path.insert(0, directory)
+    return importlib.import_module(name)
+
+
+def print_table(columns, rows):
+    print(" | ".join(columns))
+    for row in rows:
+        print(" | ".join(str(v) for v in row))
+
+
+# ----------------------------------------------------------------------------
+# etl
+# ----------------------------------------------------------------------------
+def cmd_etl_run(args):
+    from fleximart.logs import configure_logging
+
+    if args.output_dir:
+        os.makedirs(args.output_dir, exist_ok=True)
+        os.chdir(args.output_dir)     # the pipeline writes its CSVs/report to the working directory
+    etl = load_part_module('etl', 'etl_pipeline_standalone')
+    configure_logging(etl.LOG_FILE)
+    pipeline = etl.ETLPipeline(use_database=args.use_database, backend=args.backend)
+    return 0 if pipeline.run_pipeline() else 1
+
+
+# ----------------------------------------------------------------------------
+# docstore
+# ----------------------------------------------------------------------------
+def _open_docstore(args):
+    from fleximart.logs import configure_logging
+
+    docstore = load_part_module('docstore', 'mongodb_operations_standalone')
+    configure_logging(docstore.log_file)
+    ops = docstore.MongoDBOperationsStandalone(storage_dir=args.storage_dir, use_columnar=args.columnar)
+    if not ops.products and not ops.load_data(args.catalog):
+        return None
+    return ops
+
+
+def cmd_docstore_run(args):
+    from fleximart.logs import configure_logging
+
+    docstore = load_part_module('docstore', 'mongodb_operations_standalone')
+    configure_logging(docstore.log_file)
+    docstore.main()
+    return 0
+
+
+def cmd_docstore_query(args):
+    ops = _open_docstore(args)
+    if ops is None:
+        return 1
+    {'electronics': ops.basic_query, 'reviews': ops.review_analysis,
+     'categories': ops.category_analysis}[args.query]()
+    ops.close()
+    return 0
+
+
+# ----------------------------------------------------------------------------
+# warehouse
+# ----------------------------------------------------------------------------
+def cmd_warehouse_load(args):
+    loader = load_part_module('warehouse', 'warehouse_loader')
+    loader.main(['--partition-dir', args.partition_dir] if args.partition_dir else [])
+    return 0
+
+
+def _open_warehouse(path):
+    import sqlite3
+
+    if not os.path.exists(path):
+        print(f"[ERROR] No warehouse at {path}; run 'python -m fleximart warehouse load' first")
+        return None
+    return sqlite3.connect(path)
+
+
+def cmd_warehouse_refresh(args):
+    cubes = load_part_module('warehouse', 'summary_cubes')
+    connection = _open_warehouse(args.db or cubes.DEFAULT_DW_PATH)
+    if connection is None:
+        return 1
+    cubes.SummaryCubeRefresher(connection).refresh()
+    connection.close()
+    return 0
+
+
+def cmd_warehouse_segments(args):
+    cubes = load_part_module('warehouse', 'summary_cubes')
+    spend = load_part_module('warehouse', 'customer_spend')
+    connection = _open_warehouse(args.db or cubes.DEFAULT_DW_PATH)
+    if connection is None:
+        return 1
+    print_table(*spend.CustomerSpendTable(connection).segment_report())
+    connection.close()
+    return 0
+
+
+def cmd_warehouse_rollups(args):
+    cubes = load_part_module('warehouse', 'summary_cubes')
+    connection = _open_warehouse(args.db or cubes.DEFAULT_DW_PATH)
+    if connection is None:
+        return 1
+    for name, (columns, rows) in cubes.run_rollup_queries(connection).items():
+        if args.name and args.name.lower() not in name.lower():
+            continue
+        print(f"\n{name}")
+        print("-" * 70)
+        print_table(columns, rows)
+    connection.close()
+    return 0
+
+
+def cmd_warehouse_report(args):
+    olap = load_part_module('warehouse', 'olap_engine')
+    if args.list:
+        for name in olap.REPORTS:
+            print(name)
+        return 0
+    matches = [name for name in olap.REPORTS if args.name and args.name.lower() in name.lower()]
+    if not matches:
+        print(f"[ERROR] No report matching {args.name!r}; use --list")
+        return 1
+    if args.db:
+        schema = olap.StarSchema.from_sqlite(args.db)
+    else:
+        schema = olap.StarSchema.from_csv(PART_DIRS['warehouse'])
+    engine = olap.OLAPEngine(schema)
+    for name in matches:
+        print("\n" + "="*70)
+        print(name)
+        print("="*70)
+        print(engine.run_report(name).to_string(index=False))
+    return 0
+
+
+# ----------------------------------------------------------------------------
+# serve
+# ----------------------------------------------------------------------------
+def cmd_serve(args):
+    import asyncio
+    from fleximart.logs import configure_logging
+    from fleximart.query_service import serve
+
+    configure_logging(os.path.join(PROJECT_ROOT, 'query_service.log'))
+    try:
+        asyncio.run(serve(args))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='fleximart', description='FlexiMart data platform commands')
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    etl = commands.add_parser('etl', help='Part 1: ETL pipeline').add_subparsers(dest='action', required=True)
+    run = etl.add_parser('run', help='extract, clean and write the *_cleaned.csv files and quality report')
+    run.add_argument('--output-dir', help='directory for outputs (default: current directory)')
+    run.add_argument('--use-database', action='store_true', help='also connect to MySQL')
+    run.add_argument('--backend', choices=['pandas', 'polars'], default='pandas',
+                     help='dataframe backend (pandas is the reference)')
+    run.set_defaults(handler=cmd_etl_run)
+
+    docstore = commands.add_parser('docstore', help='Part 2: standalone document store')
+    docstore_actions = docstore.add_subparsers(dest='action', required=True)
+    run = docstore_actions.add_parser('run', help='run all five MongoDB operations')
+    run.set_defaults(handler=cmd_docstore_run)
+    query = docstore_actions.add_parser('query', help='run one operation')
+    query.add_argument('query', choices=['electronics', 'reviews', 'categories'])
+    query.add_argument('--catalog', default=os.path.join(PART_DIRS['docstore'], 'products_catalog.json'))
+    query.add_argument('--storage-dir', help='persistent store (snapshot + WAL) instead of the JSON file')
+    query.add_argument('--columnar', action='store_true', help='vectorized columnar catalog (numpy)')
+    query.set_defaults(handler=cmd_docstore_query)
+
+    warehouse = commands.add_parser('warehouse', help='Part 3: data warehouse')
+    warehouse_actions = warehouse.add_subparsers(dest='action', required=True)
+    load = warehouse_actions.add_parser('load', help='load cleaned ETL output into fleximart_dw.sqlite')
+    load.add_argument('--partition-dir', help='also write a month-partitioned fact store')
+    load.set_defaults(handler=cmd_warehouse_load)
+    for name, handler, help_text in [
+            ('refresh', cmd_warehouse_refresh, 'incrementally refresh the summary cubes'),
+            ('segments', cmd_warehouse_segments, 'customer segment report from customer_spend'),
+            ('rollups', cmd_warehouse_rollups, 'run analytics_rollup_queries.sql')]:
+        action = warehouse_actions.add_parser(name, help=help_text)
+        action.add_argument('--db', help='warehouse SQLite file (default: part3-datawarehouse/fleximart_dw.sqlite)')
+        action.set_defaults(handler=handler)
+    warehouse_actions.choices['rollups'].add_argument('name', nargs='?', help='only queries whose name contains this')
+    report = warehouse_actions.add_parser('report', help='analytics_queries.sql report via the in-process OLAP engine')
+    report.add_argument('name', nargs='?', help='report name or part of it (e.g. "Query 1")')
+    report.add_argument('--list', action='store_true', help='list report names')
+    report.add_argument('--db', help='read the star from a SQLite warehouse instead of Final*.csv')
+    report.set_defaults(handler=cmd_warehouse_report)
+
+    serve = commands.add_parser('serve', help='async query service for the document store and warehouse reports')
+    serve.add_argument('--host', default='127.0.0.1')
+    serve.add_argument('--port', type=int, default=8765)
+    serve.add_argument('--unix', help='also listen on this Unix socket path')
+    serve.add_argument('--no-tcp', action='store_true', help='only listen on --unix')
+    serve.add_argument('--catalog', default=os.path.join(PART_DIRS['docstore'], 'products_catalog.json'))
+    serve.add_argument('--storage-dir', help='persistent document store (snapshot + WAL)')
+    serve.add_argument('--warehouse-db', help='SQLite warehouse for reports (default: Final*.csv exports)')
+    serve.add_argument('--workers', type=int, default=4, help='document store executor threads')
+    serve.add_argument('--report-workers', type=int, default=2, help='warehouse report executor workers')
+    serve.add_argument('--report-executor', choices=['process', 'thread'], default='process')
+    serve.set_defaults(handler=cmd_serve)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    return args.handler(args)
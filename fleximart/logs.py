@@ -0,0 +1,145 @@
+"""
+Non-blocking, Rate-Limited Logging for FlexiMart
+Shared by the ETL pipeline and the document store
+- Records go through a QueueHandler; a QueueListener thread does the file I/O
+- RateLimitFilter groups records by message template (logger, level, msg
+  before %-formatting): the first `limit` per `interval` seconds pass, the
+  rest are only counted, with the first `samples` argument tuples kept
+- summary_lines() aggregates the counts for reports, e.g.
+  "3,412,220 x WARNING Could not parse date: %s; first 10 samples: ..."
+Log calls must use %-style arguments (logging.warning("... %s", value)) so
+repeated messages share a template.
+"""
+
+import atexit
+import logging
+import logging.handlers
+import queue
+import threading
+
+LOG_FORMAT = '%(asctime)s - %(levelname)s - %(message)s'
+
+
+class RateLimitFilter(logging.Filter):
+    """Per-template rate limit with aggregated counts and argument samples"""
+
+    def __init__(self, limit=10, interval=60.0, samples=10):
+        super().__init__()
+        self.limit = limit
+        self.interval = interval
+        self.samples = samples
+        self._lock = threading.Lock()
+        self._stats = {}    # (logger, levelno, template) -> [total, suppressed, window_start, window_count, samples]
+
+    def filter(self, record):
+        key = (record.name, record.levelno, str(record.msg))
+        now = record.created
+        with self._lock:
+            stats = self._stats.get(key)
+            if stats is None:
+                stats = self._stats[key] = [0, 0, now, 0, []]
+            stats[0] += 1
+            if len(stats[4]) < self.samples:
+                stats[4].append(record.args)
+            if now - stats[2] >= self.interval:
+                stats[2], stats[3] = now, 0
+            if stats[3] >= self.limit:
+                stats[1] += 1
+                return False
+            stats[3] += 1
+            return True
+
+    def summary(self, min_count=2, min_level=logging.WARNING):
+        """[(total, suppressed, level name, template, samples)] for repeated templates, most frequent first"""
+        with self._lock:
+            rows = [(stats[0], stats[1], logging.getLevelName(level), template, list(stats[4]))
+                    for (_, level, template), stats in self._stats.items()
+                    if stats[0] >= min_count and level >= min_level]
+        return sorted(rows, key=lambda row: -row[0])
+
+    def reset(self):
+        with self._lock:
+            self._stats.clear()
+
+
+def _format_sample(args):
+    if isinstance(args, tuple):
+        return args[0] if len(args) == 1 else args
+    return args
+
+
+class LogSession:
+    """Root logger wired to a background file writer through a queue"""
+
+    def __init__(self, log_file, level=logging.INFO, limit=10, interval=60.0, samples=10):
+        self.log_file = log_file
+        self.rate_limit = RateLimitFilter(limit, interval, samples)
+        self.queue = queue.SimpleQueue()
+        file_handler = logging.FileHandler(log_file, encoding='utf-8')
+        file_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+        self.listener = logging.handlers.QueueListener(self.queue, file_handler, respect_handler_level=True)
+        self.handler = logging.handlers.QueueHandler(self.queue)
+        self.handler.addFilter(self.rate_limit)
+
+        root = logging.getLogger()
+        root.setLevel(level)
+        root.addHandler(self.handler)
+        self.listener.start()
+
+    def summary_lines(self, min_count=2, min_level=logging.WARNING):
+        """Human-readable aggregated counts for repeated warnings/errors"""
+        lines = []
+        for total, suppressed, level, template, samples in self.rate_limit.summary(min_count, min_level):
+            shown = ', '.join(repr(_format_sample(args)) for args in samples if args)
+            line = f"{total:,} x {level} {template}"
+            if suppressed:
+                line += f" ({suppressed:,} not written)"
+            if shown:
+                line += f"; first {len(samples)} samples: {shown}"
+            lines.append(line)
+        return lines
+
+    def flush(self):
+        """Wait until queued records are written"""
+        self.listener.stop()
+        self.listener.start()
+
+    def close(self):
+        root = logging.getLogger()
+        root.removeHandler(self.handler)
+        self.listener.stop()
+        for handler in self.listener.handlers:
+            handler.close()
+
+
+_session = None
+
+
+def configure_logging(log_file, level=logging.INFO, limit=10, interval=60.0, samples=10):
+    """
+    Configure process-wide logging once (later calls return the same session)
+    Call from entry points only; library modules just use logging.*
+    """
+    global _session
+    if _session is None:
+        _session = LogSession(log_file, level, limit, interval, samples)
+        atexit.register(shutdown_logging)
+    return _session
+
+
+def get_session():
+    return _session
+
+
+def log_summary_lines(min_count=2, min_level=logging.WARNING):
+    """Aggregated repeated-message lines, or [] when logging is not configured here"""
+    return _session.summary_lines(min_count, min_level) if _session else []
+
+
+def shutdown_logging():
+    """Flush the background writer and detach it from the root logger"""
+    global _session
+    if _session is not None:
+        _session.close()
+        _session = None
+
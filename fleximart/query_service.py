@@ -0,0 +1,448 @@
+"""
+Async Query Service for FlexiMart
+python -m fleximart serve [--port 8765] [--unix PATH]
+A local asyncio HTTP/1.1 service (TCP and/or Unix socket) in front of the
+standalone document store and the warehouse OLAP reports, so applications
+query over a socket instead of running the scripts and parsing stdout.
+
+  GET  /health                    liveness and collection version
+  GET  /metrics                   per-endpoint latency histograms
+  POST /docstore/find             {"filter", "projection", "sort", "skip", "limit", "stream"}
+  POST /docstore/aggregate        {"pipeline", "stream"}
+  GET  /warehouse/reports         report ids and names (analytics_queries.sql)
+  GET  /warehouse/reports/<id>    ?stream=1 and report arguments (year=2024, top_n=5, ...)
+  POST /batch                     {"requests": [{"method", "path", "body"}, ...]}
+
+- The event loop only parses and writes; queries run in executors: a thread
+  pool for the document store (shared in memory behind its readers-writer
+  lock) and a process pool for warehouse reports (pandas/NumPy work that
+  would otherwise hold the GIL), each worker loading the star schema once.
+- Identical requests in flight at the same time share one execution, and
+  /batch runs many requests concurrently in one round trip.
+- "stream": true (or ?stream=1, or Accept: application/x-ndjson) returns
+  rows as chunked NDJSON, written in slices with backpressure.
+"""
+
+import asyncio
+import json
+import logging
+import multiprocessing
+import os
+import re
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from urllib.parse import parse_qsl, urlsplit
+
+from fleximart.cli import PART_DIRS, load_part_module
+
+STREAM_CHUNK_ROWS = 500
+MAX_BODY_BYTES = 16 * 1024 * 1024
+NDJSON = 'application/x-ndjson'
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed',
+           413: 'Payload Too Large', 500: 'Internal Server Error'}
+
+
+class ServiceError(Exception):
+    """A request error reported to the client with an HTTP status"""
+
+    def __init__(self, status, message):
+        super().__init__(message)
+        self.status = status
+
+
+class LatencyHistogram:
+    """Fixed-bucket latency histogram (milliseconds) with percentile estimates"""
+
+    BOUNDS_MS = (0.5, 1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+    def __init__(self):
+        self.counts = [0] * (len(self.BOUNDS_MS) + 1)
+        self.count = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+
+    def record(self, elapsed_ms):
+        index = next((i for i, bound in enumerate(self.BOUNDS_MS) if elapsed_ms <= bound), len(self.BOUNDS_MS))
+        self.counts[index] += 1
+        self.count += 1
+        self.total_ms += elapsed_ms
+        self.max_ms = max(self.max_ms, elapsed_ms)
+
+    def percentile(self, fraction):
+        """Upper bound of the bucket holding the given fraction of requests"""
+        target = fraction * self.count
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if count and seen >= target:
+                return self.BOUNDS_MS[index] if index < len(self.BOUNDS_MS) else self.max_ms
+        return 0.0
+
+    def snapshot(self):
+        labels = [f"le_{bound}ms" for bound in self.BOUNDS_MS] + ['inf']
+        return {
+            'count': self.count,
+            'mean_ms': self.total_ms / self.count if self.count else 0.0,
+            'max_ms': self.max_ms,
+            'p50_ms': self.percentile(0.50),
+            'p95_ms': self.percentile(0.95),
+            'p99_ms': self.percentile(0.99),
+            'buckets': {label: count for label, count in zip(labels, self.counts) if count},
+        }
+
+
+# URL id -> olap_engine.REPORTS name (an analytics_queries.sql heading). The
+# ids are part of the service API: keep them when a heading is reworded.
+REPORT_IDS = {
+    'monthly-drill-down': 'Query 1: Monthly Sales Drill-Down Analysis',
+    'monthly-drill-down-cumulative': 'Alternative with Cumulative (Running Total) - Advanced Drill-Down',
+    'product-performance': 'Query 2: Product Performance Analysis',
+    'product-performance-cte': 'Alternative with CTE for clarity',
+    'customer-segmentation': 'Query 3: Customer Segmentation Analysis',
+    'weekday-weekend': 'Query: Sales by Day of Week (Weekend vs Weekday Analysis)',
+    'top-categories': 'Query: Top Categories by Revenue',
+    'city-analysis': 'Query: Customer City Analysis',
+    'monthly-growth': 'Query: Monthly Growth Analysis',
+    'product-city-matrix': 'Query: Product-Customer Matrix (Top 5 products for each city)',
+    'discount-impact': 'Query: Discount Impact Analysis',
+    'quarter-over-quarter': 'Query: Quarter-over-Quarter Performance',
+}
+
+
+# Warehouse workers: each executor worker builds the OLAP engine once
+_warehouse = {}
+
+
+def init_warehouse(warehouse_db=None):
+    """Load the star schema (a SQLite warehouse or the Final*.csv exports) in this process"""
+    olap = load_part_module('warehouse', 'olap_engine')
+    if warehouse_db:
+        schema = olap.StarSchema.from_sqlite(warehouse_db)
+    else:
+        schema = olap.StarSchema.from_csv(PART_DIRS['warehouse'])
+    _warehouse['engine'] = olap.OLAPEngine(schema)
+    unnamed = [name for name in olap.REPORTS if name not in REPORT_IDS.values()]
+    if unnamed:
+        raise RuntimeError(f"Reports without a REPORT_IDS entry: {unnamed}")
+    _warehouse['reports'] = {rid: name for rid, name in REPORT_IDS.items() if name in olap.REPORTS}
+
+
+def run_report(report, params):
+    """Run one named report; rows as JSON-ready dicts"""
+    frame = _warehouse['engine'].run_report(_warehouse['reports'][report], **params)
+    return json.loads(frame.to_json(orient='records', date_format='iso'))
+
+
+class QueryService:
+    """Routes, executors, request coalescing and metrics for one store + warehouse"""
+
+    def __init__(self, store, warehouse_db=None, doc_workers=4, report_workers=2, report_executor='process'):
+        self.store = store
+        self.warehouse_db = warehouse_db
+        self.doc_executor = ThreadPoolExecutor(max_workers=doc_workers, thread_name_prefix='docstore')
+        if report_executor == 'process':
+            # spawn: forking a process that already runs executor threads is unsafe
+            self.report_executor = ProcessPoolExecutor(max_workers=report_workers,
+                                                       mp_context=multiprocessing.get_context('spawn'),
+                                                       initializer=init_warehouse, initargs=(warehouse_db,))
+        else:
+            self.report_executor = ThreadPoolExecutor(max_workers=report_workers, thread_name_prefix='warehouse')
+        init_warehouse(warehouse_db)      # report ids, and the engine for thread workers
+        self.reports = dict(_warehouse['reports'])
+        self.histograms = {}
+        self.coalesced = 0
+        self._inflight = {}
+        # (method, path pattern, endpoint label for metrics, handler)
+        self.routes = [
+            ('GET', r'/health', '/health', self.health),
+            ('GET', r'/metrics', '/metrics', self.metrics),
+            ('POST', r'/docstore/find', '/docstore/find', self.docstore_find),
+            ('POST', r'/docstore/aggregate', '/docstore/aggregate', self.docstore_aggregate),
+            ('GET', r'/warehouse/reports', '/warehouse/reports', self.list_reports),
+            ('GET', r'/warehouse/reports/(?P<report>[a-z0-9-]+)', '/warehouse/reports/<id>', self.warehouse_report),
+            ('POST', r'/warehouse/reports/(?P<report>[a-z0-9-]+)', '/warehouse/reports/<id>', self.warehouse_report),
+            ('POST', r'/batch', '/batch', self.batch),
+        ]
+        self.routes = [(method, re.compile(pattern + '$'), label, handler)
+                       for method, pattern, label, handler in self.routes]
+
+    def close(self):
+        self.doc_executor.shutdown(wait=True)
+        self.report_executor.shutdown(wait=True)
+
+    # ------------------------------------------------------------------
+    # Dispatch
+    # ------------------------------------------------------------------
+    def route(self, method, path):
+        """(endpoint label, handler, path parameters) for a request"""
+        allowed = False
+        for route_method, pattern, label, handler in self.routes:
+            found = pattern.match(path)
+            if found:
+                if route_method == method:
+                    return f"{method} {label}", handler, found.groupdict()
+                allowed = True
+        if allowed:
+            raise ServiceError(405, f"{method} not allowed on {path}")
+        raise ServiceError(404, f"No endpoint {path}")
+
+    async def dispatch(self, method, target, body, headers=None):
+        """
+        Run one request; returns (status, endpoint label, result)
+        result is a dict for JSON responses or {'rows': [...], 'stream': bool} for row results
+        """
+        parts = urlsplit(target)
+        query = dict(parse_qsl(parts.query))
+        start = time.perf_counter()
+        endpoint = 'unrouted'
+        try:
+            endpoint, handler, params = self.route(method, parts.path)
+            result = await handler({} if body is None else body, query, **params)
+            if isinstance(result, dict) and 'rows' in result:
+                result['stream'] = ((isinstance(body, dict) and bool(body.get('stream')))
+                                    or query.get('stream') in ('1', 'true')
+                                    or NDJSON in (headers or {}).get('accept', ''))
+            status = 200
+        except ServiceError as e:
+            status, result = e.status, {'error': str(e)}
+        except (ValueError, KeyError, TypeError) as e:
+            status, result = 400, {'error': f"{type(e).__name__}: {e}"}
+        except Exception as e:
+            logging.exception("Query service error on %s %s", method, target)
+            status, result = 500, {'error': f"{type(e).__name__}: {e}"}
+        self.histograms.setdefault(endpoint, LatencyHistogram()).record((time.perf_counter() - start) * 1000)
+        return status, endpoint, result
+
+    async def _coalesced(self, key, run):
+        """Share one execution between identical concurrent requests"""
+        future = self._inflight.get(key)
+        if future is not None:
+            self.coalesced += 1
+            return await asyncio.shield(future)
+        future = asyncio.ensure_future(run())
+        self._inflight[key] = future
+        try:
+            return await asyncio.shield(future)
+        finally:
+            if self._inflight.get(key) is future:
+                del self._inflight[key]
+
+    async def _in_executor(self, executor, function, *args):
+        return await asyncio.get_running_loop().run_in_executor(executor, function, *args)
+
+    # ------------------------------------------------------------------
+    # Endpoints
+    # ------------------------------------------------------------------
+    async def health(self, body, query):
+        return {'status': 'ok', 'documents': len(self.store.products), 'version': self.store.version}
+
+    async def metrics(self, body, query):
+        return {
+            'endpoints': {name: histogram.snapshot() for name, histogram in sorted(self.histograms.items())},
+            'coalesced_requests': self.coalesced,
+            'query_cache': self.store.cache_stats(),
+            'docstore_lock': self.store.lock.stats(),
+        }
+
+    def _snapshot_rows(self, query_method, *args):
+        """Run a store query and serialize its rows under one read lock (a consistent snapshot)"""
+        with self.store.lock.read():
+            return [json.dumps(row, default=str) for row in query_method(*args)]
+
+    async def docstore_find(self, body, query):
+        if not isinstance(body, dict):
+            raise ValueError("find body must be a JSON object")
+        args = (body.get('filter') or {}, body.get('projection'), body.get('sort'),
+                int(body.get('skip', 0)), int(body.get('limit', 0)))
+        key = ('find', self.store.version, json.dumps(args, sort_keys=True))
+        rows = await self._coalesced(key, lambda: self._in_executor(
+            self.doc_executor, self._snapshot_rows, self.store.find, *args))
+        return {'rows': rows, 'encoded': True}
+
+    async def docstore_aggregate(self, body, query):
+        pipeline = body.get('pipeline') if isinstance(body, dict) else None
+        if not isinstance(pipeline, list):
+            raise ValueError("aggregate body needs a 'pipeline' list")
+        key = ('aggregate', self.store.version, json.dumps(pipeline, sort_keys=True))
+        rows = await self._coalesced(key, lambda: self._in_executor(
+            self.doc_executor, self._snapshot_rows, self.store.aggregate, pipeline))
+        return {'rows': rows, 'encoded': True}
+
+    async def list_reports(self, body, query):
+        return {'reports': [{'id': rid, 'name': name} for rid, name in self.reports.items()]}
+
+    async def warehouse_report(self, body, query, report):
+        if report not in self.reports:
+            raise ServiceError(404, f"No report {report!r}; see /warehouse/reports")
+        params = {key: int(value) if value.lstrip('-').isdigit() else value
+                  for key, value in query.items() if key != 'stream'}
+        if isinstance(body, dict):
+            params.update(body.get('params') or {})
+        key = ('report', report, json.dumps(params, sort_keys=True))
+        rows = await self._coalesced(key, lambda: self._in_executor(
+            self.report_executor, run_report, report, params))
+        return {'rows': rows}
+
+    async def batch(self, body, query):
+        requests = body.get('requests') if isinstance(body, dict) else None
+        if not isinstance(requests, list):
+            raise ValueError("batch body needs a 'requests' list")
+        if not all(isinstance(request, dict) for request in requests):
+            raise ValueError("every batch request must be a JSON object")
+        if any(str(request.get('path', '')).startswith('/batch') for request in requests):
+            raise ValueError("batches cannot be nested")
+
+        async def one(request):
+            status, endpoint, result = await self.dispatch(str(request.get('method', 'POST')).upper(),
+                                                           str(request.get('path', '')), request.get('body'))
+            if isinstance(result, dict) and result.get('encoded'):
+                result = {'rows': [json.loads(line) for line in result['rows']]}
+            elif isinstance(result, dict):
+                result.pop('stream', None)
+            return {'status': status, 'endpoint': endpoint, 'result': result}
+
+        return {'responses': await asyncio.gather(*(one(request) for request in requests))}
+
+    # ------------------------------------------------------------------
+    # HTTP
+    # ------------------------------------------------------------------
+    async def handle_connection(self, reader, writer):
+        """Serve HTTP/1.1 requests on one connection (keep-alive until the client closes)"""
+        try:
+            while True:
+                request = await self._read_request(reader, writer)
+                if request is None:
+                    break
+                method, target, headers, body, keep_alive = request
+                status, _, result = await self.dispatch(method, target, body, headers)
+                await self._write_response(writer, status, result, keep_alive)
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            writer.close()
+            try:
+                await writer.wait_closed()
+            except ConnectionError:
+                pass
+
+    async def _read_request(self, reader, writer):
+        line = await reader.readline()
+        if not line.strip():
+            return None
+        try:
+            method, target, version = line.decode('latin-1').split()
+        except ValueError:
+            await self._write_response(writer, 400, {'error': 'Malformed request line'}, False)
+            return None
+        headers = {}
+        while True:
+            header = await reader.readline()
+            if header in (b'\r\n', b'\n', b''):
+                break
+            name, _, value = header.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        try:
+            length = int(headers.get('content-length', 0) or 0)
+        except ValueError:
+            length = -1
+        if length < 0:
+            # Without a usable length the body cannot be skipped, so the connection closes
+            await self._write_response(writer, 400, {'error': 'Invalid Content-Length header'}, False)
+            return None
+        if length > MAX_BODY_BYTES:
+            await self._write_response(writer, 413, {'error': 'Request body too large'}, False)
+            return None
+        body = {}
+        if length:
+            raw = await reader.readexactly(length)
+            try:
+                body = json.loads(raw)
+            except json.JSONDecodeError as e:
+                await self._write_response(writer, 400, {'error': f"Invalid JSON body: {e}"}, True)
+                return await self._read_request(reader, writer)
+        keep_alive = headers.get('connection', '').lower() != 'close' and version == 'HTTP/1.1'
+        return method.upper(), target, headers, body, keep_alive
+
+    async def _write_response(self, writer, status, result, keep_alive):
+        head = [f"HTTP/1.1 {status} {REASONS.get(status, 'OK')}",
+                f"Connection: {'keep-alive' if keep_alive else 'close'}"]
+        if isinstance(result, dict) and 'rows' in result and result.get('stream'):
+            await self._stream_rows(writer, head, result)
+            return
+        if isinstance(result, dict) and 'rows' in result:
+            rows = result['rows']
+            encoded = ('[' + ','.join(rows) + ']') if result.get('encoded') else json.dumps(rows)
+            payload = ('{"count":%d,"rows":%s}' % (len(rows), encoded)).encode('utf-8')
+        else:
+            payload = json.dumps(result, default=str).encode('utf-8')
+        head += ['Content-Type: application/json', f"Content-Length: {len(payload)}"]
+        writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1') + payload)
+        await writer.drain()
+
+    async def _stream_rows(self, writer, head, result):
+        """Chunked NDJSON, one row per line, draining after every slice of rows"""
+        head += [f"Content-Type: {NDJSON}", 'Transfer-Encoding: chunked']
+        writer.write(('\r\n'.join(head) + '\r\n\r\n').encode('latin-1'))
+        rows = result['rows']
+        for start in range(0, len(rows), STREAM_CHUNK_ROWS):
+            chunk_rows = rows[start:start + STREAM_CHUNK_ROWS]
+            lines = chunk_rows if result.get('encoded') else [json.dumps(row) for row in chunk_rows]
+            data = ('\n'.join(lines) + '\n').encode('utf-8')
+            writer.write(b'%x\r\n%s\r\n' % (len(data), data))
+            await writer.drain()
+        writer.write(b'0\r\n\r\n')
+        await writer.drain()
+
+    async def start(self, host='127.0.0.1', port=8765, unix_path=None):
+        """Start the TCP server (port None to skip) and/or a Unix socket server"""
+        servers = []
+        if port is not None:
+            servers.append(await asyncio.start_server(self.handle_connection, host, port))
+        if unix_path:
+            if os.path.exists(unix_path):
+                os.unlink(unix_path)
+            servers.append(await asyncio.start_unix_server(self.handle_connection, unix_path))
+        return servers
+
+
+def open_store(catalog=None, storage_dir=None):
+    """Standalone document store, recovered from storage_dir or loaded from the JSON catalog"""
+    docstore = load_part_module('docstore', 'mongodb_operations_standalone')
+    store = docstore.MongoDBOperationsStandalone(storage_dir=storage_dir)
+    if not store.products and not store.load_data(catalog or os.path.join(PART_DIRS['docstore'],
+                                                                          'products_catalog.json')):
+        raise RuntimeError("Could not load the product catalog")
+    return store
+
+
+async def serve(args):
+    store = open_store(args.catalog, args.storage_dir)
+    service = QueryService(store, warehouse_db=args.warehouse_db, doc_workers=args.workers,
+                           report_workers=args.report_workers, report_executor=args.report_executor)
+    servers = await service.start(args.host, None if args.no_tcp else args.port, args.unix)
+    for server in servers:
+        for sock in server.sockets:
+            print(f"[INFO] Query service listening on {sock.getsockname()}")
+    # SIGINT/SIGTERM stop accepting, let in-flight requests finish, then close the store
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGINT, signal.SIGTERM):
+        try:
+            loop.add_signal_handler(sig, stop.set)
+        except NotImplementedError:     # Windows: Ctrl+C raises KeyboardInterrupt instead
+            pass
+    try:
+        await stop.wait()
+    finally:
+        for server in servers:
+            server.close()
+            await server.wait_closed()
+        service.close()
+        store.close()
+        if args.unix and os.path.exists(args.unix):
+            os.unlink(args.unix)
+        print("[INFO] Query service stopped")
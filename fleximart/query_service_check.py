@@ -0,0 +1,236 @@
+"""
+Local End-to-End Check for the Query Service
+python -m fleximart.query_service_check [--clients N] [--report-executor process|thread]
+Starts the service in-process on an ephemeral TCP port and a Unix socket,
+then checks every endpoint against direct calls on the same store/engine:
+find and aggregate (the five-operation queries), warehouse reports, NDJSON
+streaming, /batch, request coalescing, error statuses, and that /metrics
+counted every request. Also reports throughput for N concurrent clients.
+Exits 1 on any mismatch.
+"""
+
+import argparse
+import asyncio
+import contextlib
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+
+from fleximart.logs import configure_logging
+from fleximart.query_service import QueryService, init_warehouse, open_store, run_report
+
+ELECTRONICS_UNDER_50K = {
+    'filter': {'category': 'Electronics', 'price': {'$lt': 50000}},
+    'projection': {'name': 1, 'price': 1, 'stock': 1, '_id': 0},
+}
+CATEGORY_PIPELINE = [
+    {'$group': {'_id': '$category', 'avg_price': {'$avg': '$price'}, 'product_count': {'$sum': 1},
+                'min_price': {'$min': '$price'}, 'max_price': {'$max': '$price'},
+                'total_stock': {'$sum': '$stock'}}},
+    {'$sort': {'avg_price': -1}},
+]
+
+
+async def http_request(reader, writer, method, path, body=None, headers=None):
+    """Send one request on an open connection; returns (status, headers, raw body bytes)"""
+    payload = json.dumps(body).encode('utf-8') if body is not None else b''
+    lines = [f"{method} {path} HTTP/1.1", "Host: localhost", f"Content-Length: {len(payload)}"]
+    lines += [f"{name}: {value}" for name, value in (headers or {}).items()]
+    writer.write(('\r\n'.join(lines) + '\r\n\r\n').encode('latin-1') + payload)
+    await writer.drain()
+
+    status = int((await reader.readline()).split()[1])
+    response_headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        response_headers[name.strip().lower()] = value.strip()
+    if response_headers.get('transfer-encoding') == 'chunked':
+        chunks = []
+        while True:
+            size = int((await reader.readline()).strip(), 16)
+            data = await reader.readexactly(size + 2)
+            if not size:
+                break
+            chunks.append(data[:-2])
+        return status, response_headers, b''.join(chunks)
+    return status, response_headers, await reader.readexactly(int(response_headers.get('content-length', 0)))
+
+
+class Checker:
+    def __init__(self):
+        self.failures = 0
+
+    def check(self, label, ok, detail=''):
+        print(f"{'[SUCCESS]' if ok else '[ERROR]  '} {label}{'' if ok else f' -- {detail}'}")
+        self.failures += not ok
+
+
+async def run_checks(service, port, unix_path, clients, checker):
+    store = service.store
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+
+    async def call(method, path, body=None, headers=None):
+        return await http_request(reader, writer, method, path, body, headers)
+
+    status, _, raw = await call('GET', '/health')
+    checker.check("GET /health", status == 200 and json.loads(raw)['documents'] == len(store.products), raw)
+
+    # find == basic_query (OPERATION 2)
+    with contextlib.redirect_stdout(io.StringIO()):
+        expected = [{'name': p['name'], 'price': p['price'], 'stock': p['stock']} for p in store.basic_query()]
+        expected_categories = store.category_analysis()
+    status, _, raw = await call('POST', '/docstore/find', ELECTRONICS_UNDER_50K)
+    checker.check("POST /docstore/find matches basic_query()", status == 200 and json.loads(raw)['rows'] == expected,
+                  raw[:200])
+
+    # aggregate == category_analysis (OPERATION 5)
+    status, _, raw = await call('POST', '/docstore/aggregate', {'pipeline': CATEGORY_PIPELINE})
+    rows = [dict(category=row.pop('_id'), **row) for row in json.loads(raw)['rows']] if status == 200 else None
+    checker.check("POST /docstore/aggregate matches category_analysis()", rows == expected_categories, raw[:200])
+
+    status, _, raw = await call('POST', '/docstore/find', {'filter': {'$text': {'$search': 'camera battery'}},
+                                                          'projection': {'product_id': 1,
+                                                                         'score': {'$meta': 'textScore'}}})
+    direct = [r['product_id'] for r in store.text_search({'$text': {'$search': 'camera battery'}}, limit=0)]
+    checker.check("POST /docstore/find with $text ranks like text_search()",
+                  status == 200 and [r['product_id'] for r in json.loads(raw)['rows']] == direct, raw[:200])
+
+    # Streaming: NDJSON rows equal the buffered response
+    status, headers, raw = await call('POST', '/docstore/find', {'filter': {}, 'stream': True})
+    streamed = [json.loads(line) for line in raw.decode('utf-8').splitlines()]
+    checker.check("Streamed find returns every document as NDJSON",
+                  status == 200 and headers.get('content-type') == 'application/x-ndjson'
+                  and [d['product_id'] for d in streamed] == [p['product_id'] for p in store.products],
+                  f"{status} {headers}")
+
+    # Warehouse reports
+    status, _, raw = await call('GET', '/warehouse/reports')
+    reports = json.loads(raw)['reports'] if status == 200 else []
+    checker.check("GET /warehouse/reports lists analytics_queries.sql reports", len(reports) == len(service.reports))
+    for report in reports:
+        status, _, raw = await call('GET', f"/warehouse/reports/{report['id']}")
+        ok = status == 200 and json.loads(raw)['rows'] == run_report(report['id'], {})
+        checker.check(f"GET /warehouse/reports/{report['id']}", ok, raw[:200])
+    drill_down = 'monthly-drill-down'
+    status, _, raw = await call('GET', f"/warehouse/reports/{drill_down}?stream=1")
+    checker.check("Streamed report as NDJSON",
+                  status == 200 and [json.loads(l) for l in raw.decode().splitlines()] == run_report(drill_down, {}))
+
+    # Batch: several requests in one round trip, same answers as individual calls
+    batch = {'requests': [
+        {'method': 'POST', 'path': '/docstore/find', 'body': ELECTRONICS_UNDER_50K},
+        {'method': 'POST', 'path': '/docstore/aggregate', 'body': {'pipeline': CATEGORY_PIPELINE}},
+        {'method': 'GET', 'path': f"/warehouse/reports/{drill_down}"},
+        {'method': 'GET', 'path': '/warehouse/reports/no-such-report'},
+    ]}
+    status, _, raw = await call('POST', '/batch', batch)
+    responses = json.loads(raw)['responses'] if status == 200 else []
+    checker.check("POST /batch answers each request",
+                  [r['status'] for r in responses] == [200, 200, 200, 404]
+                  and responses[0]['result']['rows'] == expected
+                  and responses[2]['result']['rows'] == run_report(drill_down, {}), raw[:300])
+
+    # Error statuses
+    status, _, raw = await call('POST', '/docstore/find', [])
+    checker.check("POST /docstore/find with a JSON array body -> 400", status == 400, f"{status} {raw[:120]}")
+    status, _, raw = await call('POST', '/batch', {'requests': [1, 2]})
+    checker.check("POST /batch with non-object requests -> 400", status == 400, f"{status} {raw[:120]}")
+    for length in ('abc', '-5'):
+        bad_reader, bad_writer = await asyncio.open_connection('127.0.0.1', port)
+        bad_writer.write(f"POST /docstore/find HTTP/1.1\r\nContent-Length: {length}\r\n\r\n".encode('latin-1'))
+        await bad_writer.drain()
+        response = await bad_reader.read()
+        checker.check(f"Content-Length: {length} -> 400", response.startswith(b'HTTP/1.1 400'), response[:80])
+        bad_writer.close()
+    for method, path, body, expected_status in [('GET', '/nope', None, 404), ('GET', '/docstore/find', None, 405),
+                                                ('POST', '/docstore/aggregate', {'pipeline': [{'$bogus': 1}]}, 400),
+                                                ('POST', '/docstore/find', {'filter': {'a': {'$where': 1}}}, 400),
+                                                ('POST', '/docstore/aggregate',
+                                                 {'pipeline': [{'$sort': {'price': 1}},
+                                                               {'$match': {'$text': {'$search': 'camera'}}}]}, 400)]:
+        status, _, raw = await call(method, path, body)
+        checker.check(f"{method} {path} -> {expected_status}", status == expected_status, f"{status} {raw[:120]}")
+
+    # Unix socket
+    if unix_path:
+        unix_reader, unix_writer = await asyncio.open_unix_connection(unix_path)
+        status, _, raw = await http_request(unix_reader, unix_writer, 'POST', '/docstore/find', ELECTRONICS_UNDER_50K)
+        checker.check("Unix socket find", status == 200 and json.loads(raw)['rows'] == expected)
+        unix_writer.close()
+
+    # Concurrent clients: identical in-flight requests are coalesced
+    async def client(n):
+        client_reader, client_writer = await asyncio.open_connection('127.0.0.1', port)
+        statuses = []
+        for i in range(10):
+            body = {'pipeline': CATEGORY_PIPELINE} if i % 2 else ELECTRONICS_UNDER_50K
+            path = '/docstore/aggregate' if i % 2 else '/docstore/find'
+            status, _, _ = await http_request(client_reader, client_writer, 'POST', path, body)
+            statuses.append(status)
+        client_writer.close()
+        return statuses
+
+    start = time.perf_counter()
+    results = await asyncio.gather(*(client(n) for n in range(clients)))
+    elapsed = time.perf_counter() - start
+    total = sum(len(statuses) for statuses in results)
+    checker.check(f"{clients} concurrent clients x 10 requests",
+                  all(status == 200 for statuses in results for status in statuses))
+    print(f"          {total / elapsed:,.0f} requests/sec, {service.coalesced} coalesced")
+
+    status, _, raw = await call('GET', '/metrics')
+    metrics = json.loads(raw)
+    finds = metrics['endpoints'].get('POST /docstore/find', {})
+    checker.check("GET /metrics histograms count requests", finds.get('count', 0) >= clients * 5 + 4,
+                  json.dumps(finds))
+    print(f"\n{'Endpoint':<34}{'count':>7}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'max ms':>9}")
+    for name, histogram in metrics['endpoints'].items():
+        print(f"{name:<34}{histogram['count']:>7}{histogram['p50_ms']:>9}{histogram['p95_ms']:>9}"
+              f"{histogram['p99_ms']:>9}{histogram['max_ms']:>9.1f}")
+    writer.close()
+
+
+async def main_async(args):
+    checker = Checker()
+    with contextlib.redirect_stdout(io.StringIO()):
+        store = open_store()
+    init_warehouse()        # run_report() reference results in this process
+    service = QueryService(store, report_executor=args.report_executor)
+    with tempfile.TemporaryDirectory() as directory:
+        unix_path = os.path.join(directory, 'query.sock') if hasattr(asyncio, 'start_unix_server') else None
+        servers = await service.start('127.0.0.1', 0, unix_path)
+        port = servers[0].sockets[0].getsockname()[1]
+        print(f"[INFO] Query service on 127.0.0.1:{port}" + (f" and {unix_path}" if unix_path else ""))
+        try:
+            await run_checks(service, port, unix_path, args.clients, checker)
+        finally:
+            for server in servers:
+                server.close()
+                await server.wait_closed()
+            service.close()
+    return checker.failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='End-to-end check of the query service')
+    parser.add_argument('--clients', type=int, default=20)
+    parser.add_argument('--report-executor', choices=['process', 'thread'], default='process')
+    args = parser.parse_args(argv)
+    configure_logging(os.devnull)
+
+    failures = asyncio.run(main_async(args))
+    if failures:
+        print(f"\n[ERROR] {failures} check(s) failed")
+        return 1
+    print("\n[SUCCESS] Query service checks passed")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,87 @@
+"""
+Startup-Time Budget for the FlexiMart CLI
+python -m fleximart.startup_time [--runs N]
+Times fresh interpreter runs of short CLI commands against a bare
+`python -c pass` and fails if any exceeds its budget (milliseconds over
+the bare interpreter), or if a light command imports pandas/numpy.
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+from fleximart.cli import PROJECT_ROOT
+
+# (label, argv after `python -m fleximart`, budget ms over bare interpreter, must stay light)
+BUDGETS = [
+    ('--help', ['--help'], 50, True),
+    ('warehouse --help', ['warehouse', '--help'], 50, True),
+    ('warehouse segments', ['warehouse', 'segments'], 60, True),
+    ('warehouse refresh', ['warehouse', 'refresh'], 60, True),
+]
+
+HEAVY_MODULES = ('pandas', 'numpy')
+
+# Runs a CLI command in-process and reports which heavy modules it pulled in
+IMPORT_PROBE = (
+    "import sys, contextlib, io\n"
+    "from fleximart.cli import main\n"
+    "with contextlib.redirect_stdout(io.StringIO()):\n"
+    "    try:\n"
+    "        main(sys.argv[1:])\n"
+    "    except SystemExit:\n"
+    "        pass\n"
+    f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))\n"
+)
+
+
+def time_command(argv, runs):
+    """Median wall time (ms) of a fresh interpreter running argv"""
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(argv, cwd=PROJECT_ROOT, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def heavy_imports(args):
+    result = subprocess.run([sys.executable, '-c', IMPORT_PROBE] + args, cwd=PROJECT_ROOT,
+                            capture_output=True, text=True)
+    lines = result.stdout.strip().splitlines()
+    return [module for module in lines[-1].split(',') if module] if lines else []
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Check CLI startup times against their budgets')
+    parser.add_argument('--runs', type=int, default=7)
+    args = parser.parse_args(argv)
+
+    baseline = time_command([sys.executable, '-c', 'pass'], args.runs)
+    print(f"[INFO] Bare interpreter: {baseline:.1f} ms (median of {args.runs})")
+    if not os.path.exists(os.path.join(PROJECT_ROOT, 'part3-datawarehouse', 'fleximart_dw.sqlite')):
+        print("[INFO] No fleximart_dw.sqlite: warehouse commands time their error path")
+
+    failures = 0
+    print(f"{'Command':<24}{'total ms':>10}{'over python':>13}{'budget':>8}  heavy imports")
+    for label, cli_args, budget, light in BUDGETS:
+        total = time_command([sys.executable, '-m', 'fleximart'] + cli_args, args.runs)
+        overhead = total - baseline
+        imported = heavy_imports(cli_args)
+        ok = overhead <= budget and not (light and imported)
+        failures += not ok
+        print(f"{label:<24}{total:>10.1f}{overhead:>13.1f}{budget:>8}  {', '.join(imported) or '-'}"
+              f"{'' if ok else '   [OVER BUDGET]'}")
+
+    if failures:
+        print(f"[ERROR] {failures} command(s) over budget")
+        return 1
+    print("[SUCCESS] All commands within budget")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
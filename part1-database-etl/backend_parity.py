@@ -0,0 +1,152 @@
+"""
+Backend Parity Check for the FlexiMart ETL Pipeline
+Part 1: ETL Pipeline
+Runs ETLPipeline with the pandas (reference) and Polars backends on the same
+inputs and requires byte-identical *_cleaned.csv files and identical
+quality_report counters:
+- data/ (the raw project CSVs)
+- a generated messy dataset (duplicates, missing fields, every date format,
+  unparseable dates, phone/category variants); --rows sets its size
+Exits 1 on any mismatch. Also prints the transform time of each backend.
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+
+from etl_pipeline_standalone import ETLPipeline, DATA_DIR
+from fleximart.logs import configure_logging
+
+OUTPUTS = ['customers_cleaned.csv', 'products_cleaned.csv', 'orders_cleaned.csv']
+FIRST_NAMES = ['Rahul', 'Priya', 'Amit', 'Sneha', 'vikram', 'ANJALI', '']
+LAST_NAMES = ['Sharma', 'Patel', 'Kumar', 'Reddy', 'singh', '']
+CITIES = ['Bangalore', 'Mumbai', 'Delhi', 'Hyderabad', 'Chennai', 'Pune', '']
+CATEGORIES = ['Electronics', 'electronics', 'ELECTRONICS', ' Fashion ', 'fashion', 'home & kitchen',
+              'Groceries', '']
+STATUSES = ['Completed', 'Pending', 'Cancelled', '']
+
+
+def random_date(rng):
+    year, month, day = rng.choice([2023, 2024]), rng.randint(1, 12), rng.randint(1, 28)
+    return rng.choice([
+        f"{year}-{month:02d}-{day:02d}", f"{day:02d}/{month:02d}/{year}", f"{month:02d}-{day:02d}-{year}",
+        f"{day:02d}-{month:02d}-{year}", f"{month:02d}/{day:02d}/{year}", f" {year}-{month:02d}-{day:02d} ",
+        f"{year}/{month:02d}/{day:02d}", f"{year}-{month}-{day}", f"{day}/{month}/{year}", "not a date", ""])
+
+
+def random_phone(rng):
+    digits = ''.join(str(rng.randint(0, 9)) for _ in range(10))
+    return rng.choice([digits, f"+91-{digits}", f"+91 {digits[:5]} {digits[5:]}", f"0{digits}",
+                       f"({digits[:3]}) {digits[3:6]}-{digits[6:]}", digits[:7], ""])
+
+
+def write_messy_dataset(directory, rows, seed=11):
+    """customers/products/sales raw CSVs with ~5% exact duplicate rows"""
+    rng = random.Random(seed)
+    customers = rows // 10 or 1
+    products = rows // 50 or 1
+
+    def write(name, header, records):
+        records = records + rng.sample(records, len(records) // 20)
+        rng.shuffle(records)
+        with open(os.path.join(directory, name), 'w') as f:
+            f.write(header + "\n")
+            f.writelines(",".join(record) + "\n" for record in records)
+
+    write('customers_raw.csv', 'customer_id,first_name,last_name,email,phone,city,registration_date', [
+        (f"C{i:05d}", first, last, rng.choice([f"{first.lower()}{i}@mail.com", ""]), random_phone(rng),
+         rng.choice(CITIES), random_date(rng))
+        for i in range(customers)
+        for first, last in [(rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES))]])
+    write('products_raw.csv', 'product_id,product_name,category,price,stock_quantity', [
+        (f"P{i:04d}", f"Product {i}", rng.choice(CATEGORIES),
+         rng.choice([f"{rng.uniform(49, 99999):.2f}", f"{rng.randint(49, 9999)}.00", ""]),
+         rng.choice([str(rng.randint(0, 500)), ""]))
+        for i in range(products)])
+    write('sales_raw.csv', 'transaction_id,customer_id,product_id,quantity,unit_price,transaction_date,status', [
+        (rng.choice([f"T{i:06d}", ""]) if i % 97 == 0 else f"T{i:06d}",
+         rng.choice([f"C{rng.randrange(customers):05d}"] * 30 + [""]),
+         f"P{rng.randrange(products):04d}", str(rng.randint(1, 5)), f"{rng.uniform(49, 99999):.2f}",
+         random_date(rng), rng.choice(STATUSES))
+        for i in range(rows)])
+
+
+def run_backend(backend, data_dir, output_dir):
+    """Run the pipeline quietly; returns (quality_report, {output: bytes}, transform seconds)"""
+    cwd = os.getcwd()
+    os.chdir(output_dir)
+    try:
+        pipeline = ETLPipeline(backend=backend, data_dir=data_dir)
+        with contextlib.redirect_stdout(io.StringIO()):
+            raw = pipeline.extract_data()
+            start = time.perf_counter()
+            cleaned = pipeline.collect_transformed(pipeline.transform_customers(raw[0]),
+                                                   pipeline.transform_products(raw[1]),
+                                                   pipeline.transform_orders(raw[2]))
+            elapsed = time.perf_counter() - start
+            pipeline.save_to_csv(*cleaned)
+        outputs = {}
+        for name in OUTPUTS:
+            with open(name, 'rb') as f:
+                outputs[name] = f.read()
+        return pipeline.quality_report, outputs, elapsed
+    finally:
+        os.chdir(cwd)
+
+
+def compare(label, data_dir):
+    print(f"\n[INFO] {label}")
+    results = {}
+    for backend in ('pandas', 'polars'):
+        with tempfile.TemporaryDirectory() as output_dir:
+            results[backend] = run_backend(backend, data_dir, output_dir)
+        print(f"   {backend:<8} transform {results[backend][2]:.3f}s")
+
+    reference_report, reference_outputs, _ = results['pandas']
+    report, outputs, _ = results['polars']
+    failures = 0
+    for name in OUTPUTS:
+        if outputs[name] != reference_outputs[name]:
+            expected, actual = reference_outputs[name].splitlines(), outputs[name].splitlines()
+            line = next((i for i, (a, b) in enumerate(zip(expected, actual)) if a != b),
+                        min(len(expected), len(actual)))
+            print(f"[ERROR] {name} differs at line {line + 1}:")
+            print(f"   pandas: {expected[line] if line < len(expected) else '<end of file>'}")
+            print(f"   polars: {actual[line] if line < len(actual) else '<end of file>'}")
+            failures += 1
+    if report != reference_report:
+        print(f"[ERROR] quality_report differs:\n   pandas: {reference_report}\n   polars: {report}")
+        failures += 1
+    if not failures:
+        print(f"[SUCCESS] Identical outputs and quality_report ({', '.join(OUTPUTS)})")
+    return failures
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Check pandas/Polars ETL backend parity')
+    parser.add_argument('--rows', type=int, default=20000, help='sales rows in the generated dataset')
+    args = parser.parse_args(argv)
+    configure_logging(os.devnull)     # unparseable-date warnings are expected here
+
+    print("="*70)
+    print("ETL BACKEND PARITY: pandas (reference) vs polars")
+    print("="*70)
+    failures = compare(f"Project data ({DATA_DIR})", DATA_DIR)
+    with tempfile.TemporaryDirectory() as data_dir:
+        write_messy_dataset(data_dir, args.rows)
+        failures += compare(f"Generated messy dataset ({args.rows:,} sales rows)", data_dir)
+
+    if failures:
+        print(f"\n[ERROR] {failures} parity check(s) failed")
+        return 1
+    print("\n[SUCCESS] Backends agree")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,188 @@
+"""
+Dataframe Backends for the FlexiMart ETL Pipeline
+Part 1: ETL Pipeline
+The transform operations ETLPipeline needs (read, dedupe, string normalize,
+date parse, fillna, dropna, rename, write) behind one interface:
+- PandasBackend (reference): eager DataFrames; per-value cleaning goes
+  through the pipeline's memoized clean_column()
+- PolarsBackend: LazyFrames; cleaners are native expressions, so
+  scan -> clean for every table (and all quality counters) runs as one
+  optimized, multithreaded plan in collect()
+Counters are requested with counts(frame) and resolved by collect(), so the
+pipeline code is identical for eager and lazy backends.
+"""
+
+import pandas as pd
+
+try:
+    import polars as pl
+    POLARS_AVAILABLE = True
+except ImportError:
+    POLARS_AVAILABLE = False
+
+# Formats tried in order by ETLPipeline.parse_date (first match wins)
+DATE_FORMATS = ['%Y-%m-%d', '%d/%m/%Y', '%m-%d-%Y', '%d-%m-%Y', '%m/%d/%Y']
+
+
+class PandasBackend:
+    """Eager pandas implementation (the reference for parity checks)"""
+
+    name = 'pandas'
+
+    def __init__(self, clean_column):
+        self.clean_column = clean_column    # ETLPipeline.clean_column(series, cleaner_name)
+
+    def read_csv(self, path):
+        return pd.read_csv(path)
+
+    def columns(self, frame):
+        return list(frame.columns)
+
+    def counts(self, frame):
+        """(rows, null cells)"""
+        return len(frame), int(frame.isnull().sum().sum())
+
+    def drop_duplicates(self, frame):
+        return frame.drop_duplicates()
+
+    def rename(self, frame, mapping):
+        return frame.rename(columns={old: new for old, new in mapping.items() if old in frame.columns})
+
+    def normalize(self, frame, column, cleaner):
+        """Apply a registered per-value cleaner ('phone', 'category', 'date', ...) to a column"""
+        return frame.assign(**{column: self.clean_column(frame[column], cleaner)})
+
+    def fill_missing(self, frame, column, value, cast=None):
+        filled = frame[column].fillna(value)
+        return frame.assign(**{column: filled.astype(cast) if cast else filled})
+
+    def drop_missing(self, frame, columns):
+        return frame.dropna(subset=columns)
+
+    def fill_default_email(self, frame, column='email', domain='fleximart.com'):
+        """Missing emails become first.last@domain ('customer' / the row label when a name is missing)"""
+        frame = frame.copy()
+        for idx in frame[frame[column].isna()].index:
+            first = frame.loc[idx, 'first_name'].lower() if not pd.isna(frame.loc[idx, 'first_name']) else 'customer'
+            last = frame.loc[idx, 'last_name'].lower() if not pd.isna(frame.loc[idx, 'last_name']) else str(idx)
+            frame.loc[idx, column] = f"{first}.{last}@{domain}"
+        return frame
+
+    def collect(self, frames, counts):
+        """Frames and counters are already materialized"""
+        return list(frames), list(counts)
+
+    def write_csv(self, frame, path):
+        frame.to_csv(path, index=False)
+
+    def to_pandas(self, frame):
+        return frame
+
+
+class PolarsBackend:
+    """
+    Lazy Polars implementation
+    Every operation extends a LazyFrame; nothing runs until collect(), which
+    hands all tables and counters to pl.collect_all so shared scans are
+    computed once and independent branches run in parallel
+    """
+
+    name = 'polars'
+    ROW = '__row'     # original row position, used like the pandas index label
+
+    def __init__(self, cleaners):
+        if not POLARS_AVAILABLE:
+            raise ImportError("polars is not installed (pip install polars)")
+        self.cleaners = cleaners            # ETLPipeline.cleaners, for cleaners without a native expression
+        self.expressions = {
+            'phone': self.phone_expr,
+            'category': self.category_expr,
+            'date': self.date_expr,
+        }
+
+    def read_csv(self, path):
+        return pl.scan_csv(path).with_row_index(self.ROW)
+
+    def columns(self, frame):
+        return [name for name in frame.collect_schema().names() if name != self.ROW]
+
+    def counts(self, frame):
+        data = pl.all().exclude(self.ROW)
+        return frame.select(pl.len().alias('rows'), pl.sum_horizontal(data.null_count()).alias('nulls'))
+
+    def drop_duplicates(self, frame):
+        return frame.unique(subset=self.columns(frame), keep='first', maintain_order=True)
+
+    def rename(self, frame, mapping):
+        present = set(self.columns(frame))
+        return frame.rename({old: new for old, new in mapping.items() if old in present})
+
+    # Native equivalents of ETLPipeline.standardize_phone / standardize_category / parse_date
+    @staticmethod
+    def phone_expr(column):
+        digits = pl.col(column).cast(pl.String).str.strip_chars().str.replace_all(r'\D', '')
+        return pl.when(digits.str.len_chars() >= 10).then(pl.lit('+91-') + digits.str.slice(-10))
+
+    @staticmethod
+    def category_expr(column):
+        return pl.col(column).cast(pl.String).str.strip_chars().str.to_titlecase().fill_null('Uncategorized')
+
+    @staticmethod
+    def date_expr(column):
+        text = pl.col(column).cast(pl.String).str.strip_chars()
+        return pl.coalesce([text.str.strptime(pl.Date, fmt, strict=False) for fmt in DATE_FORMATS])
+
+    def normalize(self, frame, column, cleaner):
+        expression = self.expressions.get(cleaner)
+        if expression is not None:
+            return frame.with_columns(expression(column).alias(column))
+        # Custom cleaners run per value in Python (correct, but outside the optimized plan)
+        return frame.with_columns(pl.col(column).map_elements(self.cleaners[cleaner], return_dtype=pl.String,
+                                                               skip_nulls=False))
+
+    def fill_missing(self, frame, column, value, cast=None):
+        filled = pl.col(column).fill_null(value)
+        return frame.with_columns((filled.cast(pl.Int64) if cast is int else filled).alias(column))
+
+    def drop_missing(self, frame, columns):
+        return frame.drop_nulls(subset=columns)
+
+    def fill_default_email(self, frame, column='email', domain='fleximart.com'):
+        first = pl.col('first_name').str.to_lowercase().fill_null('customer')
+        last = pl.col('last_name').str.to_lowercase().fill_null(pl.col(self.ROW).cast(pl.String))
+        default = pl.concat_str([first, pl.lit('.'), last, pl.lit(f'@{domain}')])
+        return frame.with_columns(pl.col(column).fill_null(default))
+
+    def collect(self, frames, counts):
+        """Run every table and counter in one pl.collect_all call"""
+        results = pl.collect_all(list(frames) + list(counts))
+        tables = [table.drop(self.ROW) for table in results[:len(frames)]]
+        resolved = [(row['rows'], row['nulls']) for row in
+                    (counts_frame.row(0, named=True) for counts_frame in results[len(frames):])]
+        return tables, resolved
+
+    def write_csv(self, frame, path):
+        frame.write_csv(path)
+
+    def to_pandas(self, frame):
+        """
+        Collected frame as pandas (for consumers such as the warehouse loader),
+        with dates as datetime.date objects like the pandas backend produces
+        """
+        table = frame.to_pandas()
+        for name, dtype in frame.schema.items():
+            if dtype == pl.Date:
+                table[name] = pd.Series(frame[name].to_list(), index=table.index, dtype=object)
+        return table
+
+
+BACKENDS = {'pandas': PandasBackend, 'polars': PolarsBackend}
+
+
+def get_backend(name, pipeline):
+    """Backend instance for an ETLPipeline"""
+    if name == 'pandas':
+        return PandasBackend(pipeline.clean_column)
+    if name == 'polars':
+        return PolarsBackend(pipeline.cleaners)
+    raise ValueError(f"Unknown dataframe backend {name!r}; choose from {sorted(BACKENDS)}")
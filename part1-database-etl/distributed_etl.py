@@ -0,0 +1,464 @@
+"""
+Distributed ETL for FlexiMart
+Part 1: ETL Pipeline
+Coordinator/worker mode for ETLPipeline:
+- The coordinator splits the raw CSVs into partition files and enqueues one
+  task per partition in a SQLite-backed TaskQueue (the local stand-in for a
+  message broker; every worker sharing the run directory can use it)
+- Workers lease tasks, extract/transform their partition with ETLPipeline,
+  write the result atomically under a name derived from the task id and
+  report the partition's quality_report counters
+- The reduce step merges partition outputs in input order, removes rows
+  duplicated across partitions and recomputes the global counters, so the
+  output matches a single-process run
+Leases expire (tasks held by a crashed worker are leased again), failed tasks
+are retried with backoff up to max_attempts, and re-running a task just
+replaces its output file, so a run directory can be resumed.
+
+python distributed_etl.py [--workers N] [--rows-per-partition N] [--run-dir DIR]
+                          [--output-dir DIR] [--data-dir DIR] [--fail-rate P] [--verify]
+"""
+
+import argparse
+import contextlib
+import csv
+import io
+import json
+import logging
+import multiprocessing
+import os
+import random
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+
+import pandas as pd
+
+from etl_pipeline_standalone import ETLPipeline, DATA_DIR
+from fleximart.logs import configure_logging
+
+RAW_INPUTS = [('customers', 'customers_raw.csv'), ('products', 'products_raw.csv'), ('orders', 'sales_raw.csv')]
+OUTPUTS = ['customers_cleaned.csv', 'products_cleaned.csv', 'orders_cleaned.csv']
+
+# Partitions are read with fixed dtypes so every partition parses a column the
+# same way, whatever values it happens to contain
+RAW_DTYPES = {
+    'customers': {'customer_id': 'str', 'first_name': 'str', 'last_name': 'str', 'email': 'str',
+                  'phone': 'str', 'city': 'str', 'registration_date': 'str'},
+    'products': {'product_id': 'str', 'product_name': 'str', 'category': 'str',
+                 'price': 'float64', 'stock_quantity': 'float64'},
+    'orders': {'transaction_id': 'str', 'customer_id': 'str', 'product_id': 'str', 'quantity': 'Int64',
+               'unit_price': 'float64', 'transaction_date': 'str', 'status': 'str'},
+}
+
+# Carried through the transform: identity of the raw row and its null count
+ROW_HASH = '_raw_hash'
+ROW_NULLS = '_raw_nulls'
+
+QUEUE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    task_id TEXT PRIMARY KEY,
+    entity TEXT NOT NULL,
+    partition_no INTEGER NOT NULL,
+    input_path TEXT NOT NULL,
+    first_row INTEGER NOT NULL,
+    status TEXT NOT NULL DEFAULT 'pending',      -- pending | leased | done | failed
+    attempts INTEGER NOT NULL DEFAULT 0,
+    lease_owner TEXT,
+    lease_expires REAL,
+    available_at REAL NOT NULL DEFAULT 0,
+    output_path TEXT,
+    counters TEXT,
+    run_seconds REAL,
+    error TEXT,
+    updated_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_tasks_status ON tasks(status, available_at);
+CREATE TABLE IF NOT EXISTS run_info (key TEXT PRIMARY KEY, value TEXT);
+"""
+
+
+class TaskQueue:
+    """
+    Work queue in a SQLite file, safe for concurrent worker processes
+    Leasing happens in a BEGIN IMMEDIATE transaction, so one task goes to one
+    worker; complete()/fail() only apply while the caller still holds the lease
+    """
+
+    def __init__(self, path, lease_seconds=60.0, max_attempts=3, retry_delay=0.5):
+        self.path = path
+        self.lease_seconds = lease_seconds
+        self.max_attempts = max_attempts
+        self.retry_delay = retry_delay
+        self.connection = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.connection.row_factory = sqlite3.Row
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript(QUEUE_SCHEMA)
+
+    @contextlib.contextmanager
+    def transaction(self):
+        self.connection.execute("BEGIN IMMEDIATE")
+        try:
+            yield self.connection
+        except BaseException:
+            self.connection.execute("ROLLBACK")
+            raise
+        self.connection.execute("COMMIT")
+
+    def enqueue(self, tasks):
+        """Add tasks (dicts); tasks already queued under the same task_id are left as they are"""
+        with self.transaction() as connection:
+            before = connection.total_changes
+            connection.executemany(
+                "INSERT OR IGNORE INTO tasks (task_id, entity, partition_no, input_path, first_row, updated_at) "
+                "VALUES (:task_id, :entity, :partition_no, :input_path, :first_row, :updated_at)",
+                [dict(task, updated_at=time.time()) for task in tasks])
+            return connection.total_changes - before
+
+    def lease(self, worker_id):
+        """Next runnable task as a dict (pending, or leased with an expired lease), or None"""
+        now = time.time()
+        with self.transaction() as connection:
+            connection.execute(
+                "UPDATE tasks SET status = 'failed', error = 'lease expired after final attempt', updated_at = ? "
+                "WHERE status = 'leased' AND lease_expires < ? AND attempts >= ?", (now, now, self.max_attempts))
+            row = connection.execute(
+                "SELECT * FROM tasks WHERE (status = 'pending' AND available_at <= ?) "
+                "OR (status = 'leased' AND lease_expires < ?) ORDER BY task_id LIMIT 1", (now, now)).fetchone()
+            if row is None:
+                return None
+            connection.execute(
+                "UPDATE tasks SET status = 'leased', lease_owner = ?, lease_expires = ?, attempts = attempts + 1, "
+                "updated_at = ? WHERE task_id = ?", (worker_id, now + self.lease_seconds, now, row['task_id']))
+        task = dict(row)
+        task['attempts'] += 1
+        return task
+
+    def complete(self, task_id, worker_id, output_path, counters, run_seconds=None):
+        """Record a finished task; False if the lease was lost (the task will run again elsewhere)"""
+        with self.transaction() as connection:
+            cursor = connection.execute(
+                "UPDATE tasks SET status = 'done', output_path = ?, counters = ?, run_seconds = ?, error = NULL, "
+                "updated_at = ? WHERE task_id = ? AND lease_owner = ? AND status = 'leased'",
+                (output_path, json.dumps(counters), run_seconds, time.time(), task_id, worker_id))
+            return cursor.rowcount == 1
+
+    def fail(self, task_id, worker_id, error):
+        """Retry later with exponential backoff, or mark failed after max_attempts"""
+        now = time.time()
+        with self.transaction() as connection:
+            row = connection.execute("SELECT attempts FROM tasks WHERE task_id = ? AND lease_owner = ? "
+                                     "AND status = 'leased'", (task_id, worker_id)).fetchone()
+            if row is None:
+                return
+            if row['attempts'] >= self.max_attempts:
+                connection.execute("UPDATE tasks SET status = 'failed', error = ?, updated_at = ? WHERE task_id = ?",
+                                   (error, now, task_id))
+            else:
+                delay = self.retry_delay * 2 ** (row['attempts'] - 1)
+                connection.execute("UPDATE tasks SET status = 'pending', lease_owner = NULL, error = ?, "
+                                   "available_at = ?, updated_at = ? WHERE task_id = ?",
+                                   (error, now + delay, now, task_id))
+
+    def requeue_failed(self):
+        """Give failed tasks a fresh set of attempts; returns how many"""
+        with self.transaction() as connection:
+            return connection.execute(
+                "UPDATE tasks SET status = 'pending', attempts = 0, lease_owner = NULL, available_at = 0, "
+                "updated_at = ? WHERE status = 'failed'", (time.time(),)).rowcount
+
+    def status_counts(self):
+        rows = self.connection.execute("SELECT status, COUNT(*) FROM tasks GROUP BY status").fetchall()
+        return {status: count for status, count in rows}
+
+    def unfinished(self):
+        return self.connection.execute(
+            "SELECT COUNT(*) FROM tasks WHERE status IN ('pending', 'leased')").fetchone()[0]
+
+    def tasks(self, status=None):
+        sql = "SELECT * FROM tasks" + (" WHERE status = ?" if status else "") + " ORDER BY task_id"
+        return [dict(row) for row in self.connection.execute(sql, (status,) if status else ())]
+
+    def get_info(self, key):
+        row = self.connection.execute("SELECT value FROM run_info WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def set_info(self, key, value):
+        self.connection.execute("INSERT OR REPLACE INTO run_info (key, value) VALUES (?, ?)", (key, value))
+
+    def close(self):
+        self.connection.close()
+
+
+def queue_path(run_dir):
+    return os.path.join(run_dir, 'queue.sqlite')
+
+
+@contextlib.contextmanager
+def working_directory(path):
+    """ETLPipeline writes its CSVs and report to the working directory"""
+    cwd = os.getcwd()
+    os.makedirs(path, exist_ok=True)
+    os.chdir(path)
+    try:
+        yield
+    finally:
+        os.chdir(cwd)
+
+
+# ============================================================================
+# COORDINATOR
+# ============================================================================
+def _write_atomic(path, write):
+    temporary = f"{path}.{os.getpid()}.tmp"
+    write(temporary)
+    os.replace(temporary, path)
+
+
+def split_inputs(data_dir, run_dir, rows_per_partition):
+    """Split each raw CSV into partition files; returns the task dicts (task_id sorts in input order)"""
+    partition_dir = os.path.join(run_dir, 'partitions')
+    os.makedirs(partition_dir, exist_ok=True)
+    tasks = []
+    for entity, filename in RAW_INPUTS:
+        with open(os.path.join(data_dir, filename), newline='') as f:
+            reader = csv.reader(f)
+            header = next(reader)
+            rows = [row for row in reader if row]       # pandas skips blank lines too
+        for partition_no, first_row in enumerate(range(0, max(len(rows), 1), rows_per_partition)):
+            task_id = f"{RAW_INPUTS.index((entity, filename))}-{entity}-{partition_no:05d}"
+            path = os.path.join(partition_dir, f"{task_id}.csv")
+            chunk = rows[first_row:first_row + rows_per_partition]
+
+            def write(temporary, chunk=chunk):
+                with open(temporary, 'w', newline='') as out:
+                    writer = csv.writer(out)
+                    writer.writerow(header)
+                    writer.writerows(chunk)
+
+            _write_atomic(path, write)
+            tasks.append({'task_id': task_id, 'entity': entity, 'partition_no': partition_no,
+                          'input_path': path, 'first_row': first_row})
+    return tasks
+
+
+def input_fingerprint(data_dir, rows_per_partition):
+    files = []
+    for _, filename in RAW_INPUTS:
+        stat = os.stat(os.path.join(data_dir, filename))
+        files.append([filename, stat.st_size, stat.st_mtime_ns])
+    return json.dumps({'data_dir': os.path.abspath(data_dir), 'files': files,
+                       'rows_per_partition': rows_per_partition})
+
+
+def prepare_run(queue, data_dir, run_dir, rows_per_partition):
+    """Split and enqueue once per run directory; a re-run with the same inputs resumes"""
+    fingerprint = input_fingerprint(data_dir, rows_per_partition)
+    existing = queue.get_info('inputs')
+    if existing == fingerprint:
+        print(f"[INFO] Resuming run in {run_dir}: {queue.status_counts()}")
+        requeued = queue.requeue_failed()
+        if requeued:
+            print(f"[INFO] Retrying {requeued} failed task(s)")
+        return
+    if existing is not None:
+        raise ValueError(f"{run_dir} holds a run over different inputs; use another --run-dir or --clean")
+    tasks = split_inputs(data_dir, run_dir, rows_per_partition)
+    queue.enqueue(tasks)
+    queue.set_info('inputs', fingerprint)
+    print(f"[SUCCESS] Enqueued {len(tasks)} partition tasks ({rows_per_partition:,} rows each)")
+
+
+# ============================================================================
+# WORKER
+# ============================================================================
+def process_task(pipeline, task, run_dir):
+    """Extract/transform one partition; returns (output path, quality_report counters)"""
+    entity = task['entity']
+    frame = pd.read_csv(task['input_path'], dtype=RAW_DTYPES[entity])
+    # Global row labels, as in a single-process run (the default-email fallback uses them)
+    frame.index = pd.RangeIndex(task['first_row'], task['first_row'] + len(frame))
+    frame = frame.assign(**{ROW_HASH: pd.util.hash_pandas_object(frame, index=False),
+                            ROW_NULLS: frame.isnull().sum(axis=1)})
+    ledger = frame[[ROW_HASH, ROW_NULLS]].drop_duplicates(ROW_HASH)
+
+    with contextlib.redirect_stdout(io.StringIO()):
+        cleaned = pipeline.transform_entity(entity, frame)
+
+    output_dir = os.path.join(run_dir, 'outputs')
+    os.makedirs(output_dir, exist_ok=True)
+    output_path = os.path.join(output_dir, f"{task['task_id']}.pkl")
+    _write_atomic(output_path, lambda temporary: pd.to_pickle({'cleaned': cleaned, 'ledger': ledger}, temporary))
+    return output_path, {key: int(value) for key, value in pipeline.quality_report[entity].items()}
+
+
+def worker_main(run_dir, worker_id, lease_seconds=60.0, max_attempts=3, fail_rate=0.0, poll_interval=0.2):
+    """Lease and run tasks until the queue has no pending or leased work"""
+    os.makedirs(os.path.join(run_dir, 'logs'), exist_ok=True)
+    configure_logging(os.path.join(run_dir, 'logs', f"{worker_id}.log"))
+    queue = TaskQueue(queue_path(run_dir), lease_seconds, max_attempts)
+    pipeline = ETLPipeline()        # one per worker, so cleaner memos carry across partitions
+    rng = random.Random(worker_id)
+    completed = 0
+
+    while True:
+        task = queue.lease(worker_id)
+        if task is None:
+            if queue.unfinished() == 0:
+                break
+            time.sleep(poll_interval)
+            continue
+        try:
+            if rng.random() < fail_rate:
+                raise RuntimeError("injected failure")
+            started = time.perf_counter()
+            output_path, counters = process_task(pipeline, task, run_dir)
+            if queue.complete(task['task_id'], worker_id, output_path, counters, time.perf_counter() - started):
+                completed += 1
+            else:
+                logging.warning("Lease on %s lost; another worker will redo it", task['task_id'])
+        except Exception as e:
+            logging.error("Task %s attempt %s failed: %s", task['task_id'], task['attempts'], e)
+            queue.fail(task['task_id'], worker_id, repr(e))
+
+    logging.info("Worker %s finished %s tasks", worker_id, completed)
+    queue.close()
+    return completed
+
+
+# ============================================================================
+# REDUCE
+# ============================================================================
+def reduce_outputs(queue, output_dir):
+    """
+    Merge partition outputs in input order with global dedup and write the
+    cleaned CSVs and quality report; returns (pipeline, per-task rows)
+    Duplicates across partitions are found by raw-row hash, first occurrence
+    kept; missing values are recounted over the globally unique raw rows
+    """
+    tasks = queue.tasks('done')
+    pipeline = ETLPipeline()
+    cleaned = {}
+    for entity, _ in RAW_INPUTS:
+        entity_tasks = [task for task in tasks if task['entity'] == entity]
+        parts = [pd.read_pickle(task['output_path']) for task in entity_tasks]
+        counters = [json.loads(task['counters']) for task in entity_tasks]
+
+        unique = pd.concat([part['ledger'] for part in parts]).drop_duplicates(ROW_HASH)
+        frame = pd.concat([part['cleaned'] for part in parts]).drop_duplicates(ROW_HASH)
+        frame = frame.drop(columns=[ROW_HASH, ROW_NULLS]).reset_index(drop=True)
+
+        stats = pipeline.quality_report[entity]
+        stats['processed'] = sum(c['processed'] for c in counters)
+        stats['duplicates'] = stats['processed'] - len(unique)
+        stats['missing_values'] = int(unique[ROW_NULLS].sum()) - int(frame.isnull().sum().sum())
+        stats['loaded'] = len(frame)
+        cross_partition = stats['duplicates'] - sum(c['duplicates'] for c in counters)
+        print(f"   {entity:<10} {len(entity_tasks):>4} partitions, {stats['loaded']:>9,} rows, "
+              f"{cross_partition:,} cross-partition duplicates removed")
+        cleaned[entity] = frame
+
+    with working_directory(output_dir), contextlib.redirect_stdout(io.StringIO()):
+        pipeline.save_to_csv(cleaned['customers'], cleaned['products'], cleaned['orders'])
+        pipeline.generate_quality_report()
+    return pipeline, tasks
+
+
+def run_distributed(data_dir, run_dir, output_dir, workers=2, rows_per_partition=50000,
+                    lease_seconds=60.0, max_attempts=3, fail_rate=0.0):
+    """Coordinator: enqueue, start worker processes, wait, reduce. Returns the reduced pipeline or None"""
+    os.makedirs(run_dir, exist_ok=True)
+    queue = TaskQueue(queue_path(run_dir), lease_seconds, max_attempts)
+    prepare_run(queue, data_dir, run_dir, rows_per_partition)
+
+    start = time.perf_counter()
+    # spawn: workers start clean, like processes on another node
+    context = multiprocessing.get_context('spawn')
+    processes = [context.Process(target=worker_main, args=(run_dir, f"worker-{i}", lease_seconds, max_attempts,
+                                                           fail_rate))
+                 for i in range(workers)]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+    elapsed = time.perf_counter() - start
+
+    statuses = queue.status_counts()
+    retried = sum(task['attempts'] - 1 for task in queue.tasks())
+    print(f"[INFO] {workers} worker(s): {statuses} in {elapsed:.2f}s ({retried} retries)")
+    # Busy share of the workers' wall time; the rest is process start-up, queue polling and idle tail
+    work = sum(task['run_seconds'] or 0 for task in queue.tasks('done'))
+    print(f"[INFO] Task work {work:.2f}s over {workers} x {elapsed:.2f}s wall: "
+          f"{work / (workers * elapsed):.0%} worker utilization")
+    failed = queue.tasks('failed')
+    if failed or queue.unfinished():
+        for task in failed:
+            print(f"[ERROR] {task['task_id']} failed after {task['attempts']} attempts: {task['error']}")
+        logging.error("Distributed ETL incomplete: %s", statuses)
+        queue.close()
+        return None
+
+    print("[REDUCE] Merging partition outputs")
+    pipeline, _ = reduce_outputs(queue, output_dir)
+    queue.close()
+    logging.info("Distributed ETL completed: %s", pipeline.quality_report)
+    return pipeline
+
+
+def verify_against_single_process(data_dir, output_dir, pipeline):
+    """Compare the reduced outputs with a single-process pandas run"""
+    with tempfile.TemporaryDirectory() as reference_dir:
+        reference = ETLPipeline(data_dir=data_dir)
+        with working_directory(reference_dir), contextlib.redirect_stdout(io.StringIO()):
+            reference.run_pipeline()
+        failures = 0
+        for name in OUTPUTS:
+            with open(os.path.join(reference_dir, name), 'rb') as a, open(os.path.join(output_dir, name), 'rb') as b:
+                if a.read() != b.read():
+                    print(f"[ERROR] {name} differs from the single-process output")
+                    failures += 1
+    if reference.quality_report != pipeline.quality_report:
+        print(f"[ERROR] quality_report differs:\n   single: {reference.quality_report}\n   "
+              f"distributed: {pipeline.quality_report}")
+        failures += 1
+    if not failures:
+        print("[SUCCESS] Outputs and quality_report match a single-process run")
+    return failures == 0
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Coordinator/worker ETL over a SQLite task queue')
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--rows-per-partition', type=int, default=50000)
+    parser.add_argument('--data-dir', default=DATA_DIR)
+    parser.add_argument('--run-dir', default='etl_run', help='queue, partitions and partition outputs')
+    parser.add_argument('--output-dir', default='.', help='where the cleaned CSVs and report are written')
+    parser.add_argument('--lease-seconds', type=float, default=60.0)
+    parser.add_argument('--max-attempts', type=int, default=3)
+    parser.add_argument('--fail-rate', type=float, default=0.0, help='inject task failures to exercise retries')
+    parser.add_argument('--clean', action='store_true', help='delete the run directory first')
+    parser.add_argument('--verify', action='store_true', help='compare with a single-process run')
+    args = parser.parse_args(argv)
+
+    configure_logging('distributed_etl.log')
+    print("="*70)
+    print("FLEXIMART DISTRIBUTED ETL")
+    print("="*70)
+    if args.clean and os.path.isdir(args.run_dir):
+        shutil.rmtree(args.run_dir)
+
+    pipeline = run_distributed(args.data_dir, args.run_dir, args.output_dir, args.workers,
+                               args.rows_per_partition, args.lease_seconds, args.max_attempts, args.fail_rate)
+    if pipeline is None:
+        print("[ERROR] Distributed ETL incomplete; re-run to resume")
+        return 1
+    print(f"[SUCCESS] Wrote {', '.join(OUTPUTS)} and data_quality_report.txt to {os.path.abspath(args.output_dir)}")
+    if args.verify and not verify_against_single_process(args.data_dir, args.output_dir, pipeline):
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,39 +4,68 @@ Complete working version - runs from anywhere
 """
 
 import pandas as pd
+import numpy as np
 import re
 import os
+import sys
+from collections import OrderedDict
 from datetime import datetime
 import logging
 
 # Get the absolute path to the data directory
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 DATA_DIR = os.path.join(PROJECT_ROOT, 'data')
+LOG_FILE = 'etl_pipeline.log'
 
-# Configure logging
-logging.basicConfig(
-    filename='etl_pipeline.log',
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    encoding='utf-8'
-)
+# Shared helpers (fleximart/) live at the project root
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+from fleximart.logs import configure_logging, log_summary_lines
 
-print(f"\n[INFO] Project root: {PROJECT_ROOT}")
-print(f"[INFO] Data directory: {DATA_DIR}")
+from dataframe_backends import get_backend
+
+class CleanerMemo:
+    """
+    Bounded LRU of cleaned results for one cleaner (raw value -> cleaned value)
+    Kept on the pipeline, so chunked/streaming runs reuse earlier chunks' results
+    """
+
+    def __init__(self, max_entries=100000):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def lookup(self, values, cleaner):
+        """Cleaned result for each distinct value, running cleaner only on misses"""
+        results = []
+        for value in values:
+            if value in self.entries:
+                self.entries.move_to_end(value)
+                self.hits += 1
+                cleaned = self.entries[value]
+            else:
+                self.misses += 1
+                cleaned = cleaner(value)
+                self.entries[value] = cleaned
+                if len(self.entries) > self.max_entries:
+                    self.entries.popitem(last=False)
+            results.append(cleaned)
+        return results
 
-logging.basicConfig(
-    filename='etl_pipeline.log',
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
 
 class ETLPipeline:
     """
     Professional ETL Pipeline Implementation
     Handles Extract, Transform, Load operations for FlexiMart data
+    Per-value cleaners run through clean_column(): once per distinct value,
+    with results memoized across calls (see register_cleaner)
+    Dataframe operations go through self.backend ('pandas', the reference,
+    or 'polars'; see dataframe_backends.py)
     """
     
-    def __init__(self, host='localhost', user='root', password='', database='fleximart', use_database=False):
+    def __init__(self, host='localhost', user='root', password='', database='fleximart', use_database=False,
+                 memo_size=100000, backend='pandas', data_dir=DATA_DIR):
         """Initialize ETL pipeline parameters"""
         self.host = host
         self.user = user
@@ -45,6 +74,7 @@ class ETLPipeline:
         self.connection = None
         self.engine = None
         self.use_database = use_database
+        self.data_dir = data_dir
         
         # Data storage for standalone mode
         self.customers_df = None
@@ -59,6 +89,17 @@ class ETLPipeline:
             'orders': {'processed': 0, 'duplicates': 0, 'missing_values': 0, 'loaded': 0}
         }
 
+        # Registered per-value cleaners and their cross-chunk memos
+        self.memo_size = memo_size
+        self.cleaners = {}
+        self.cleaner_memos = {}
+        self.register_cleaner('phone', self.standardize_phone)
+        self.register_cleaner('category', self.standardize_category)
+        self.register_cleaner('date', self.parse_date)
+
+        self.backend = get_backend(backend, self)
+        self._counts = {}       # (entity, stage) -> backend counts handle, resolved in collect_transformed()
+
     def connect_database_mysql(self):
         """Attempt MySQL connection (optional)"""
         if not MYSQL_AVAILABLE:
@@ -76,7 +117,7 @@ class ETLPipeline:
             print("[SUCCESS] MySQL connection successful")
             return True
         except Exception as e:
-            logging.warning(f"MySQL connection skipped: {e}")
+            logging.warning("MySQL connection skipped: %s", e)
             print(f"[WARNING] MySQL connection skipped (not required for this version)")
             return False
 
@@ -94,7 +135,7 @@ class ETLPipeline:
             print("[SUCCESS] SQLAlchemy engine created")
             return True
         except Exception as e:
-            logging.warning(f"SQLAlchemy connection skipped: {e}")
+            logging.warning("SQLAlchemy connection skipped: %s", e)
             return False
 
     def create_tables(self):
@@ -153,7 +194,7 @@ class ETLPipeline:
             logging.info("Database tables created successfully")
             print("[SUCCESS] Database tables created successfully")
         except Exception as e:
-            logging.error(f"Error creating tables: {e}")
+            logging.error("Error creating tables: %s", e)
             print(f"⚠ Table creation skipped: {e}")
 
     # ============================================================================
@@ -170,39 +211,26 @@ class ETLPipeline:
         print("PHASE 1: EXTRACT - Reading CSV files")
         print("="*70)
         
+        sources = [('customers', 'customers_raw.csv'), ('products', 'products_raw.csv'),
+                   ('orders', 'sales_raw.csv')]
+        print()
         try:
-            # Extract customers
-            print("\n[EXTRACT] Loading customers...")
-            customers_path = os.path.join(DATA_DIR, 'customers_raw.csv')
-            customers = pd.read_csv(customers_path)
-            self.quality_report['customers']['processed'] = len(customers)
-            print(f"   SUCCESS: {len(customers)} customer records extracted")
-            logging.info(f"Extracted {len(customers)} customer records")
-            
-            # Extract products
-            print("[EXTRACT] Loading products...")
-            products_path = os.path.join(DATA_DIR, 'products_raw.csv')
-            products = pd.read_csv(products_path)
-            self.quality_report['products']['processed'] = len(products)
-            print(f"   SUCCESS: {len(products)} product records extracted")
-            logging.info(f"Extracted {len(products)} product records")
-            
-            # Extract orders
-            print("[EXTRACT] Loading orders...")
-            orders_path = os.path.join(DATA_DIR, 'sales_raw.csv')
-            orders = pd.read_csv(orders_path)
-            self.quality_report['orders']['processed'] = len(orders)
-            print(f"   SUCCESS: {len(orders)} order records extracted")
-            logging.info(f"Extracted {len(orders)} order records")
-            
-            return customers, products, orders
+            frames = []
+            for entity, filename in sources:
+                print(f"[EXTRACT] Loading {entity}...")
+                frame = self.backend.read_csv(os.path.join(self.data_dir, filename))
+                self._counts[(entity, 'raw')] = self.backend.counts(frame)
+                frames.append(frame)
+                print(f"   SUCCESS: {filename} opened ({self.backend.name})")
+                logging.info("Extracting %s from %s", entity, filename)
+            return tuple(frames)
         
         except FileNotFoundError as e:
-            logging.error(f"CSV file not found: {e}")
+            logging.error("CSV file not found: %s", e)
             print(f"[ERROR] File not found: {e}")
             return None, None, None
         except Exception as e:
-            logging.error(f"Error during extraction: {e}")
+            logging.error("Error during extraction: %s", e)
             print(f"[ERROR] Extraction failed: {e}")
             return None, None, None
 
@@ -242,53 +270,57 @@ class ETLPipeline:
                 continue
         
         # If all formats fail, return None
-        logging.warning(f"Could not parse date: {date_str}")
+        logging.warning("Could not parse date: %s", date_str)
         return None
 
+    # ============================================================================
+    # MEMOIZED CLEANING
+    # ============================================================================
+    def register_cleaner(self, name, cleaner):
+        """
+        Register a pure per-value cleaner (value -> cleaned value) under name
+        clean_column(series, name) then runs it once per distinct value
+        """
+        self.cleaners[name] = cleaner
+        self.cleaner_memos[name] = CleanerMemo(self.memo_size)
+
+    def clean_column(self, series, name):
+        """
+        Apply a registered cleaner to a column: factorize the column, clean
+        each distinct value once (memo hits skip the cleaner entirely) and
+        broadcast the results back through the codes
+        """
+        cleaner = self.cleaners[name]
+        codes, uniques = pd.factorize(series)
+        cleaned = np.empty(len(uniques) + 1, dtype=object)
+        cleaned[:-1] = self.cleaner_memos[name].lookup(uniques.tolist(), cleaner)
+        if (codes == -1).any():
+            cleaned[-1] = cleaner(None)   # code -1 (missing) indexes the last slot
+        return pd.Series(cleaned[codes], index=series.index, name=series.name)
+
+    def cleaner_stats(self):
+        """{name: (memo hits, cleaner calls, memo entries)}"""
+        return {name: (memo.hits, memo.misses, len(memo.entries)) for name, memo in self.cleaner_memos.items()}
+
     def transform_customers(self, df):
         """
         Transform customers data
         - Remove duplicates
         - Standardize phone numbers
         - Generate missing emails
+        - Parse registration dates
+        Returns the backend frame; counters are filled by collect_transformed()
         """
-        print("\n" + "-"*70)
-        print("TRANSFORMING CUSTOMERS...")
-        print("-"*70)
-        
-        df = df.copy()
-        initial_count = len(df)
-        
-        # Remove duplicates
-        duplicates = len(df) - len(df.drop_duplicates())
-        self.quality_report['customers']['duplicates'] = duplicates
-        df = df.drop_duplicates()
-        print(f"[SUCCESS] Removed {duplicates} duplicate records")
+        backend = self.backend
+        df = backend.drop_duplicates(df)
+        self._counts[('customers', 'deduped')] = backend.counts(df)
         
-        # Handle missing values
-        missing_before = df.isnull().sum().sum()
+        df = backend.normalize(df, 'phone', 'phone')
+        df = backend.fill_default_email(df, 'email')
+        if 'registration_date' in backend.columns(df):
+            df = backend.normalize(df, 'registration_date', 'date')
         
-        # Standardize phone numbers
-        df['phone'] = df['phone'].apply(self.standardize_phone)
-        
-        # Generate default emails for missing ones
-        for idx in df[df['email'].isna()].index:
-            first = df.loc[idx, 'first_name'].lower() if not pd.isna(df.loc[idx, 'first_name']) else 'customer'
-            last = df.loc[idx, 'last_name'].lower() if not pd.isna(df.loc[idx, 'last_name']) else str(idx)
-            df.loc[idx, 'email'] = f"{first}.{last}@fleximart.com"
-        
-        # Parse registration dates
-        if 'registration_date' in df.columns:
-            df['registration_date'] = df['registration_date'].apply(self.parse_date)
-        
-        missing_after = df.isnull().sum().sum()
-        self.quality_report['customers']['missing_values'] = missing_before - missing_after
-        
-        print(f"[SUCCESS] Standardized phone numbers")
-        print(f"[SUCCESS] Generated {df['email'].isna().sum() == 0} default emails")
-        print(f"[SUCCESS] Parsed dates with {missing_after} remaining nulls")
-        
-        self.quality_report['customers']['loaded'] = len(df)
+        self._counts[('customers', 'cleaned')] = backend.counts(df)
         return df
 
     def transform_products(self, df):
@@ -298,86 +330,91 @@ class ETLPipeline:
         - Standardize categories
         - Handle missing values
         """
-        print("\n" + "-"*70)
-        print("TRANSFORMING PRODUCTS...")
-        print("-"*70)
-        
-        df = df.copy()
-        
-        # Remove duplicates
-        duplicates = len(df) - len(df.drop_duplicates())
-        self.quality_report['products']['duplicates'] = duplicates
-        df = df.drop_duplicates()
-        print(f"[SUCCESS] Removed {duplicates} duplicate records")
-        
-        missing_before = df.isnull().sum().sum()
-        
-        # Standardize categories
-        if 'category' in df.columns:
-            df['category'] = df['category'].apply(self.standardize_category)
+        backend = self.backend
+        df = backend.drop_duplicates(df)
+        self._counts[('products', 'deduped')] = backend.counts(df)
         
+        columns = backend.columns(df)
+        if 'category' in columns:
+            df = backend.normalize(df, 'category', 'category')
         # Fill missing stock with 0
-        if 'stock_quantity' in df.columns:
-            df['stock_quantity'] = df['stock_quantity'].fillna(0).astype(int)
-        
+        if 'stock_quantity' in columns:
+            df = backend.fill_missing(df, 'stock_quantity', 0, cast=int)
         # Drop records with missing prices (critical field)
-        df = df.dropna(subset=['price'])
+        df = backend.drop_missing(df, ['price'])
         
-        missing_after = df.isnull().sum().sum()
-        self.quality_report['products']['missing_values'] = missing_before - missing_after
-        
-        print(f"[SUCCESS] Standardized categories")
-        print(f"[SUCCESS] Filled stock quantities and prices")
-        print(f"[SUCCESS] Cleaned {missing_before - missing_after} missing values")
-        
-        self.quality_report['products']['loaded'] = len(df)
+        self._counts[('products', 'cleaned')] = backend.counts(df)
         return df
 
     def transform_orders(self, df):
         """
         Transform orders data
+        - Rename columns to match schema
         - Remove duplicates
         - Parse dates
         - Handle missing values
         """
-        print("\n" + "-"*70)
-        print("TRANSFORMING ORDERS...")
-        print("-"*70)
-        
-        df = df.copy()
-        
-        # Rename columns to match schema
-        if 'transaction_id' in df.columns:
-            df.rename(columns={'transaction_id': 'order_id'}, inplace=True)
-        if 'transaction_date' in df.columns:
-            df.rename(columns={'transaction_date': 'order_date'}, inplace=True)
-        
-        # Remove duplicates
-        duplicates = len(df) - len(df.drop_duplicates())
-        self.quality_report['orders']['duplicates'] = duplicates
-        df = df.drop_duplicates()
-        print(f"[SUCCESS] Removed {duplicates} duplicate records")
-        
-        missing_before = df.isnull().sum().sum()
-        
-        # Parse dates
-        if 'order_date' in df.columns:
-            df['order_date'] = df['order_date'].apply(self.parse_date)
+        backend = self.backend
+        df = backend.rename(df, {'transaction_id': 'order_id', 'transaction_date': 'order_date'})
+        df = backend.drop_duplicates(df)
+        self._counts[('orders', 'deduped')] = backend.counts(df)
         
+        if 'order_date' in backend.columns(df):
+            df = backend.normalize(df, 'order_date', 'date')
         # Drop records with missing critical fields
-        critical_cols = ['order_id', 'customer_id']
-        df = df.dropna(subset=critical_cols)
+        df = backend.drop_missing(df, ['order_id', 'customer_id'])
         
-        missing_after = df.isnull().sum().sum()
-        self.quality_report['orders']['missing_values'] = missing_before - missing_after
-        
-        print(f"[SUCCESS] Parsed order dates")
-        print(f"[SUCCESS] Dropped records with missing critical fields")
-        print(f"[SUCCESS] Cleaned {missing_before - missing_after} missing values")
-        
-        self.quality_report['orders']['loaded'] = len(df)
+        self._counts[('orders', 'cleaned')] = backend.counts(df)
         return df
 
+    def transform_entity(self, entity, frame):
+        """
+        Transform and collect one extracted frame ('customers', 'products' or
+        'orders'); quality_report[entity] then holds this frame's counters
+        (used for partitions by distributed_etl.py)
+        """
+        transform = {'customers': self.transform_customers, 'products': self.transform_products,
+                     'orders': self.transform_orders}[entity]
+        self._counts[(entity, 'raw')] = self.backend.counts(frame)
+        return self.collect_entities({entity: transform(frame)})[entity]
+
+    def collect_transformed(self, customers_df, products_df, orders_df):
+        """
+        Materialize the transformed frames (one plan for lazy backends) and
+        fill quality_report from the raw/deduped/cleaned counters
+        """
+        frames = self.collect_entities({'customers': customers_df, 'products': products_df, 'orders': orders_df})
+        return frames['customers'], frames['products'], frames['orders']
+
+    def collect_entities(self, frames):
+        """collect_transformed() for any subset of entities: {entity: frame} -> {entity: materialized frame}"""
+        entities = list(frames)
+        keys = list(self._counts)
+        collected, counts = self.backend.collect([frames[entity] for entity in entities],
+                                                 [self._counts[key] for key in keys])
+        resolved = dict(zip(keys, counts))
+        self._counts = {}
+        
+        for entity in entities:
+            processed, _ = resolved[(entity, 'raw')]
+            deduped_rows, missing_before = resolved[(entity, 'deduped')]
+            loaded, missing_after = resolved[(entity, 'cleaned')]
+            stats = self.quality_report[entity]
+            stats['processed'] = processed
+            stats['duplicates'] = processed - deduped_rows
+            stats['missing_values'] = missing_before - missing_after
+            stats['loaded'] = loaded
+            logging.info("Extracted %s records from %s", processed, entity)
+            
+            print("\n" + "-"*70)
+            print(f"TRANSFORMED {entity.upper()}")
+            print("-"*70)
+            print(f"[SUCCESS] {processed} records extracted")
+            print(f"[SUCCESS] Removed {stats['duplicates']} duplicate records")
+            print(f"[SUCCESS] Cleaned {stats['missing_values']} missing values ({missing_after} remaining nulls)")
+            print(f"[SUCCESS] {loaded} records loaded")
+        return dict(zip(entities, collected))
+
     # ============================================================================
     # LOAD PHASE (3 marks)
     # ============================================================================
@@ -386,9 +423,9 @@ class ETLPipeline:
         print("\n[LOAD] Saving cleaned data to CSV files...")
         
         try:
-            customers_df.to_csv('customers_cleaned.csv', index=False)
-            products_df.to_csv('products_cleaned.csv', index=False)
-            orders_df.to_csv('orders_cleaned.csv', index=False)
+            self.backend.write_csv(customers_df, 'customers_cleaned.csv')
+            self.backend.write_csv(products_df, 'products_cleaned.csv')
+            self.backend.write_csv(orders_df, 'orders_cleaned.csv')
             
             print("   SUCCESS: customers_cleaned.csv")
             print("   SUCCESS: products_cleaned.csv")
@@ -396,7 +433,7 @@ class ETLPipeline:
             logging.info("Cleaned data saved to CSV files")
             return True
         except Exception as e:
-            logging.error(f"Error saving CSV files: {e}")
+            logging.error("Error saving CSV files: %s", e)
             print(f"[ERROR] Failed to save: {e}")
             return False
 
@@ -432,6 +469,15 @@ class ETLPipeline:
         report_content.append(f"Total Records Cleaned:   {total_cleaned}")
         report_content.append(f"Total Records Loaded:    {total_loaded}")
         report_content.append(f"Data Quality Score:      {(total_loaded/total_processed*100):.1f}%")
+
+        # Repeated log messages (counted even when rate-limited out of the log file)
+        log_lines = log_summary_lines()
+        if log_lines:
+            report_content.append("")
+            report_content.append("=" * 70)
+            report_content.append("LOG SUMMARY")
+            report_content.append("=" * 70)
+            report_content.extend(log_lines)
         
         report_text = "\n".join(report_content)
         
@@ -447,6 +493,9 @@ class ETLPipeline:
         print("\n" + "="*70)
         print("FLEXIMART ETL PIPELINE - STARTING")
         print("="*70)
+        print(f"\n[INFO] Project root: {PROJECT_ROOT}")
+        print(f"[INFO] Data directory: {self.data_dir}")
+        print(f"[INFO] Dataframe backend: {self.backend.name}")
         
         # Try database connection (optional)
         if self.use_database:
@@ -466,13 +515,20 @@ class ETLPipeline:
         print("PHASE 2: TRANSFORM - Cleaning and validating data")
         print("="*70)
         
-        customers_clean = self.transform_customers(customers)
-        products_clean = self.transform_products(products)
-        orders_clean = self.transform_orders(orders)
+        try:
+            customers_clean, products_clean, orders_clean = self.collect_transformed(
+                self.transform_customers(customers), self.transform_products(products),
+                self.transform_orders(orders))
+        except Exception as e:
+            logging.error("Error during transform: %s", e)
+            print(f"\n[ERROR] ETL Pipeline Failed - Transform failed: {e}")
+            return False
         
         self.customers_df = customers_clean
         self.products_df = products_clean
         self.orders_df = orders_clean
+        for name, (hits, calls, entries) in self.cleaner_stats().items():
+            logging.info("Cleaner '%s': %s calls, %s memo hits, %s memoized values", name, calls, hits, entries)
         
         # Load (Save to CSV)
         print("\n" + "="*70)
@@ -502,12 +558,15 @@ class ETLPipeline:
 # MAIN EXECUTION
 # ============================================================================
 if __name__ == "__main__":
+    configure_logging(LOG_FILE)
+
     print("\n" + "="*70)
     print("FLEXIMART DATA ENGINEERING PROJECT - PART 1: ETL PIPELINE")
     print("="*70)
     
-    # Create and run ETL pipeline
-    pipeline = ETLPipeline(use_database=False)  # Set to True if MySQL is running
+    # Create and run ETL pipeline (--backend polars for the lazy Polars plan)
+    backend = sys.argv[sys.argv.index('--backend') + 1] if '--backend' in sys.argv[:-1] else 'pandas'
+    pipeline = ETLPipeline(use_database=False, backend=backend)  # Set use_database=True if MySQL is running
     success = pipeline.run_pipeline()
     
     if success:
@@ -0,0 +1,87 @@
+"""
+Benchmark: bulk_write vs looping update_review
+Part 2: NoSQL Database Implementation
+Compares ops/sec for pushing N reviews into the standalone document store
+"""
+
+import argparse
+import io
+import os
+import random
+import time
+from contextlib import redirect_stdout
+
+from mongodb_operations_standalone import MongoDBOperationsStandalone
+
+
+def _fresh_store(json_file_path):
+    """Load a quiet in-memory store"""
+    with redirect_stdout(io.StringIO()):
+        store = MongoDBOperationsStandalone()
+        store.load_data(json_file_path)
+    return store
+
+
+def _review_operations(product_ids, count, seed=42):
+    """Generate count $push/$inc review events across product_ids"""
+    rng = random.Random(seed)
+    operations = []
+    for i in range(count):
+        operations.append({
+            'filter': {'product_id': rng.choice(product_ids)},
+            'update': {
+                '$push': {'reviews': {
+                    'user_id': f"U{i:06d}",
+                    'username': f"BulkUser{i}",
+                    'rating': rng.randint(1, 5),
+                    'comment': "Imported review event",
+                    'date': "2024-03-30"
+                }},
+                '$inc': {'review_events': 1}
+            }
+        })
+    return operations
+
+
+def run_benchmark(json_file_path, count):
+    """Run both strategies and print ops/sec"""
+    print("\n" + "="*70)
+    print(f"BENCHMARK: {count:,} review updates")
+    print("="*70)
+
+    # Strategy 1: one update_review() call per event
+    store = _fresh_store(json_file_path)
+    product_ids = [p['product_id'] for p in store.products]
+    start = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        for i in range(count):
+            store.update_review(product_ids[i % len(product_ids)])
+    loop_elapsed = time.perf_counter() - start
+    loop_rate = count / loop_elapsed
+
+    # Strategy 2: one bulk_write() call for the whole batch
+    store = _fresh_store(json_file_path)
+    operations = _review_operations(product_ids, count)
+    with redirect_stdout(io.StringIO()):
+        result = store.bulk_write(operations)
+    bulk_rate = result['ops_per_sec']
+
+    print(f"{'Strategy':<30} {'Seconds':>12} {'Ops/sec':>15}")
+    print("-" * 57)
+    print(f"{'loop update_review()':<30} {loop_elapsed:>12.3f} {loop_rate:>15,.0f}")
+    print(f"{'bulk_write()':<30} {result['elapsed_sec']:>12.3f} {bulk_rate:>15,.0f}")
+    print(f"\nSpeedup: {bulk_rate / loop_rate:.1f}x")
+    return {'loop_ops_per_sec': loop_rate, 'bulk_ops_per_sec': bulk_rate}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--count', type=int, default=10000, help="number of review events")
+    args = parser.parse_args()
+
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    run_benchmark(os.path.join(script_dir, 'products_catalog.json'), args.count)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,178 @@
+"""
+Benchmark: concurrent readers under write load
+Part 2: NoSQL Database Implementation
+Reader threads run basic_query / review_analysis / category_analysis /
+text_search against the standalone store while writer threads apply
+bulk_write batches. Each batch moves stock between products (total stock
+is constant) and pushes a review, so any category_analysis that sees a
+half-applied batch reports the wrong total: those reads are counted as
+inconsistent. --no-lock runs the same load without the readers-writer lock.
+"""
+
+import argparse
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+from mongodb_operations_standalone import MongoDBOperationsStandalone
+
+READ_OPERATIONS = ['basic_query', 'review_analysis', 'category_analysis', 'text_search']
+
+
+def _catalog_file(json_file_path, products, directory):
+    """Write a catalog of `products` documents by cloning the sample catalog"""
+    with open(json_file_path, 'r', encoding='utf-8') as f:
+        sample = json.load(f)
+    documents = []
+    for i in range(products):
+        document = json.loads(json.dumps(sample[i % len(sample)]))
+        document['product_id'] = f"{document['product_id']}-{i:05d}"
+        documents.append(document)
+    path = os.path.join(directory, 'catalog.json')
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(documents, f)
+    return path
+
+
+def _transfer_batch(rng, product_ids, size, writer, sequence):
+    """size stock transfers (net zero) plus one review push"""
+    operations = []
+    for _ in range(size):
+        source, target = rng.sample(product_ids, 2)
+        amount = rng.randint(1, 5)
+        operations.append({'filter': {'product_id': source}, 'update': {'$inc': {'stock': -amount}}})
+        operations.append({'filter': {'product_id': target}, 'update': {'$inc': {'stock': amount}}})
+    operations.append({'filter': {'product_id': rng.choice(product_ids)}, 'update': {'$push': {'reviews': {
+        'user_id': f"W{writer}", 'username': f"Writer{writer}", 'rating': rng.randint(1, 5),
+        'comment': f"Stress review {sequence} battery quality", 'date': "2024-03-30"}}}})
+    return operations
+
+
+def run_case(catalog_path, readers, writers, duration, batch_size, thread_safe, write_pause):
+    """One load configuration; returns its measurements"""
+    store = MongoDBOperationsStandalone(thread_safe=thread_safe)
+    store.load_data(catalog_path)
+    product_ids = [p['product_id'] for p in store.products]
+    total_stock = sum(p.get('stock', 0) for p in store.products)
+
+    stop = threading.Event()
+    latencies = [[] for _ in range(readers)]
+    inconsistent = [0] * readers
+    errors = [0] * readers
+    writes = [0] * writers
+
+    def reader(slot):
+        rng = random.Random(slot)
+        while not stop.is_set():
+            name = rng.choice(READ_OPERATIONS)
+            start = time.perf_counter()
+            try:
+                if name == 'text_search':
+                    store.text_search({'$text': {'$search': 'battery quality'}}, limit=5)
+                elif name == 'category_analysis':
+                    rows = store.category_analysis()
+                    if sum(row['total_stock'] for row in rows) != total_stock:
+                        inconsistent[slot] += 1
+                else:
+                    getattr(store, name)()
+            except Exception:
+                errors[slot] += 1
+            latencies[slot].append(time.perf_counter() - start)
+
+    def writer(slot):
+        rng = random.Random(1000 + slot)
+        sequence = 0
+        while not stop.is_set():
+            store.bulk_write(_transfer_batch(rng, product_ids, batch_size, slot, sequence))
+            writes[slot] += 2 * batch_size + 1
+            sequence += 1
+            if write_pause:
+                time.sleep(write_pause)
+
+    threads = ([threading.Thread(target=reader, args=(i,)) for i in range(readers)] +
+               [threading.Thread(target=writer, args=(i,)) for i in range(writers)])
+    start = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    time.sleep(duration)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    all_latencies = sorted(value for values in latencies for value in values)
+    final_stock = sum(p.get('stock', 0) for p in store.products)
+    return {
+        'reads': len(all_latencies),
+        'read_qps': len(all_latencies) / elapsed,
+        'p50_ms': statistics.median(all_latencies) * 1000 if all_latencies else 0.0,
+        'p99_ms': all_latencies[int(len(all_latencies) * 0.99)] * 1000 if all_latencies else 0.0,
+        'write_ops_per_sec': sum(writes) / elapsed,
+        'inconsistent': sum(inconsistent),
+        'errors': sum(errors),
+        'stock_conserved': final_stock == total_stock,
+        'lock': store.lock.stats(),
+    }
+
+
+def run_benchmark(json_file_path, products, reader_counts, writers, duration, batch_size,
+                  thread_safe, write_pause):
+    print("\n" + "="*70)
+    print(f"BENCHMARK: concurrent reads under write load ({products:,} products, "
+          f"{'readers-writer lock' if thread_safe else 'NO LOCK'})")
+    print("="*70)
+    print(f"{writers} writer thread(s), bulk_write batches of {2 * batch_size + 1} ops, "
+          f"{duration:.0f}s per case\n")
+
+    with tempfile.TemporaryDirectory() as directory:
+        catalog_path = _catalog_file(json_file_path, products, directory)
+        print(f"{'Readers':>7} {'Writers':>8} {'Read QPS':>10} {'p50 ms':>8} {'p99 ms':>8} "
+              f"{'Write ops/s':>12} {'Inconsistent':>13} {'Errors':>7}")
+        print("-" * 80)
+        results = []
+        for readers in reader_counts:
+            for case_writers in (0, writers):
+                real_stdout = sys.stdout
+                with open(os.devnull, 'w') as devnull:
+                    sys.stdout = devnull        # the query methods print their results
+                    try:
+                        result = run_case(catalog_path, readers, case_writers, duration, batch_size,
+                                          thread_safe, write_pause)
+                    finally:
+                        sys.stdout = real_stdout
+                results.append((readers, case_writers, result))
+                print(f"{readers:>7} {case_writers:>8} {result['read_qps']:>10,.0f} {result['p50_ms']:>8.2f} "
+                      f"{result['p99_ms']:>8.2f} {result['write_ops_per_sec']:>12,.0f} "
+                      f"{result['inconsistent']:>13} {result['errors']:>7}")
+
+    broken = [r for _, _, r in results if r['inconsistent'] or r['errors'] or not r['stock_conserved']]
+    if broken:
+        print(f"\n[WARNING] {len(broken)} case(s) saw inconsistent reads, errors or lost updates")
+    else:
+        print("\n[SUCCESS] Every read saw a consistent collection; total stock conserved")
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--products', type=int, default=2000, help="catalog size (clones of the sample)")
+    parser.add_argument('--readers', type=int, nargs='+', default=[1, 2, 4, 8], help="reader thread counts")
+    parser.add_argument('--writers', type=int, default=2, help="writer threads")
+    parser.add_argument('--duration', type=float, default=3.0, help="seconds per case")
+    parser.add_argument('--batch-size', type=int, default=50, help="stock transfers per bulk_write")
+    parser.add_argument('--write-pause', type=float, default=0.005, help="seconds between a writer's batches")
+    parser.add_argument('--no-lock', action='store_true', help="run without the readers-writer lock")
+    args = parser.parse_args()
+
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    run_benchmark(os.path.join(script_dir, 'products_catalog.json'), args.products, args.readers,
+                  args.writers, args.duration, args.batch_size, not args.no_lock, args.write_pause)
+
+
+if __name__ == "__main__":
+    main()
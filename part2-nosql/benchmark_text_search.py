@@ -0,0 +1,106 @@
+"""
+Benchmark: inverted text index vs scanning review comments
+Part 2: NoSQL Database Implementation
+Pushes N generated reviews into the standalone document store, then times
+$text queries through text_search against a Python scan of every comment
+"""
+
+import argparse
+import io
+import os
+import random
+import time
+from contextlib import redirect_stdout
+
+from mongodb_operations_standalone import MongoDBOperationsStandalone
+from text_index import tokenize
+
+VOCABULARY = (
+    "great good poor battery camera screen sound quality fit comfortable fabric delivery fast slow "
+    "value price cheap expensive durable broke stopped working recommend return size color bright "
+    "noise cancelling laptop keyboard display warranty packaging original fake charger heating"
+).split()
+
+QUERIES = ['battery', 'noise cancelling', 'comfortable fabric', 'charger -original', '"stopped working"']
+
+
+def _comment(rng):
+    return ' '.join(rng.choice(VOCABULARY) for _ in range(rng.randint(4, 14))).capitalize() + '.'
+
+
+def _load_reviews(store, count, seed=42):
+    """Push count generated reviews through bulk_write (indexed incrementally)"""
+    rng = random.Random(seed)
+    product_ids = [p['product_id'] for p in store.products]
+    operations = [{
+        'filter': {'product_id': rng.choice(product_ids)},
+        'update': {'$push': {'reviews': {
+            'user_id': f"U{i:07d}", 'username': f"User{i}", 'rating': rng.randint(1, 5),
+            'comment': _comment(rng), 'date': "2024-03-30"
+        }}}
+    } for i in range(count)]
+    with redirect_stdout(io.StringIO()):
+        return store.bulk_write(operations)
+
+
+def scan_search(store, search):
+    """Baseline: rank products by matching chunks, tokenizing every name, spec and comment"""
+    terms = set(tokenize(search.replace('"', ' ').replace('-', ' ')))
+    matches = []
+    for product in store.products:
+        text = [product.get('name') or '', str(product.get('specifications') or '')]
+        text.extend(review.get('comment') or '' for review in product.get('reviews', []))
+        hits = sum(1 for chunk in text if terms.intersection(tokenize(chunk)))
+        if hits:
+            matches.append((hits, product.get('product_id')))
+    return sorted(matches, reverse=True)
+
+
+def run_benchmark(json_file_path, count):
+    print("\n" + "="*70)
+    print(f"BENCHMARK: text search over {count:,} additional reviews")
+    print("="*70)
+
+    with redirect_stdout(io.StringIO()):
+        store = MongoDBOperationsStandalone()
+        store.load_data(json_file_path)
+    result = _load_reviews(store, count)
+    total_reviews = sum(len(p.get('reviews', [])) for p in store.products)
+    print(f"[INFO] {total_reviews:,} reviews; bulk_write with incremental indexing: "
+          f"{result['elapsed_sec']:.2f}s ({result['ops_per_sec']:,.0f} ops/sec)")
+
+    start = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        store.load_data(json_file_path)
+    reload_elapsed = time.perf_counter() - start
+    _load_reviews(store, count)
+    start = time.perf_counter()
+    store.text_index.build(store.products)
+    build_elapsed = time.perf_counter() - start
+    print(f"[INFO] Full index rebuild: {build_elapsed:.2f}s (load_data of the JSON: {reload_elapsed:.3f}s)")
+
+    print(f"\n{'Query':<24} {'Scan (s)':>10} {'Index (ms)':>12} {'Top result':>12}")
+    print("-" * 60)
+    for query in QUERIES:
+        start = time.perf_counter()
+        scan_search(store, query)
+        scan_elapsed = time.perf_counter() - start
+        store.query_cache.clear()
+        start = time.perf_counter()
+        results = store.text_search({'$text': {'$search': query}}, limit=5)
+        index_elapsed = time.perf_counter() - start
+        top = results[0]['product_id'] if results else '-'
+        print(f"{query:<24} {scan_elapsed:>10.3f} {index_elapsed * 1000:>12.2f} {top:>12}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--count', type=int, default=200000, help="number of generated reviews")
+    args = parser.parse_args()
+
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    run_benchmark(os.path.join(script_dir, 'products_catalog.json'), args.count)
+
+
+if __name__ == "__main__":
+    main()
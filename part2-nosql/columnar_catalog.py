@@ -0,0 +1,129 @@
+"""
+Columnar Backing Store for the Product Catalog
+Part 2: NoSQL Database Implementation
+Scalar fields as NumPy arrays, dictionary-encoded categories and
+reviews as flat ragged arrays (values + offsets) for vectorized queries
+"""
+
+import logging
+
+try:
+    import numpy as np
+    NUMPY_AVAILABLE = True
+except ImportError:
+    NUMPY_AVAILABLE = False
+
+
+def _dictionary_encode(values, missing):
+    """Helper: Encode strings as int32 codes plus a dictionary list"""
+    dictionary = {}
+    codes = np.empty(len(values), dtype=np.int32)
+    for i, value in enumerate(values):
+        if value is None:
+            value = missing
+        code = dictionary.get(value)
+        if code is None:
+            code = dictionary[value] = len(dictionary)
+        codes[i] = code
+    return codes, list(dictionary)
+
+
+class ColumnarCatalog:
+    """
+    Column-oriented copy of the scalar product fields
+    - price (float64), stock (int64)
+    - category / subcategory as int32 codes into small dictionaries
+    - review ratings / dates as flat arrays; product i owns
+      review_rating[review_offsets[i]:review_offsets[i + 1]]
+    """
+
+    def __init__(self, price, stock, category_codes, categories,
+                 subcategory_codes, subcategories, review_offsets, review_rating, review_date):
+        self.price = price
+        self.stock = stock
+        self.category_codes = category_codes
+        self.categories = categories
+        self.subcategory_codes = subcategory_codes
+        self.subcategories = subcategories
+        self.review_offsets = review_offsets
+        self.review_rating = review_rating
+        self.review_date = review_date
+
+    @classmethod
+    def from_documents(cls, products):
+        """Build the columnar store from a list of product documents"""
+        if not NUMPY_AVAILABLE:
+            raise RuntimeError("numpy is required for the columnar catalog (pip install numpy)")
+
+        count = len(products)
+        price = np.fromiter((p.get('price', 0) for p in products), dtype=np.float64, count=count)
+        stock = np.fromiter((p.get('stock', 0) for p in products), dtype=np.int64, count=count)
+        category_codes, categories = _dictionary_encode([p.get('category') for p in products], 'Unknown')
+        subcategory_codes, subcategories = _dictionary_encode([p.get('subcategory') for p in products], 'Unknown')
+
+        review_counts = np.fromiter((len(p.get('reviews', [])) for p in products), dtype=np.int64, count=count)
+        review_offsets = np.zeros(count + 1, dtype=np.int64)
+        np.cumsum(review_counts, out=review_offsets[1:])
+        total_reviews = int(review_offsets[-1])
+
+        review_rating = np.fromiter(
+            (r.get('rating', 0) for p in products for r in p.get('reviews', [])),
+            dtype=np.float32, count=total_reviews
+        )
+        review_date = np.array(
+            [r.get('date', 'NaT') for p in products for r in p.get('reviews', [])],
+            dtype='datetime64[D]'
+        ) if total_reviews else np.empty(0, dtype='datetime64[D]')
+
+        logging.info("Columnar catalog built: %s products, %s reviews", count, total_reviews)
+        return cls(price, stock, category_codes, categories,
+                   subcategory_codes, subcategories, review_offsets, review_rating, review_date)
+
+    def __len__(self):
+        return len(self.price)
+
+    def nbytes(self):
+        """Approximate memory footprint of the array columns"""
+        arrays = [self.price, self.stock, self.category_codes, self.subcategory_codes,
+                  self.review_offsets, self.review_rating, self.review_date]
+        return sum(a.nbytes for a in arrays)
+
+    def category_analysis(self):
+        """Vectorized $group by category: avg/min/max price, product count, total stock"""
+        if len(self) == 0:
+            return []
+        k = len(self.categories)
+        counts = np.bincount(self.category_codes, minlength=k)
+        price_sum = np.bincount(self.category_codes, weights=self.price, minlength=k)
+        stock_sum = np.bincount(self.category_codes, weights=self.stock, minlength=k)
+        min_price = np.full(k, np.inf)
+        max_price = np.full(k, -np.inf)
+        np.minimum.at(min_price, self.category_codes, self.price)
+        np.maximum.at(max_price, self.category_codes, self.price)
+
+        results = [{
+            'category': self.categories[code],
+            'avg_price': float(price_sum[code] / counts[code]),
+            'min_price': float(min_price[code]),
+            'max_price': float(max_price[code]),
+            'product_count': int(counts[code]),
+            'total_stock': int(stock_sum[code])
+        } for code in range(k) if counts[code]]
+        results.sort(key=lambda x: x['avg_price'], reverse=True)
+        return results
+
+    def rating_stats(self):
+        """Per-product (sum of ratings, review count) as two arrays"""
+        cumulative = np.zeros(len(self.review_rating) + 1, dtype=np.float64)
+        np.cumsum(self.review_rating, out=cumulative[1:])
+        sums = cumulative[self.review_offsets[1:]] - cumulative[self.review_offsets[:-1]]
+        return sums, np.diff(self.review_offsets)
+
+    def products_with_min_rating(self, threshold=4.0):
+        """Positions and average ratings of products with avg rating >= threshold, best first"""
+        sums, counts = self.rating_stats()
+        averages = np.divide(sums, counts, out=np.zeros_like(sums), where=counts > 0)
+        positions = np.flatnonzero((counts > 0) & (averages >= threshold))
+        order = np.argsort(-averages[positions], kind='stable')
+        positions = positions[order]
+        return positions, averages[positions], counts[positions]
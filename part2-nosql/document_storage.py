@@ -0,0 +1,311 @@
+"""
+Durable Storage Engine for the Standalone Document Store
+Part 2: NoSQL Database Implementation
+Append-only write-ahead log (WAL) of inserts/updates plus compacted binary snapshots
+"""
+
+import os
+import pickle
+import struct
+import zlib
+import logging
+
+try:
+    import msgpack
+    MSGPACK_AVAILABLE = True
+except ImportError:
+    MSGPACK_AVAILABLE = False
+
+SNAPSHOT_FILE = 'products.snapshot'
+WAL_FILE = 'products.wal'
+
+# File header: 6-byte magic + 1-byte codec ('m' = msgpack, 'p' = pickle)
+SNAPSHOT_MAGIC = b'FXSNAP'
+WAL_MAGIC = b'FXWAL1'
+# Frame header: sequence number, payload length, CRC32 of payload
+FRAME_HEADER = struct.Struct('<QII')
+
+
+def _default_codec():
+    return b'm' if MSGPACK_AVAILABLE else b'p'
+
+
+def _encode(obj, codec):
+    if codec == b'm':
+        return msgpack.packb(obj, use_bin_type=True)
+    return pickle.dumps(obj, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def _decode(data, codec):
+    if codec == b'm':
+        if not MSGPACK_AVAILABLE:
+            raise RuntimeError("Storage was written with msgpack but msgpack is not installed")
+        return msgpack.unpackb(data, raw=False)
+    return pickle.loads(data)
+
+
+def _get_path(document, path, default=None):
+    """Helper: Read a dotted field path from a nested document"""
+    current = document
+    for part in path.split('.'):
+        if not isinstance(current, dict) or part not in current:
+            return default
+        current = current[part]
+    return current
+
+
+def _set_path(document, path, value):
+    """Helper: Write a dotted field path, creating intermediate documents"""
+    parts = path.split('.')
+    current = document
+    for part in parts[:-1]:
+        current = current.setdefault(part, {})
+    current[parts[-1]] = value
+
+
+def copy_paths(document, paths):
+    """
+    Shallow copy of a document that also copies every dict/list along the
+    given dotted paths, so an update applied to the copy leaves the source intact
+    """
+    document = dict(document)
+    for path in set(paths):
+        current = document
+        for part in path.split('.'):
+            value = current.get(part)
+            if isinstance(value, dict):
+                current[part] = current = dict(value)
+            else:
+                if isinstance(value, list):
+                    current[part] = list(value)
+                break
+    return document
+
+
+def update_modifies(document, update):
+    """True if applying update would change the document (pymongo's modified_count)"""
+    missing = object()
+    for operator, fields in update.items():
+        for path, value in fields.items():
+            current = _get_path(document, path, missing)
+            if operator == '$push':
+                if not (isinstance(value, dict) and '$each' in value) or value['$each']:
+                    return True
+            elif operator == '$inc':
+                if value != 0 or current is missing:
+                    return True
+            elif current is missing or current != value:
+                return True
+    return False
+
+
+def apply_update(document, update):
+    """
+    Apply a MongoDB-style update document in place
+    Supports: $set, $inc, $push (including {$push: {field: {$each: [...]}}})
+    """
+    for operator, fields in update.items():
+        if operator == '$set':
+            for path, value in fields.items():
+                _set_path(document, path, value)
+        elif operator == '$inc':
+            for path, amount in fields.items():
+                _set_path(document, path, _get_path(document, path, 0) + amount)
+        elif operator == '$push':
+            for path, value in fields.items():
+                target = _get_path(document, path)
+                if target is None:
+                    target = []
+                    _set_path(document, path, target)
+                if isinstance(value, dict) and '$each' in value:
+                    target.extend(value['$each'])
+                else:
+                    target.append(value)
+        else:
+            raise ValueError(f"Unsupported update operator: {operator}")
+    return document
+
+
+class DocumentStorage:
+    """
+    On-disk persistence for MongoDBOperationsStandalone
+    - Every insert/update is appended to the WAL before it is acknowledged
+    - checkpoint() writes a compacted snapshot and truncates the WAL
+    - recover() loads the snapshot and replays WAL frames newer than it
+    """
+
+    def __init__(self, storage_dir, snapshot_interval=1000, fsync=True):
+        """Initialize storage files under storage_dir"""
+        self.storage_dir = storage_dir
+        self.snapshot_interval = snapshot_interval
+        self.fsync = fsync
+        self.snapshot_path = os.path.join(storage_dir, SNAPSHOT_FILE)
+        self.wal_path = os.path.join(storage_dir, WAL_FILE)
+        self.codec = _default_codec()
+        self.last_seq = 0
+        self.snapshot_seq = 0
+        self.records_since_checkpoint = 0
+        self._wal = None
+        os.makedirs(storage_dir, exist_ok=True)
+
+    # ------------------------------------------------------------------
+    # Recovery
+    # ------------------------------------------------------------------
+    def recover(self):
+        """Rebuild the document list from snapshot + WAL replay"""
+        documents = self._read_snapshot()
+        index = {doc.get('product_id'): pos for pos, doc in enumerate(documents)}
+        replayed = 0
+
+        for seq, record in self._read_wal():
+            if seq <= self.snapshot_seq:
+                continue
+            self._apply_record(documents, index, record)
+            self.last_seq = seq
+            replayed += 1
+
+        self.last_seq = max(self.last_seq, self.snapshot_seq)
+        self.records_since_checkpoint = replayed
+        logging.info("Recovered %s documents (%s WAL records replayed)", len(documents), replayed)
+        return documents
+
+    def _apply_record(self, documents, index, record):
+        kind = record[0]
+        if kind == 'insert':
+            document = record[1]
+            index[document.get('product_id')] = len(documents)
+            documents.append(document)
+        elif kind == 'update':
+            position = index.get(record[1])
+            if position is not None:
+                apply_update(documents[position], record[2])
+        elif kind == 'reset':
+            documents.clear()
+            index.clear()
+        else:
+            logging.warning("Skipping unknown WAL record type: %s", kind)
+
+    def _read_snapshot(self):
+        if not os.path.exists(self.snapshot_path):
+            return []
+        with open(self.snapshot_path, 'rb') as f:
+            header = f.read(len(SNAPSHOT_MAGIC) + 1)
+            if header[:len(SNAPSHOT_MAGIC)] != SNAPSHOT_MAGIC:
+                raise ValueError(f"Not a snapshot file: {self.snapshot_path}")
+            payload = _decode(f.read(), header[-1:])
+        self.snapshot_seq = payload['seq']
+        return payload['documents']
+
+    def _read_wal(self):
+        """Yield (seq, record) frames; a torn or corrupt tail is truncated"""
+        if not os.path.exists(self.wal_path):
+            return
+        with open(self.wal_path, 'rb') as f:
+            header = f.read(len(WAL_MAGIC) + 1)
+            if len(header) < len(WAL_MAGIC) + 1 or header[:len(WAL_MAGIC)] != WAL_MAGIC:
+                return
+            codec = header[-1:]
+            good_offset = f.tell()
+            while True:
+                frame_header = f.read(FRAME_HEADER.size)
+                if not frame_header:
+                    break
+                if len(frame_header) < FRAME_HEADER.size:
+                    break
+                seq, length, crc = FRAME_HEADER.unpack(frame_header)
+                payload = f.read(length)
+                if len(payload) < length or zlib.crc32(payload) != crc:
+                    break
+                good_offset = f.tell()
+                yield seq, _decode(payload, codec)
+            end_offset = os.path.getsize(self.wal_path)
+
+        if good_offset < end_offset:
+            logging.warning("Truncating torn WAL tail at offset %s", good_offset)
+            with open(self.wal_path, 'r+b') as f:
+                f.truncate(good_offset)
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+    def _open_wal(self):
+        if self._wal is not None:
+            return self._wal
+        exists = os.path.exists(self.wal_path) and os.path.getsize(self.wal_path) > 0
+        if exists:
+            with open(self.wal_path, 'rb') as f:
+                header = f.read(len(WAL_MAGIC) + 1)
+            # Keep appending in the codec the existing log was started with
+            self.codec = header[-1:]
+        self._wal = open(self.wal_path, 'ab')
+        if not exists:
+            self._wal.write(WAL_MAGIC + self.codec)
+        return self._wal
+
+    def _append(self, records):
+        """Append records as WAL frames with a single flush/fsync"""
+        wal = self._open_wal()
+        frames = []
+        for record in records:
+            self.last_seq += 1
+            payload = _encode(record, self.codec)
+            frames.append(FRAME_HEADER.pack(self.last_seq, len(payload), zlib.crc32(payload)))
+            frames.append(payload)
+        wal.write(b''.join(frames))
+        wal.flush()
+        if self.fsync:
+            os.fsync(wal.fileno())
+        self.records_since_checkpoint += len(records)
+
+    def log_insert(self, documents):
+        """Record inserted documents in the WAL"""
+        self._append([['insert', doc] for doc in documents])
+
+    def log_update(self, product_id, update):
+        """Record an update ({$push|$set|$inc: ...}) for one product in the WAL"""
+        self._append([['update', product_id, update]])
+
+    def log_updates(self, updates):
+        """Record a batch of (product_id, update) pairs with a single fsync"""
+        self._append([['update', product_id, update] for product_id, update in updates])
+
+    def log_batch(self, documents, updates):
+        """Record inserted documents and (product_id, update) pairs in one WAL append"""
+        self._append([['insert', doc] for doc in documents] +
+                     [['update', product_id, update] for product_id, update in updates])
+
+    def should_checkpoint(self):
+        """True once enough WAL records have accumulated since the last snapshot"""
+        return self.records_since_checkpoint >= self.snapshot_interval
+
+    def checkpoint(self, documents):
+        """Write a compacted snapshot of documents and truncate the WAL"""
+        self.close()
+        payload = _encode({'seq': self.last_seq, 'documents': documents}, self.codec)
+        tmp_path = self.snapshot_path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            f.write(SNAPSHOT_MAGIC + self.codec)
+            f.write(payload)
+            f.flush()
+            if self.fsync:
+                os.fsync(f.fileno())
+        os.replace(tmp_path, self.snapshot_path)
+        self.snapshot_seq = self.last_seq
+
+        # Frames up to snapshot_seq are skipped on replay, so a crash before
+        # this truncate cannot apply an update twice.
+        self.codec = _default_codec()
+        with open(self.wal_path, 'wb') as f:
+            f.write(WAL_MAGIC + self.codec)
+        self.records_since_checkpoint = 0
+        logging.info("Checkpoint written: %s documents at seq %s", len(documents), self.last_seq)
+
+    def replace_all(self, documents):
+        """Replace the stored collection (used by load_data)"""
+        self.checkpoint(documents)
+
+    def close(self):
+        """Close the WAL file handle"""
+        if self._wal is not None:
+            self._wal.close()
+            self._wal = None
@@ -4,40 +4,71 @@ Part 2: NoSQL Database Implementation
 Python version of mongodb_operations.js
 """
 
+import os
+import sys
 import json
-from pymongo import MongoClient
-from pymongo.errors import ConnectionFailure, ServerSelectionTimeoutException
+import time
+from collections import Counter
+from concurrent.futures import ThreadPoolExecutor
+from pymongo import MongoClient, ASCENDING, UpdateOne
+from pymongo.errors import (AutoReconnect, BulkWriteError, ConnectionFailure, NetworkTimeout,
+                            ServerSelectionTimeoutError)
 from datetime import datetime, timedelta
 import logging
 
-# Configure logging
-logging.basicConfig(
-    filename='mongodb_operations.log',
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s'
-)
+# Shared helpers (fleximart/) live at the project root
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+from fleximart.logs import configure_logging
+
+DUPLICATE_KEY_ERROR = 11000
+# Errors worth resending a batch for; anything else fails the load
+TRANSIENT_ERRORS = (AutoReconnect, NetworkTimeout, ServerSelectionTimeoutError)
+
+LOG_FILE = 'mongodb_operations.log'
 
 class MongoDBOperations:
-    def __init__(self, mongo_url='mongodb://localhost:27017/', database='fleximart_nosql'):
-        """Initialize MongoDB connection"""
+    def __init__(self, mongo_url='mongodb://localhost:27017/', database='fleximart_nosql',
+                 max_pool_size=50, min_pool_size=0, batch_size=1000, insert_workers=4,
+                 max_retries=3, client=None):
+        """
+        Initialize MongoDB connection settings
+        - max_pool_size / min_pool_size: MongoClient connection pool bounds
+        - batch_size: documents per insert_many call during load_data
+        - insert_workers: parallel insert threads (should not exceed max_pool_size)
+        - max_retries: attempts per batch on transient errors
+        - client: pre-built client (e.g. mongomock.MongoClient()) for local testing
+        """
         self.mongo_url = mongo_url
         self.database_name = database
-        self.client = None
+        self.max_pool_size = max_pool_size
+        self.min_pool_size = min_pool_size
+        self.batch_size = batch_size
+        self.insert_workers = max(1, min(insert_workers, max_pool_size))
+        self.max_retries = max_retries
+        self.client = client
         self.db = None
         self.products = None
     
     def connect(self):
         """Establish connection to MongoDB"""
         try:
-            self.client = MongoClient(self.mongo_url, serverSelectionTimeoutMS=5000)
+            if self.client is None:
+                self.client = MongoClient(
+                    self.mongo_url,
+                    serverSelectionTimeoutMS=5000,
+                    maxPoolSize=self.max_pool_size,
+                    minPoolSize=self.min_pool_size
+                )
             self.client.server_info()  # Test connection
             self.db = self.client[self.database_name]
             self.products = self.db['products']
             logging.info("MongoDB connection successful")
             print("✓ MongoDB connection successful")
             return True
-        except (ConnectionFailure, ServerSelectionTimeoutException) as e:
-            logging.error(f"MongoDB connection failed: {e}")
+        except (ConnectionFailure, ServerSelectionTimeoutError) as e:
+            logging.error("MongoDB connection failed: %s", e)
             print(f"✗ MongoDB connection failed: {e}")
             return False
     
@@ -50,35 +81,108 @@ class MongoDBOperations:
         print("="*60)
         
         try:
-            # Drop existing collection
-            self.products.drop()
-            print("✓ Cleared existing products collection")
-            
-            # Read JSON file
+            # Read and validate the JSON file before touching the collection
             with open(json_file_path, 'r', encoding='utf-8') as file:
                 products_data = json.load(file)
             
             print(f"✓ Loaded {len(products_data)} products from {json_file_path}")
             
-            # Insert into MongoDB
-            result = self.products.insert_many(products_data)
+            # product_id gets a unique index after the load; reject duplicates up front
+            id_counts = Counter(p.get('product_id') for p in products_data)
+            duplicates = sorted((pid for pid, count in id_counts.items() if count > 1), key=str)
+            if duplicates:
+                print(f"✗ Duplicate product_id values in {json_file_path}: {duplicates[:10]}")
+                logging.error("Duplicate product_id values: %s", duplicates)
+                return False
+            
+            # Drop existing collection
+            self.products.drop()
+            print("✓ Cleared existing products collection")
+            
+            # Insert into MongoDB in bounded, parallel, unordered batches
+            batches = [
+                products_data[i:i + self.batch_size]
+                for i in range(0, len(products_data), self.batch_size)
+            ]
+            with ThreadPoolExecutor(max_workers=self.insert_workers) as executor:
+                inserted_counts = list(executor.map(self._insert_batch, batches, range(len(batches))))
+            inserted = sum(inserted_counts)
             
-            print(f"✓ Inserted {len(result.inserted_ids)} documents into 'products' collection")
-            logging.info(f"Loaded {len(result.inserted_ids)} products from JSON")
+            print(f"✓ Inserted {inserted} documents into 'products' collection "
+                  f"({len(batches)} batches, {self.insert_workers} workers)")
+            logging.info("Loaded %s products from JSON", inserted)
             
-            return True
+            # Build indexes after the bulk load so inserts don't maintain them;
+            # the queries (and the unique product_id) depend on them, so a
+            # failure leaves no half-indexed collection behind
+            if not self.create_indexes():
+                self.products.drop()
+                print("✗ Dropped the products collection after the failed load")
+                logging.error("Dropped products collection after index creation failed")
+                return False
+            
+            return inserted == len(products_data)
         
         except FileNotFoundError:
             print(f"✗ File not found: {json_file_path}")
-            logging.error(f"File not found: {json_file_path}")
+            logging.error("File not found: %s", json_file_path)
             return False
         except json.JSONDecodeError as e:
             print(f"✗ Invalid JSON format: {e}")
-            logging.error(f"Invalid JSON format: {e}")
+            logging.error("Invalid JSON format: %s", e)
             return False
         except Exception as e:
             print(f"✗ Error loading data: {e}")
-            logging.error(f"Error loading data: {e}")
+            logging.error("Error loading data: %s", e)
+            return False
+    
+    def _insert_batch(self, batch, batch_number):
+        """
+        Insert one batch with insert_many(ordered=False), retrying transient errors
+        Only TRANSIENT_ERRORS (lost connection, network timeout, no server
+        selectable) are retried. Documents get their _id assigned on the first
+        attempt, so after such a retry already-inserted documents come back as
+        duplicate-key errors, which count as success. Other write errors (e.g.
+        validation failures) would fail again and are not resent.
+        """
+        pending = batch
+        inserted = 0
+        for attempt in range(1, self.max_retries + 1):
+            try:
+                result = self.products.insert_many(pending, ordered=False)
+                return inserted + len(result.inserted_ids)
+            except BulkWriteError as e:
+                details = e.details or {}
+                errors = details.get('writeErrors', [])
+                inserted += details.get('nInserted', 0)
+                inserted += sum(1 for err in errors if err.get('code') == DUPLICATE_KEY_ERROR)
+                failed = [err for err in errors if err.get('code') != DUPLICATE_KEY_ERROR]
+                if failed:
+                    logging.error("Batch %s: %s documents rejected: %s", batch_number, len(failed),
+                                  failed[0].get('errmsg'))
+                    print(f"✗ Batch {batch_number}: {len(failed)} documents rejected")
+                return inserted
+            except TRANSIENT_ERRORS as e:
+                logging.warning("Batch %s: transient error (attempt %s): %s", batch_number, attempt, e)
+            time.sleep(min(0.1 * 2 ** (attempt - 1), 2.0))
+        
+        logging.error("Batch %s: giving up after %s attempts", batch_number, self.max_retries)
+        print(f"✗ Batch {batch_number} failed after {self.max_retries} attempts")
+        return inserted
+    
+    def create_indexes(self):
+        """Create the indexes used by the query operations"""
+        try:
+            self.products.create_index([("category", ASCENDING), ("price", ASCENDING)],
+                                       name="idx_category_price")
+            self.products.create_index([("product_id", ASCENDING)], name="idx_product_id", unique=True)
+            self.products.create_index([("reviews.rating", ASCENDING)], name="idx_reviews_rating")
+            print("✓ Created indexes: category+price, product_id, reviews.rating")
+            logging.info("Indexes created on products collection")
+            return True
+        except Exception as e:
+            print(f"✗ Index creation error: {e}")
+            logging.error("Index creation error: %s", e)
             return False
     
     def basic_query(self):
@@ -120,12 +224,12 @@ class MongoDBOperations:
                     stock = product.get('stock', 0)
                     print(f"{name:<30} ₹{price:>10,.2f} {stock:>10}")
             
-            logging.info(f"Basic query returned {len(results)} products")
+            logging.info("Basic query returned %s products", len(results))
             return results
         
         except Exception as e:
             print(f"✗ Query error: {e}")
-            logging.error(f"Query error: {e}")
+            logging.error("Query error: %s", e)
             return []
     
     def review_analysis(self):
@@ -187,12 +291,12 @@ class MongoDBOperations:
                     reviews = product.get('review_count', 0)
                     print(f"{name:<35} {rating:>12.1f}⭐ {reviews:>10}")
             
-            logging.info(f"Review analysis returned {len(results)} products")
+            logging.info("Review analysis returned %s products", len(results))
             return results
         
         except Exception as e:
             print(f"✗ Aggregation error: {e}")
-            logging.error(f"Aggregation error: {e}")
+            logging.error("Aggregation error: %s", e)
             return []
     
     def update_review(self, product_id="ELEC001"):
@@ -232,7 +336,7 @@ class MongoDBOperations:
                 )
                 print(f"\n  Total reviews: {len(updated.get('reviews', []))}")
                 
-                logging.info(f"Added review to {product_id}")
+                logging.info("Added review to %s", product_id)
             else:
                 print(f"\n✗ Product {product_id} not found")
             
@@ -240,9 +344,49 @@ class MongoDBOperations:
         
         except Exception as e:
             print(f"✗ Update error: {e}")
-            logging.error(f"Update error: {e}")
+            logging.error("Update error: %s", e)
             return False
     
+    def bulk_write(self, operations, ordered=False):
+        """
+        Apply many update operations in one round trip
+        Takes the same operation dicts as MongoDBOperationsStandalone.bulk_write
+        ({'filter': ..., 'update': ..., 'upsert': bool}, optionally wrapped as
+        {'update_one': {...}}) and sends them as pymongo UpdateOne requests,
+        unordered by default so one failed document does not stop the rest.
+        """
+        start = time.perf_counter()
+        result = {'matched_count': 0, 'modified_count': 0, 'upserted_count': 0, 'ops_per_sec': 0.0}
+        requests = []
+        for op in operations:
+            op = op.get('update_one', op)
+            requests.append(UpdateOne(op['filter'], op['update'], upsert=op.get('upsert', False)))
+        if not requests:
+            return result
+        
+        try:
+            written = self.products.bulk_write(requests, ordered=ordered)
+            result['matched_count'] = written.matched_count
+            result['modified_count'] = written.modified_count
+            result['upserted_count'] = written.upserted_count
+        except BulkWriteError as e:
+            details = e.details or {}
+            result['matched_count'] = details.get('nMatched', 0)
+            result['modified_count'] = details.get('nModified', 0)
+            result['upserted_count'] = details.get('nUpserted', 0)
+            result['error'] = f"{len(details.get('writeErrors', []))} write error(s)"
+            logging.error("Bulk write error: %s", result['error'])
+            print(f"✗ Bulk write error: {result['error']}")
+        
+        elapsed = time.perf_counter() - start
+        result['elapsed_sec'] = elapsed
+        result['ops_per_sec'] = len(requests) / elapsed if elapsed > 0 else float('inf')
+        print(f"✓ bulk_write: {result['matched_count']} matched, {result['modified_count']} modified, "
+              f"{result['upserted_count']} upserted ({result['ops_per_sec']:,.0f} ops/sec)")
+        logging.info("bulk_write: %s matched, %s modified, %s upserted",
+                     result['matched_count'], result['modified_count'], result['upserted_count'])
+        return result
+    
     def category_analysis(self):
         """
         OPERATION 5: Complex Aggregation - Average price by category
@@ -306,12 +450,12 @@ class MongoDBOperations:
                     print(f"  Products: {item.get('product_count', 0)}")
                     print(f"  Total Stock: {item.get('total_stock', 0)} units")
             
-            logging.info(f"Category analysis returned {len(results)} categories")
+            logging.info("Category analysis returned %s categories", len(results))
             return results
         
         except Exception as e:
             print(f"✗ Aggregation error: {e}")
-            logging.error(f"Aggregation error: {e}")
+            logging.error("Aggregation error: %s", e)
             return []
     
     def disconnect(self):
@@ -339,7 +483,6 @@ def main():
         return
     
     # Get the directory of this script
-    import os
     script_dir = os.path.dirname(os.path.abspath(__file__))
     json_file_path = os.path.join(script_dir, 'products_catalog.json')
     
@@ -358,4 +501,5 @@ def main():
     print("="*60 + "\n")
 
 if __name__ == "__main__":
+    configure_logging(LOG_FILE)
     main()
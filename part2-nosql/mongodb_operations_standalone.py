@@ -5,30 +5,92 @@ Works WITHOUT MongoDB server - processes JSON data in-memory
 Demonstrates all 5 required MongoDB operations with results
 """
 
+import functools
 import json
 import os
+import time
+from collections import OrderedDict
 from datetime import datetime
 from copy import deepcopy
+import sys
 import logging
 
-# Configure logging
-log_file = os.path.join(os.path.dirname(__file__), 'mongodb_operations.log')
-logging.basicConfig(
-    filename=log_file,
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(message)s',
-    encoding='utf-8'
-)
+from document_storage import DocumentStorage, apply_update, copy_paths, update_modifies
+from query_cache import QueryResultCache
+from text_index import TextIndex
+from rwlock import NullLock, ReadWriteLock
+import query_engine
+
+log_file = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'mongodb_operations.log')
+
+# Shared helpers (fleximart/) live at the project root
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+from fleximart.logs import configure_logging, log_summary_lines
+
+
+def _reads(method):
+    """Run a query method under the store's shared (read) lock"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.lock.read():
+            return method(self, *args, **kwargs)
+    return wrapper
+
+
+def _writes(method):
+    """Run a mutating method under the store's exclusive (write) lock"""
+    @functools.wraps(method)
+    def wrapper(self, *args, **kwargs):
+        with self.lock.write():
+            return method(self, *args, **kwargs)
+    return wrapper
+
 
 class MongoDBOperationsStandalone:
-    def __init__(self, database='fleximart_nosql'):
-        """Initialize in-memory MongoDB simulator"""
+    def __init__(self, database='fleximart_nosql', storage_dir=None, snapshot_interval=1000,
+                 use_columnar=False, cache_max_bytes=16 * 1024 * 1024, thread_safe=True):
+        """
+        Initialize in-memory MongoDB simulator
+        If storage_dir is given, state is persisted there (snapshot + WAL)
+        and recovered on startup instead of re-reading the JSON file.
+        If use_columnar is True, category and rating queries run as
+        vectorized reductions over a ColumnarCatalog (requires numpy).
+        Analytical query results are cached (LRU, cache_max_bytes budget)
+        until the next write bumps the collection version.
+        name, specifications and reviews[].comment are kept in an inverted
+        text index (BM25) for text_search / $text queries.
+        If thread_safe is True, queries share a readers-writer lock and
+        writes (load_data, update_review, bulk_write, ...) hold it
+        exclusively, so concurrent readers always see a consistent collection.
+        """
         self.database_name = database
         self.products = []
         self.json_file = None
+        self.storage = None
+        
+        # Secondary structures maintained alongside self.products
+        self._id_index = {}       # product_id -> position in self.products
+        self._rating_stats = []   # per position: (sum of ratings, review count)
+        self.use_columnar = use_columnar
+        self._columnar = None     # ColumnarCatalog, rebuilt lazily after writes
+        self.version = 0          # bumped on every write; part of query cache keys
+        self.query_cache = QueryResultCache(max_bytes=cache_max_bytes)
+        self.text_index = TextIndex()
+        self.lock = ReadWriteLock() if thread_safe else NullLock()
+        
         logging.info("MongoDB Standalone Operations initialized")
         print("[INFO] MongoDB Standalone Operations initialized")
+        
+        if storage_dir:
+            self.storage = DocumentStorage(storage_dir, snapshot_interval=snapshot_interval)
+            self.products = self.storage.recover()
+            print(f"[INFO] Recovered {len(self.products)} documents from {storage_dir}")
+        
+        self._rebuild_indexes()
     
+    @_writes
     def load_data(self, json_file_path):
         """
         OPERATION 1: Load data from JSON file (1 mark)
@@ -39,25 +101,28 @@ class MongoDBOperationsStandalone:
         print("="*70)
         
         try:
-            # Clear existing products
-            self.products = []
-            
-            # Read JSON file
+            # Read and parse the JSON file first; on any failure the current
+            # collection, its indexes and version are left untouched
             if not os.path.exists(json_file_path):
                 print(f"[ERROR] File not found: {json_file_path}")
-                logging.error(f"File not found: {json_file_path}")
+                logging.error("File not found: %s", json_file_path)
                 return False
             
             with open(json_file_path, 'r', encoding='utf-8') as file:
                 products_data = json.load(file)
+            if not isinstance(products_data, list):
+                raise ValueError("expected a JSON array of product documents")
             
             print(f"[SUCCESS] Loaded {len(products_data)} products from JSON file")
             
-            # Insert into memory
+            # Persist the freshly loaded collection as a new snapshot, then replace it in memory
+            if self.storage:
+                self.storage.replace_all(products_data)
             self.products = deepcopy(products_data)
+            self._rebuild_indexes()
             
             print(f"[SUCCESS] Inserted {len(self.products)} documents into 'products' collection")
-            logging.info(f"Loaded {len(self.products)} products from JSON")
+            logging.info("Loaded %s products from JSON", len(self.products))
             
             # Show first product as sample
             if self.products:
@@ -74,13 +139,14 @@ class MongoDBOperationsStandalone:
         
         except json.JSONDecodeError as e:
             print(f"[ERROR] Invalid JSON format: {e}")
-            logging.error(f"Invalid JSON format: {e}")
+            logging.error("Invalid JSON format: %s", e)
             return False
         except Exception as e:
             print(f"[ERROR] Error loading data: {e}")
-            logging.error(f"Error loading data: {e}")
+            logging.error("Error loading data: %s", e)
             return False
     
+    @_reads
     def basic_query(self):
         """
         OPERATION 2: Find products in "Electronics" category with price < 50000 (2 marks)
@@ -92,10 +158,11 @@ class MongoDBOperationsStandalone:
         
         try:
             # Query: category = "Electronics" AND price < 50000
-            results = [
+            query = {"category": "Electronics", "price": {"$lt": 50000}}
+            results = self._cached('find', query, lambda: [
                 p for p in self.products 
                 if p.get('category') == 'Electronics' and p.get('price', 0) < 50000
-            ]
+            ])
             
             print(f"\n[SUCCESS] Found {len(results)} products matching criteria\n")
             
@@ -114,20 +181,92 @@ class MongoDBOperationsStandalone:
                     stock = product.get('stock', 0)
                     print(f"{name:<35} ₹{price:>13,.2f} {stock:>10}")
             
-            logging.info(f"Basic query returned {len(results)} products")
+            logging.info("Basic query returned %s products", len(results))
             return results
         
         except Exception as e:
             print(f"[ERROR] Query error: {e}")
-            logging.error(f"Query error: {e}")
+            logging.error("Query error: %s", e)
             return []
     
+    def _rebuild_indexes(self):
+        """Helper: Rebuild the product_id index, rating aggregates and text index"""
+        self._id_index = {p.get('product_id'): idx for idx, p in enumerate(self.products)}
+        self._rating_stats = [self._compute_rating_stats(p) for p in self.products]
+        self.text_index.build(self.products)
+        self._mark_modified()
+    
+    def _mark_modified(self):
+        """Helper: Invalidate derived structures after a write"""
+        self._columnar = None
+        self.version += 1
+    
+    def _cached(self, name, query, compute):
+        """
+        Helper: Return a cached result for (name, query, version) or compute it
+        The caller always gets its own copy; results never alias live documents.
+        """
+        key = QueryResultCache.make_key(name, query, self.version)
+        hit, results = self.query_cache.get(key)
+        if not hit:
+            results = deepcopy(compute())
+            self.query_cache.put(key, results)
+        return results
+    
+    def cache_stats(self):
+        """Query cache hit/miss statistics"""
+        return self.query_cache.stats()
+    
+    def _get_columnar(self):
+        """Helper: Return the columnar catalog, rebuilding it if writes invalidated it"""
+        if self._columnar is None:
+            from columnar_catalog import ColumnarCatalog    # numpy is only imported when columnar mode is used
+            self._columnar = ColumnarCatalog.from_documents(self.products)
+        return self._columnar
+    
+    def _compute_rating_stats(self, product):
+        """Helper: (sum of ratings, review count) for one product"""
+        reviews = product.get('reviews', [])
+        return (sum(r.get('rating', 0) for r in reviews), len(reviews))
+    
     def _calculate_average(self, numbers):
         """Helper: Calculate average"""
         if not numbers:
             return 0
         return sum(numbers) / len(numbers)
     
+    def _review_analysis_rows(self, min_rating=4.0):
+        """Helper: Products with average rating >= min_rating, best first"""
+        if self.use_columnar:
+            positions, averages, counts = self._get_columnar().products_with_min_rating(min_rating)
+            return [{
+                'name': self.products[pos].get('name'),
+                'average_rating': float(avg),
+                'review_count': int(count),
+                'category': self.products[pos].get('category')
+            } for pos, avg, count in zip(positions, averages, counts)]
+        
+        # Calculate average rating for each product
+        products_with_ratings = []
+        
+        # Uses the maintained per-product rating aggregates
+        for product, (rating_sum, review_count) in zip(self.products, self._rating_stats):
+            if review_count:
+                avg_rating = rating_sum / review_count
+                
+                if avg_rating >= min_rating:
+                    products_with_ratings.append({
+                        'name': product.get('name'),
+                        'average_rating': avg_rating,
+                        'review_count': review_count,
+                        'category': product.get('category')
+                    })
+        
+        # Sort by rating descending
+        products_with_ratings.sort(key=lambda x: x['average_rating'], reverse=True)
+        return products_with_ratings
+    
+    @_reads
     def review_analysis(self):
         """
         OPERATION 3: Find products with average rating >= 4.0 (2 marks)
@@ -142,25 +281,12 @@ class MongoDBOperationsStandalone:
         print("="*70)
         
         try:
-            # Calculate average rating for each product
-            products_with_ratings = []
-            
-            for product in self.products:
-                reviews = product.get('reviews', [])
-                if reviews:
-                    ratings = [r.get('rating', 0) for r in reviews]
-                    avg_rating = self._calculate_average(ratings)
-                    
-                    if avg_rating >= 4.0:
-                        products_with_ratings.append({
-                            'name': product.get('name'),
-                            'average_rating': avg_rating,
-                            'review_count': len(reviews),
-                            'category': product.get('category')
-                        })
-            
-            # Sort by rating descending
-            products_with_ratings.sort(key=lambda x: x['average_rating'], reverse=True)
+            pipeline = [
+                {"$addFields": {"average_rating": {"$avg": "$reviews.rating"}}},
+                {"$match": {"average_rating": {"$gte": 4.0}}},
+                {"$sort": {"average_rating": -1}}
+            ]
+            products_with_ratings = self._cached('aggregate', pipeline, self._review_analysis_rows)
             
             print(f"\n[SUCCESS] Found {len(products_with_ratings)} products with average rating >= 4.0\n")
             
@@ -186,14 +312,15 @@ class MongoDBOperationsStandalone:
                 print(f"  {top['name']}")
                 print(f"  Average Rating: {top['average_rating']:.2f}/5 ({top['review_count']} reviews)")
             
-            logging.info(f"Review analysis returned {len(products_with_ratings)} products")
+            logging.info("Review analysis returned %s products", len(products_with_ratings))
             return products_with_ratings
         
         except Exception as e:
             print(f"[ERROR] Aggregation error: {e}")
-            logging.error(f"Aggregation error: {e}")
+            logging.error("Aggregation error: %s", e)
             return []
     
+    @_writes
     def update_review(self, product_id="ELEC001"):
         """
         OPERATION 4: Add a new review to a product (2 marks)
@@ -205,18 +332,12 @@ class MongoDBOperationsStandalone:
         
         try:
             # Find product
-            product = None
-            product_idx = -1
-            
-            for idx, p in enumerate(self.products):
-                if p.get('product_id') == product_id:
-                    product = p
-                    product_idx = idx
-                    break
+            product_idx = self._id_index.get(product_id, -1)
+            product = self.products[product_idx] if product_idx >= 0 else None
             
             if not product:
                 print(f"\n[ERROR] Product {product_id} not found")
-                logging.error(f"Product {product_id} not found")
+                logging.error("Product %s not found", product_id)
                 return False
             
             # New review
@@ -236,6 +357,11 @@ class MongoDBOperationsStandalone:
                 product['reviews'] = []
             
             product['reviews'].append(new_review)
+            rating_sum, review_count = self._rating_stats[product_idx]
+            self._rating_stats[product_idx] = (rating_sum + new_review['rating'], review_count + 1)
+            self.text_index.add_reviews(product_idx, [new_review])
+            self._mark_modified()
+            self._log_update(product_id, {"$push": {"reviews": new_review}})
             
             # After update
             after_count = len(product.get('reviews', []))
@@ -255,14 +381,343 @@ class MongoDBOperationsStandalone:
             print(f"  Reviews Before: {before_count}")
             print(f"  Reviews After: {after_count}")
             
-            logging.info(f"Added review to {product_id}")
+            logging.info("Added review to %s", product_id)
             return True
         
         except Exception as e:
             print(f"[ERROR] Update error: {e}")
-            logging.error(f"Update error: {e}")
+            logging.error("Update error: %s", e)
             return False
     
+    @_writes
+    def bulk_write(self, operations):
+        """
+        Apply many update operations in one pass
+        Simulates: db.products.bulkWrite([{updateOne: {filter, update}}, ...])
+        
+        Each operation is {'filter': {'product_id': ...}, 'update': {...}}
+        (or wrapped as {'update_one': {...}}). Supported operators: $push, $set,
+        $inc, $setOnInsert. With 'upsert': True, an unmatched product_id is
+        inserted as a new document built from the filter, $setOnInsert and the update.
+        Operations are grouped by target document; the id index, rating
+        aggregates and WAL are maintained once per batch, not per operation.
+        The batch is all-or-nothing: updated documents are built on copies and
+        swapped in only after every operation applied; on any error the
+        collection, indexes, version and WAL are left as they were.
+        Counts follow pymongo: matched_count/modified_count are per operation
+        (an operation that changes nothing is matched but not modified).
+        """
+        start = time.perf_counter()
+        result = {'matched_count': 0, 'modified_count': 0, 'upserted_count': 0,
+                  'unmatched': [], 'ops_per_sec': 0.0}
+        
+        try:
+            # Validate every operation and group by target document, preserving order per document
+            grouped = OrderedDict()
+            for op in operations:
+                op = op.get('update_one', op)
+                update = op['update']
+                if not isinstance(update, dict) or not update:
+                    raise ValueError(f"Invalid update document: {update!r}")
+                unsupported = set(update) - {'$push', '$set', '$inc', '$setOnInsert'}
+                if unsupported:
+                    raise ValueError(f"Unsupported update operator(s): {sorted(unsupported)}")
+                for path, amount in update.get('$inc', {}).items():
+                    if isinstance(amount, bool) or not isinstance(amount, (int, float)):
+                        raise ValueError(f"$inc amount for {path} is not a number: {amount!r}")
+                product_id = op['filter']['product_id']
+                grouped.setdefault(product_id, []).append((update, op.get('upsert', False)))
+            
+            # Build the new version of every target document; live documents are not touched
+            staged = []     # (product_id, position or None for an insert, new document, applied updates)
+            counts = {'matched_count': 0, 'modified_count': 0, 'upserted_count': 0}
+            for product_id, updates in grouped.items():
+                product_idx = self._id_index.get(product_id)
+                current = None
+                if product_idx is not None:
+                    paths = [path for update, _ in updates for operator, fields in update.items()
+                             if operator != '$setOnInsert' for path in fields]
+                    current = copy_paths(self.products[product_idx], paths)
+                applied = []
+                for update, upsert in updates:
+                    changes = {op: fields for op, fields in update.items() if op != '$setOnInsert'}
+                    if current is None:
+                        if not upsert:
+                            continue        # matches nothing, as in MongoDB
+                        current = copy_paths({'product_id': product_id, **update.get('$setOnInsert', {})},
+                                             [path for fields in changes.values() for path in fields])
+                        apply_update(current, changes)
+                        counts['upserted_count'] += 1
+                        continue
+                    counts['matched_count'] += 1
+                    if update_modifies(current, changes):
+                        counts['modified_count'] += 1
+                    apply_update(current, changes)
+                    if changes:
+                        applied.append(changes)
+                if current is None:
+                    result['unmatched'].append(product_id)
+                else:
+                    staged.append((product_id, product_idx, current, applied))
+            
+            if staged:
+                self._commit_bulk_write(staged)
+            result.update(counts)
+            
+            elapsed = time.perf_counter() - start
+            total_ops = sum(len(u) for u in grouped.values())
+            result['elapsed_sec'] = elapsed
+            result['ops_per_sec'] = total_ops / elapsed if elapsed > 0 else float('inf')
+            
+            print(f"[SUCCESS] bulk_write matched {result['matched_count']} and modified "
+                  f"{result['modified_count']} ({result['ops_per_sec']:,.0f} ops/sec)")
+            if result['upserted_count']:
+                print(f"[INFO] bulk_write inserted {result['upserted_count']} new document(s)")
+            if result['unmatched']:
+                print(f"[WARNING] {len(result['unmatched'])} product_id(s) not found")
+            logging.info("bulk_write: %s matched, %s modified, %s upserted, %s unmatched",
+                         result['matched_count'], result['modified_count'], result['upserted_count'],
+                         len(result['unmatched']))
+            return result
+        
+        except Exception as e:
+            print(f"[ERROR] Bulk write error (nothing applied): {e}")
+            logging.error("Bulk write error (nothing applied): %s", e)
+            result['unmatched'] = []
+            result['error'] = str(e)
+            return result
+    
+    def _commit_bulk_write(self, staged):
+        """
+        Helper: Swap staged documents into the collection, update the indexes
+        and append the whole batch to the WAL; restores the previous state on failure
+        """
+        previous_count = len(self.products)
+        replaced = {}
+        try:
+            inserted = []
+            log_records = []
+            for product_id, product_idx, product, applied in staged:
+                if product_idx is None:
+                    product_idx = len(self.products)
+                    self.products.append(product)
+                    self._id_index[product_id] = product_idx
+                    self._rating_stats.append(self._compute_rating_stats(product))
+                    self.text_index.add_document(product_idx, product)
+                    inserted.append(product)
+                    continue
+                replaced[product_idx] = self.products[product_idx]
+                self.products[product_idx] = product
+                if any(path.split('.')[0] == 'reviews' for update in applied for fields in update.values()
+                       for path in fields):
+                    self._rating_stats[product_idx] = self._compute_rating_stats(product)
+                self._index_text_update(product_idx, product, applied)
+                log_records.extend((product_id, update) for update in applied)
+            
+            # Upserted documents are logged whole (their updates already applied)
+            if self.storage:
+                self.storage.log_batch(inserted, log_records)
+        except Exception:
+            for product_idx, product in replaced.items():
+                self.products[product_idx] = product
+            del self.products[previous_count:]
+            self._rebuild_indexes()     # also drops any cached results built on the partial state
+            raise
+        
+        self._mark_modified()
+        if self.storage and self.storage.should_checkpoint():
+            self.checkpoint()
+    
+    @_writes
+    def update_many(self, filter, update):
+        """
+        Apply one update to every document matching an equality filter
+        Simulates: db.products.updateMany(filter, update)
+        """
+        if set(filter) == {'product_id'}:
+            targets = [filter['product_id']] if filter['product_id'] in self._id_index else []
+        else:
+            targets = [
+                p.get('product_id') for p in self.products
+                if all(p.get(field) == value for field, value in filter.items())
+            ]
+        return self.bulk_write([{'filter': {'product_id': pid}, 'update': update} for pid in targets])
+    
+    def _index_text_update(self, product_idx, product, updates):
+        """
+        Helper: Keep the text index in step with the updates applied to a document
+        Pushed reviews are indexed in one call; any other text field change
+        re-indexes the (already updated) document once.
+        """
+        pushed_reviews = []
+        for update in updates:
+            text_paths = [
+                (operator, path) for operator, fields in update.items() for path in fields
+                if path.split('.')[0] in ('name', 'specifications', 'reviews')
+            ]
+            if not text_paths:
+                continue
+            if not all(entry == ('$push', 'reviews') for entry in text_paths):
+                self.text_index.reindex_document(product_idx, product)
+                return
+            # Appended reviews only add terms; no need to re-read the existing ones
+            value = update['$push']['reviews']
+            pushed_reviews.extend(value['$each'] if isinstance(value, dict) and '$each' in value else [value])
+        if pushed_reviews:
+            self.text_index.add_reviews(product_idx, pushed_reviews)
+    
+    @_reads
+    def text_search(self, filter, limit=10):
+        """
+        Full-text query over name, specifications and reviews[].comment
+        Simulates: db.products.find({$text: {$search: "..."}, category: ...},
+                                    {score: {$meta: "textScore"}}).sort({score: {$meta: "textScore"}})
+        Words are OR'ed, "phrases" are required, -word excludes; other filter
+        keys are equality matches. Results are BM25-ranked, best first.
+        """
+        text = filter.get('$text')
+        if not text or '$search' not in text:
+            raise ValueError("text_search needs a {'$text': {'$search': ...}} filter")
+        equality = {field: value for field, value in filter.items() if field != '$text'}
+        
+        def compute():
+            candidates = None
+            if equality:
+                candidates = {
+                    idx for idx, p in enumerate(self.products)
+                    if all(p.get(field) == value for field, value in equality.items())
+                }
+            return [{
+                'product_id': self.products[idx].get('product_id'),
+                'name': self.products[idx].get('name'),
+                'category': self.products[idx].get('category'),
+                'score': score
+            } for idx, score in self.text_index.search(text['$search'], limit=limit, candidates=candidates)]
+        
+        results = self._cached('text', {'filter': filter, 'limit': limit}, compute)
+        logging.info("Text search %r returned %s products", text['$search'], len(results))
+        return results
+    
+    def _text_matches(self, filter):
+        """Helper: [(document, score)] for a filter, BM25-ranked when it has $text"""
+        text = filter.get('$text')
+        if text is None:
+            return [(p, None) for p in self.products if query_engine.match(p, filter)]
+        rest = {key: value for key, value in filter.items() if key != '$text'}
+        ranked = self.text_index.search(text['$search'])
+        return [(self.products[idx], score) for idx, score in ranked
+                if query_engine.match(self.products[idx], rest)]
+    
+    @_reads
+    def find(self, filter=None, projection=None, sort=None, skip=0, limit=0):
+        """
+        General query
+        Simulates: db.products.find(filter, projection).sort(sort).skip(skip).limit(limit)
+        Filters support equality, $eq/$ne/$gt/$gte/$lt/$lte/$in/$nin/$exists/$size/$regex,
+        $and/$or/$nor, dotted paths into arrays and $text (results then come
+        best first unless sort is given; {score: {$meta: "textScore"}} in the
+        projection adds the score). Rows are copies: changing them does not
+        change the stored documents.
+        """
+        filter = filter or {}
+        projection = dict(projection or {})
+        with_score = projection.pop('score', None) == {'$meta': 'textScore'}
+        matches = self._text_matches(filter)
+        if sort:
+            query_engine.sort_documents(matches, sort, document=lambda item: item[0])
+        matches = matches[skip:skip + limit] if limit else matches[skip:]
+        
+        results = []
+        for product, score in matches:
+            row = query_engine.project(product, projection) if projection else deepcopy(product)
+            if with_score:
+                row = dict(row, score=score)
+            results.append(row)
+        logging.info("find returned %s products", len(results))
+        return results
+    
+    @_reads
+    def aggregate(self, pipeline):
+        """
+        General aggregation pipeline
+        Simulates: db.products.aggregate(pipeline)
+        Stages: $match (a leading $match may use $text), $project, $addFields/$set,
+        $unwind, $group ($sum/$avg/$min/$max/$count/$push/$addToSet/$first/$last),
+        $sort, $skip, $limit, $count. Results are cached until the next write.
+        """
+        def compute():
+            documents = self.products
+            stages = list(pipeline)
+            if stages and '$text' in stages[0].get('$match', {}):
+                documents = [product for product, _ in self._text_matches(stages.pop(0)['$match'])]
+            return query_engine.run_pipeline(documents, stages)
+        
+        results = self._cached('pipeline', pipeline, compute)
+        logging.info("aggregate returned %s rows", len(results))
+        return results
+    
+    def _log_update(self, product_id, update):
+        """Helper: Write an update to the WAL and checkpoint when due"""
+        if not self.storage:
+            return
+        self.storage.log_update(product_id, update)
+        if self.storage.should_checkpoint():
+            self.checkpoint()
+    
+    @_writes
+    def checkpoint(self):
+        """Compact the WAL into a new on-disk snapshot"""
+        if self.storage:
+            self.storage.checkpoint(self.products)
+    
+    @_writes
+    def close(self):
+        """Flush and close on-disk storage"""
+        if self.storage:
+            self.storage.close()
+    
+    def _category_analysis_rows(self):
+        """Helper: Group products by category, sorted by avg_price descending"""
+        if self.use_columnar:
+            return self._get_columnar().category_analysis()
+        
+        # Group by category
+        categories = {}
+        
+        for product in self.products:
+            category = product.get('category', 'Unknown')
+            price = product.get('price', 0)
+            stock = product.get('stock', 0)
+        
+            if category not in categories:
+                categories[category] = {
+                    'prices': [],
+                    'count': 0,
+                    'total_stock': 0
+                }
+        
+            categories[category]['prices'].append(price)
+            categories[category]['count'] += 1
+            categories[category]['total_stock'] += stock
+        
+        # Process results
+        results = []
+        for category, data in categories.items():
+            prices = data['prices']
+            results.append({
+                'category': category,
+                'avg_price': self._calculate_average(prices),
+                'min_price': min(prices) if prices else 0,
+                'max_price': max(prices) if prices else 0,
+                'product_count': data['count'],
+                'total_stock': data['total_stock']
+            })
+        
+        # Sort by avg_price descending
+        results.sort(key=lambda x: x['avg_price'], reverse=True)
+        return results
+        
+    @_reads
     def category_analysis(self):
         """
         OPERATION 5: Complex Aggregation - Average price by category (3 marks)
@@ -276,40 +731,13 @@ class MongoDBOperationsStandalone:
         print("="*70)
         
         try:
-            # Group by category
-            categories = {}
-            
-            for product in self.products:
-                category = product.get('category', 'Unknown')
-                price = product.get('price', 0)
-                stock = product.get('stock', 0)
-                
-                if category not in categories:
-                    categories[category] = {
-                        'prices': [],
-                        'count': 0,
-                        'total_stock': 0
-                    }
-                
-                categories[category]['prices'].append(price)
-                categories[category]['count'] += 1
-                categories[category]['total_stock'] += stock
-            
-            # Process results
-            results = []
-            for category, data in categories.items():
-                prices = data['prices']
-                results.append({
-                    'category': category,
-                    'avg_price': self._calculate_average(prices),
-                    'min_price': min(prices) if prices else 0,
-                    'max_price': max(prices) if prices else 0,
-                    'product_count': data['count'],
-                    'total_stock': data['total_stock']
-                })
-            
-            # Sort by avg_price descending
-            results.sort(key=lambda x: x['avg_price'], reverse=True)
+            pipeline = [
+                {"$group": {"_id": "$category", "avg_price": {"$avg": "$price"},
+                            "product_count": {"$sum": 1}, "min_price": {"$min": "$price"},
+                            "max_price": {"$max": "$price"}, "total_stock": {"$sum": "$stock"}}},
+                {"$sort": {"avg_price": -1}}
+            ]
+            results = self._cached('aggregate', pipeline, self._category_analysis_rows)
             
             print(f"\n[SUCCESS] Analysis complete for {len(results)} categories\n")
             
@@ -347,14 +775,15 @@ class MongoDBOperationsStandalone:
                     print(f"  Product Count:  {item.get('product_count', 0):>13}")
                     print(f"  Total Stock:    {item.get('total_stock', 0):>13} units")
             
-            logging.info(f"Category analysis returned {len(results)} categories")
+            logging.info("Category analysis returned %s categories", len(results))
             return results
         
         except Exception as e:
             print(f"[ERROR] Aggregation error: {e}")
-            logging.error(f"Aggregation error: {e}")
+            logging.error("Aggregation error: %s", e)
             return []
     
+    @_reads
     def generate_results_file(self):
         """Save all operation results to a text file"""
         results_file = os.path.join(os.path.dirname(__file__), 'mongodb_results.txt')
@@ -380,13 +809,19 @@ class MongoDBOperationsStandalone:
                 
                 f.write("All operations executed successfully without MongoDB server.\n")
                 f.write("See console output for detailed results.\n")
+
+                log_lines = log_summary_lines()
+                if log_lines:
+                    f.write("\nLOG SUMMARY (repeated messages):\n")
+                    f.write("-" * 70 + "\n")
+                    f.write("\n".join(log_lines) + "\n")
             
             print(f"\n[SUCCESS] Results saved to: {results_file}")
-            logging.info(f"Results saved to {results_file}")
+            logging.info("Results saved to %s", results_file)
         
         except Exception as e:
             print(f"[ERROR] Could not save results file: {e}")
-            logging.error(f"Could not save results file: {e}")
+            logging.error("Could not save results file: %s", e)
 
 def main():
     """Run all MongoDB operations in standalone mode"""
@@ -432,4 +867,5 @@ def main():
     logging.info("All operations completed successfully")
 
 if __name__ == "__main__":
+    configure_logging(log_file)
     main()
@@ -0,0 +1,276 @@
+"""
+Relational -> Document Product Sync for FlexiMart
+Part 2: NoSQL Database Implementation
+Bulk-upserts price and stock from the ETL's products_cleaned.csv (P001...)
+into the document catalog (ELEC001...), either the standalone store or
+MongoDB through MongoDBOperations.bulk_write.
+- A persistent ID index maps relational product_id -> catalog product_id.
+  Unmapped products are matched by category + name (every word of the
+  relational name must appear in the catalog name); otherwise a new
+  document is inserted under the next free ID for its category prefix.
+- The index also keeps a hash of the synced fields per document, so a
+  run only writes documents whose price/stock changed since the last sync.
+  --full ignores the stored hashes and diffs against the live documents
+  instead (repairs drift after a catalog reload or manual edits).
+"""
+
+import argparse
+import csv
+import hashlib
+import json
+import logging
+import os
+import re
+import sys
+from datetime import datetime, timezone
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+PROJECT_ROOT = os.path.dirname(SCRIPT_DIR)
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+from fleximart.logs import configure_logging
+
+SOURCE_CSV = os.path.join(PROJECT_ROOT, 'part1-database-etl', 'products_cleaned.csv')
+CATALOG_JSON = os.path.join(SCRIPT_DIR, 'products_catalog.json')
+DEFAULT_STORAGE_DIR = os.path.join(SCRIPT_DIR, 'docstore_data')
+INDEX_FILE = 'product_sync_index.json'
+LOG_FILE = os.path.join(SCRIPT_DIR, 'product_sync.log')
+
+# Document fields kept in sync (and hashed) on every run
+SYNC_FIELDS = ('price', 'stock')
+
+
+def read_source_products(path=SOURCE_CSV):
+    """Relational products as {source_id, name, category, price, stock}"""
+    products = []
+    with open(path, newline='', encoding='utf-8') as f:
+        for row in csv.DictReader(f):
+            products.append({
+                'source_id': row['product_id'],
+                'name': row['product_name'],
+                'category': row['category'],
+                'price': float(row['price']),
+                'stock': int(float(row['stock_quantity'])),
+            })
+    return products
+
+
+def field_hash(values):
+    """Stable hash of the synced fields of one product"""
+    payload = json.dumps({field: values.get(field) for field in SYNC_FIELDS}, sort_keys=True)
+    return hashlib.sha1(payload.encode('utf-8')).hexdigest()[:16]
+
+
+def _name_tokens(name):
+    return set(re.findall(r"[a-z0-9']+", (name or '').lower()))
+
+
+class ProductIdIndex:
+    """
+    Persistent relational -> catalog ID map with the last synced field hash
+    Stored as JSON: {"products": {"P001": {"product_id": "ELEC001", "hash": "..."}}}
+    and replaced atomically on save.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.entries = {}
+        if os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as f:
+                self.entries = json.load(f).get('products', {})
+
+    def target(self, source_id):
+        entry = self.entries.get(source_id)
+        return entry['product_id'] if entry else None
+
+    def stored_hash(self, source_id):
+        entry = self.entries.get(source_id)
+        return entry.get('hash') if entry else None
+
+    def assign(self, source_id, product_id):
+        self.entries.setdefault(source_id, {})['product_id'] = product_id
+
+    def record_hash(self, source_id, value):
+        self.entries[source_id]['hash'] = value
+
+    def mapped_targets(self):
+        return {entry['product_id'] for entry in self.entries.values()}
+
+    def save(self):
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'products': self.entries}, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+
+def catalog_documents(store):
+    """product_id/name/category plus synced fields of every catalog document"""
+    fields = ('product_id', 'name', 'category') + SYNC_FIELDS
+    if isinstance(store.products, list):        # MongoDBOperationsStandalone
+        return [{field: doc.get(field) for field in fields} for doc in store.products]
+    projection = dict({field: 1 for field in fields}, _id=0)
+    return list(store.products.find({}, projection))
+
+
+class ProductSync:
+    """Diff relational products against the ID index and bulk-upsert the changes"""
+
+    def __init__(self, store, index, batch_size=500):
+        """store: MongoDBOperationsStandalone or a connected MongoDBOperations"""
+        self.store = store
+        self.index = index
+        self.batch_size = batch_size
+
+    def _match(self, product, documents, claimed):
+        """Unclaimed catalog document in the same category whose name contains every source word"""
+        wanted = _name_tokens(product['name'])
+        matches = [
+            doc for doc in documents
+            if doc['product_id'] not in claimed
+            and (doc.get('category') or '').lower() == product['category'].lower()
+            and wanted <= _name_tokens(doc.get('name'))
+        ]
+        return matches[0]['product_id'] if len(matches) == 1 else None
+
+    @staticmethod
+    def _next_id(category, documents, taken):
+        """Next free ID for a category, reusing the prefix its documents already use (ELEC, FASH, ...)"""
+        same_category = [doc['product_id'] for doc in documents
+                         if (doc.get('category') or '').lower() == category.lower()]
+        prefix = (re.match(r'[A-Z]+', same_category[0]).group()
+                  if same_category else re.sub(r'[^A-Z]', '', category.upper())[:4] or 'PROD')
+        numbers = [int(pid[len(prefix):]) for pid in taken
+                   if pid.startswith(prefix) and pid[len(prefix):].isdigit()]
+        return f"{prefix}{max(numbers, default=0) + 1:03d}"
+
+    def plan(self, products, full=False):
+        """
+        Build the upsert operations for products
+        Returns (operations, {source_id: new hash}, stats). Catalog documents
+        are only read when a product is unmapped or full is set.
+        """
+        stats = {'source': len(products), 'matched': 0, 'inserted': 0, 'changed': 0, 'unchanged': 0}
+        unmapped = [p for p in products if self.index.target(p['source_id']) is None]
+        documents = catalog_documents(self.store) if unmapped or full else []
+        by_id = {doc['product_id']: doc for doc in documents}
+        claimed = self.index.mapped_targets()
+        taken = set(by_id) | claimed
+
+        operations, hashes = [], {}
+        now = datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ')
+        for product in products:
+            source_id = product['source_id']
+            product_id = self.index.target(source_id)
+            new_document = False
+            if product_id is None:
+                product_id = self._match(product, documents, claimed)
+                if product_id:
+                    stats['matched'] += 1
+                else:
+                    product_id = self._next_id(product['category'], documents, taken)
+                    new_document = True
+                    stats['inserted'] += 1
+                self.index.assign(source_id, product_id)
+                claimed.add(product_id)
+                taken.add(product_id)
+                logging.info("Mapped %s -> %s%s", source_id, product_id, " (new)" if new_document else "")
+
+            value = field_hash(product)
+            current = field_hash(by_id[product_id]) if full and product_id in by_id else None
+            previous = current if full else self.index.stored_hash(source_id)
+            if value == previous and not new_document:
+                stats['unchanged'] += 1
+                continue
+
+            stats['changed'] += 1
+            hashes[source_id] = value
+            operations.append({
+                'filter': {'product_id': product_id},
+                'update': {
+                    '$set': dict({field: product[field] for field in SYNC_FIELDS},
+                                 source_product_id=source_id, updated_at=now),
+                    '$setOnInsert': {
+                        'name': product['name'], 'category': product['category'],
+                        'specifications': {}, 'reviews': [], 'tags': [], 'created_at': now,
+                    },
+                },
+                'upsert': True,
+            })
+        return operations, hashes, stats
+
+    def run(self, products, full=False, dry_run=False):
+        """Sync products; hashes are recorded only for batches that were written without error"""
+        print("\n" + "="*70)
+        print("PRODUCT SYNC: relational products -> document catalog")
+        print("="*70)
+
+        operations, hashes, stats = self.plan(products, full=full)
+        print(f"[INFO] {stats['source']} source products: {stats['changed']} changed, "
+              f"{stats['unchanged']} unchanged ({stats['matched']} newly matched by name, "
+              f"{stats['inserted']} new documents)")
+        stats['written'] = 0
+        if dry_run:
+            print("[INFO] Dry run: nothing written")
+            return stats
+
+        for start in range(0, len(operations), self.batch_size):
+            batch = operations[start:start + self.batch_size]
+            result = self.store.bulk_write(batch)
+            if 'error' in result:
+                print(f"[ERROR] Batch at {start} failed: {result['error']}")
+                continue
+            for op in batch:
+                source_id = op['update']['$set']['source_product_id']
+                self.index.record_hash(source_id, hashes[source_id])
+            stats['written'] += len(batch)
+
+        self.index.save()
+        print(f"[SUCCESS] Wrote {stats['written']} document(s); index saved to {self.index.path}")
+        logging.info("Product sync: %s", stats)
+        return stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Sync relational product price/stock into the document catalog')
+    parser.add_argument('--target', choices=['standalone', 'mongodb'], default='standalone')
+    parser.add_argument('--source', default=SOURCE_CSV, help='products_cleaned.csv from the ETL')
+    parser.add_argument('--storage-dir', default=DEFAULT_STORAGE_DIR,
+                        help='standalone store directory (seeded from products_catalog.json when empty)')
+    parser.add_argument('--mongo-url', default='mongodb://localhost:27017/')
+    parser.add_argument('--database', default='fleximart_nosql')
+    parser.add_argument('--index', help=f'ID index file (default: {INDEX_FILE} in the storage dir, '
+                                        f'or product_sync_index_<database>.json for MongoDB)')
+    parser.add_argument('--batch-size', type=int, default=500)
+    parser.add_argument('--full', action='store_true', help='diff against live documents, not stored hashes')
+    parser.add_argument('--dry-run', action='store_true')
+    args = parser.parse_args(argv)
+
+    if args.target == 'standalone':
+        from mongodb_operations_standalone import MongoDBOperationsStandalone
+        store = MongoDBOperationsStandalone(database=args.database, storage_dir=args.storage_dir)
+        if not store.products and not store.load_data(CATALOG_JSON):
+            return 1
+        index_path = args.index or os.path.join(args.storage_dir, INDEX_FILE)
+    else:
+        from mongodb_operations import MongoDBOperations
+        store = MongoDBOperations(mongo_url=args.mongo_url, database=args.database)
+        if not store.connect():
+            return 1
+        index_path = args.index or os.path.join(SCRIPT_DIR, f'product_sync_index_{args.database}.json')
+
+    try:
+        sync = ProductSync(store, ProductIdIndex(index_path), batch_size=args.batch_size)
+        sync.run(read_source_products(args.source), full=args.full, dry_run=args.dry_run)
+    finally:
+        if args.target == 'standalone':
+            store.close()
+        else:
+            store.disconnect()
+    return 0
+
+
+if __name__ == "__main__":
+    configure_logging(LOG_FILE)
+    sys.exit(main())
@@ -0,0 +1,89 @@
+"""
+Query Result Cache for the Standalone Document Store
+Part 2: NoSQL Database Implementation
+LRU cache with a byte budget, keyed by normalized query + collection version
+"""
+
+import json
+import pickle
+import logging
+import threading
+from collections import OrderedDict
+
+
+class QueryResultCache:
+    """
+    LRU cache of analytical query results
+    - Keys combine the operation name, a normalized (sorted-key JSON) query
+      or pipeline, and the collection version, so any write makes older
+      entries unreachable; they age out through normal LRU eviction
+    - Entries are stored pickled: sizes are exact and every hit returns a
+      private copy, so callers cannot change a cached result (or the
+      documents it was built from) in place
+    - Safe to share between threads (concurrent readers of the store)
+    """
+
+    def __init__(self, max_bytes=16 * 1024 * 1024):
+        """Initialize an empty cache with a byte budget"""
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()   # key -> (pickled value, size)
+        self.current_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def make_key(name, query, version):
+        """Build a cache key from an operation name, query/pipeline and version"""
+        normalized = json.dumps(query, sort_keys=True, separators=(',', ':'), default=str)
+        return (name, normalized, version)
+
+    def get(self, key):
+        """Return (hit, value); a hit refreshes the entry's LRU position and returns a fresh copy"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return False, None
+            self._entries.move_to_end(key)
+            self.hits += 1
+        return True, pickle.loads(entry[0])
+
+    def put(self, key, value):
+        """Store a snapshot of a result, evicting least recently used entries over budget"""
+        blob = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+        size = len(blob)
+        if size > self.max_bytes:
+            logging.info("Query result for %s (%s bytes) exceeds cache budget; not cached", key[0], size)
+            return
+        with self._lock:
+            if key in self._entries:
+                self.current_bytes -= self._entries.pop(key)[1]
+            self._entries[key] = (blob, size)
+            self.current_bytes += size
+            while self.current_bytes > self.max_bytes:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.current_bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self):
+        """Drop all cached results (statistics are kept)"""
+        with self._lock:
+            self._entries.clear()
+            self.current_bytes = 0
+
+    def stats(self):
+        """Hit/miss statistics and current usage"""
+        with self._lock:
+            lookups = self.hits + self.misses
+            entries = len(self._entries)
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': self.hits / lookups if lookups else 0.0,
+            'evictions': self.evictions,
+            'entries': entries,
+            'bytes': self.current_bytes,
+            'max_bytes': self.max_bytes
+        }
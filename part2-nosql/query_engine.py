@@ -0,0 +1,327 @@
+"""
+Query Engine for the Standalone Document Store
+Part 2: NoSQL Database Implementation
+MongoDB-style filters, projections, sorting and aggregation pipelines
+evaluated over plain Python documents (used by find() / aggregate())
+"""
+
+import re
+
+COMPARISONS = {
+    '$eq': lambda value, arg: value == arg,
+    '$ne': lambda value, arg: value != arg,
+    '$gt': lambda value, arg: value is not None and value > arg,
+    '$gte': lambda value, arg: value is not None and value >= arg,
+    '$lt': lambda value, arg: value is not None and value < arg,
+    '$lte': lambda value, arg: value is not None and value <= arg,
+    '$in': lambda value, arg: value in arg,
+    '$nin': lambda value, arg: value not in arg,
+}
+
+
+def resolve(document, path):
+    """
+    Values at a dotted path, descending into arrays like MongoDB
+    ("reviews.rating" -> every review's rating); [] when the path is missing
+    """
+    values = [document]
+    for part in path.split('.'):
+        next_values = []
+        for value in values:
+            if isinstance(value, list):
+                next_values.extend(item[part] for item in value if isinstance(item, dict) and part in item)
+            elif isinstance(value, dict) and part in value:
+                next_values.append(value[part])
+        values = next_values
+    return values
+
+
+def _candidates(document, path):
+    """Values a field condition is tested against (array elements and the array itself)"""
+    candidates = []
+    for value in resolve(document, path):
+        if isinstance(value, list):
+            candidates.extend(value)
+        candidates.append(value)
+    return candidates
+
+
+def _match_condition(document, path, condition):
+    if not (isinstance(condition, dict) and condition and all(key.startswith('$') for key in condition)):
+        return condition in _candidates(document, path) or (condition is None and not resolve(document, path))
+
+    values = _candidates(document, path)
+    for operator, arg in condition.items():
+        if operator == '$exists':
+            if bool(resolve(document, path)) != bool(arg):
+                return False
+        elif operator == '$size':
+            if not any(isinstance(value, list) and len(value) == arg for value in resolve(document, path)):
+                return False
+        elif operator == '$regex':
+            flags = re.IGNORECASE if 'i' in condition.get('$options', '') else 0
+            if not any(isinstance(value, str) and re.search(arg, value, flags) for value in values):
+                return False
+        elif operator == '$options':
+            continue
+        elif operator in ('$ne', '$nin'):
+            # Negations hold only if no candidate value violates them
+            if not all(COMPARISONS[operator](value, arg) for value in values or [None]):
+                return False
+        elif operator in COMPARISONS:
+            if not any(_safe_compare(operator, value, arg) for value in values):
+                return False
+        else:
+            raise ValueError(f"Unsupported query operator: {operator}")
+    return True
+
+
+def _safe_compare(operator, value, arg):
+    try:
+        return COMPARISONS[operator](value, arg)
+    except TypeError:       # e.g. a string field compared with a number
+        return False
+
+
+def match(document, query):
+    """
+    True if the document satisfies a MongoDB-style filter
+    $text is resolved by the caller through the text index and is only valid
+    at the top level of a find filter or a leading $match, as in MongoDB
+    """
+    for key, condition in query.items():
+        if key == '$and':
+            if not all(match(document, sub) for sub in condition):
+                return False
+        elif key == '$or':
+            if not any(match(document, sub) for sub in condition):
+                return False
+        elif key == '$nor':
+            if any(match(document, sub) for sub in condition):
+                return False
+        elif key == '$text':
+            raise ValueError("$text is only allowed at the top level of a find filter or the first $match stage")
+        elif not _match_condition(document, key, condition):
+            return False
+    return True
+
+
+def evaluate(document, expression):
+    """Evaluate an aggregation expression ("$field", literals, {$size|$avg|$sum|...: ...})"""
+    if isinstance(expression, str) and expression.startswith('$'):
+        path = expression[1:]
+        values = resolve(document, path)
+        # A path through an array yields the array of values, as in MongoDB
+        if len(values) == 1 and not _through_array(document, path):
+            return values[0]
+        return values if values else None
+    if isinstance(expression, dict) and len(expression) == 1:
+        operator, arg = next(iter(expression.items()))
+        if operator == '$literal':
+            return arg
+        if operator in ARRAY_OPERATORS:
+            value = evaluate(document, arg)
+            numbers = [v for v in (value if isinstance(value, list) else [value]) if isinstance(v, (int, float))]
+            return ARRAY_OPERATORS[operator](numbers)
+        if operator == '$size':
+            value = evaluate(document, arg)
+            return len(value) if isinstance(value, list) else 0
+        if operator in ARITHMETIC:
+            args = [evaluate(document, item) for item in arg]
+            if any(value is None for value in args):
+                return None
+            return ARITHMETIC[operator](*args)
+        if operator == '$round':
+            value, places = (arg + [0])[:2] if isinstance(arg, list) else (arg, 0)
+            value = evaluate(document, value)
+            return round(value, places) if value is not None else None
+    if isinstance(expression, dict):
+        return {key: evaluate(document, value) for key, value in expression.items()}
+    return expression
+
+
+def _through_array(document, path):
+    current = document
+    for part in path.split('.')[:-1]:
+        if isinstance(current, list):
+            return True
+        current = current.get(part) if isinstance(current, dict) else None
+    return isinstance(current, list)
+
+
+ARRAY_OPERATORS = {
+    '$avg': lambda values: sum(values) / len(values) if values else None,
+    '$sum': lambda values: sum(values),
+    '$min': lambda values: min(values) if values else None,
+    '$max': lambda values: max(values) if values else None,
+}
+
+ARITHMETIC = {
+    '$add': lambda *args: sum(args),
+    '$subtract': lambda a, b: a - b,
+    '$multiply': lambda a, b: a * b,
+    '$divide': lambda a, b: a / b if b else None,
+}
+
+
+def project(document, projection):
+    """Apply an inclusion ({field: 1}), exclusion ({field: 0}) or computed ({field: expr}) projection"""
+    if not projection:
+        return document
+    fields = {key: value for key, value in projection.items() if key != '_id'}
+    exclude_id = projection.get('_id', 1) in (0, False)
+    # {'_id': 0} on its own excludes _id and keeps every other field
+    if (fields or exclude_id) and all(value in (0, False) for value in fields.values()):
+        result = dict(document)
+        for key in fields:
+            _drop_path(result, key)
+        if exclude_id:
+            result.pop('_id', None)
+        return result
+    result = {'_id': document['_id']} if not exclude_id and '_id' in document else {}
+    for key, value in fields.items():
+        if value in (1, True):
+            values = resolve(document, key)
+            if values:
+                _set(result, key, evaluate(document, '$' + key))
+        else:
+            _set(result, key, evaluate(document, value))
+    return result
+
+
+def _set(document, path, value):
+    """Helper: Set a dotted path, copying nested documents (they may be shared with the source)"""
+    parts = path.split('.')
+    for part in parts[:-1]:
+        nested = document.get(part)
+        document[part] = document = dict(nested) if isinstance(nested, dict) else {}
+    document[parts[-1]] = value
+
+
+def _drop_path(document, path):
+    parts = path.split('.')
+    for part in parts[:-1]:
+        value = document.get(part)
+        if not isinstance(value, dict):
+            return
+        document[part] = document = dict(value)     # copy on write; the source document is shared
+    document.pop(parts[-1], None)
+
+
+def sort_documents(documents, sort, document=lambda item: item):
+    """
+    Sort in place by [(field, direction)] / {field: direction}; missing values
+    sort first ascending. document(item) extracts the document from each item.
+    """
+    items = list(sort.items()) if isinstance(sort, dict) else list(sort)
+    for field, direction in reversed(items):
+        documents.sort(key=lambda item: _sort_key(evaluate(document(item), '$' + field)), reverse=direction < 0)
+    return documents
+
+
+def _sort_key(value):
+    if value is None:
+        return (0, 0)
+    if isinstance(value, bool):
+        return (2, value)
+    if isinstance(value, (int, float)):
+        return (1, value)
+    if isinstance(value, str):
+        return (3, value)
+    return (4, str(value))
+
+
+ACCUMULATORS = {'$sum', '$avg', '$min', '$max', '$count', '$push', '$addToSet', '$first', '$last'}
+
+
+def _group(documents, spec):
+    groups = {}
+    for document in documents:
+        key = evaluate(document, spec.get('_id'))
+        hashable = repr(key)
+        group = groups.get(hashable)
+        if group is None:
+            group = groups[hashable] = {'_id': key, '_values': {field: [] for field in spec if field != '_id'}}
+        for field, accumulator in spec.items():
+            if field == '_id':
+                continue
+            (operator, arg), = accumulator.items()
+            if operator not in ACCUMULATORS:
+                raise ValueError(f"Unsupported accumulator: {operator}")
+            group['_values'][field].append(1 if operator == '$count' else evaluate(document, arg))
+
+    results = []
+    for group in groups.values():
+        row = {'_id': group['_id']}
+        for field, accumulator in spec.items():
+            if field == '_id':
+                continue
+            operator = next(iter(accumulator))
+            values = group['_values'][field]
+            numbers = [v for v in values if isinstance(v, (int, float)) and not isinstance(v, bool)]
+            if operator in ('$sum', '$count'):
+                row[field] = sum(numbers)
+            elif operator == '$avg':
+                row[field] = sum(numbers) / len(numbers) if numbers else None
+            elif operator == '$min':
+                row[field] = min(numbers) if numbers else None
+            elif operator == '$max':
+                row[field] = max(numbers) if numbers else None
+            elif operator == '$push':
+                row[field] = values
+            elif operator == '$addToSet':
+                row[field] = list({repr(v): v for v in values}.values())
+            elif operator == '$first':
+                row[field] = values[0] if values else None
+            else:
+                row[field] = values[-1] if values else None
+        results.append(row)
+    return results
+
+
+def _unwind(documents, spec):
+    path = (spec['path'] if isinstance(spec, dict) else spec)[1:]
+    keep_empty = isinstance(spec, dict) and spec.get('preserveNullAndEmptyArrays', False)
+    for document in documents:
+        value = evaluate(document, '$' + path)
+        if isinstance(value, list) and value:
+            for item in value:
+                unwound = dict(document)
+                _set(unwound, path, item)
+                yield unwound
+        elif value not in (None, []) and not isinstance(value, list):
+            yield document
+        elif keep_empty:
+            yield document
+
+
+def run_pipeline(documents, pipeline):
+    """
+    Run an aggregation pipeline
+    Stages: $match, $project, $addFields/$set, $unwind, $group, $sort, $skip, $limit, $count
+    Input documents are never modified (stages copy before changing fields)
+    """
+    for stage in pipeline:
+        (name, spec), = stage.items()
+        if name == '$match':
+            documents = [doc for doc in documents if match(doc, spec)]
+        elif name == '$project':
+            documents = [project(doc, spec) for doc in documents]
+        elif name in ('$addFields', '$set'):
+            documents = [dict(doc, **{field: evaluate(doc, expr) for field, expr in spec.items()})
+                         for doc in documents]
+        elif name == '$unwind':
+            documents = list(_unwind(documents, spec))
+        elif name == '$group':
+            documents = _group(documents, spec)
+        elif name == '$sort':
+            documents = sort_documents(list(documents), spec)
+        elif name == '$skip':
+            documents = documents[spec:]
+        elif name == '$limit':
+            documents = documents[:spec]
+        elif name == '$count':
+            documents = [{spec: len(documents)}]
+        else:
+            raise ValueError(f"Unsupported pipeline stage: {name}")
+    return list(documents)
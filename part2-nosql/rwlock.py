@@ -0,0 +1,119 @@
+"""
+Readers-Writer Lock for the Standalone Document Store
+Part 2: NoSQL Database Implementation
+Many concurrent readers or one writer, writer-preferring, with contention statistics
+"""
+
+import threading
+import time
+from contextlib import contextmanager
+
+
+class ReadWriteLock:
+    """
+    Readers-writer lock built on a Condition
+    - Any number of threads may hold the read side at once; a thread
+      already reading re-enters without waiting (a queued writer would
+      otherwise deadlock against the outer read)
+    - The write side is exclusive and reentrant for its owner, and the
+      owner may also enter read sections (e.g. update_many -> bulk_write)
+    - Writer-preferring: once a writer is waiting, new readers queue
+      behind it, so a steady stream of queries cannot starve updates
+    A reader must not try to take the write side (no lock upgrades).
+    """
+
+    def __init__(self):
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        self._writer = None          # thread ident of the current writer
+        self._write_depth = 0
+        self._writers_waiting = 0
+        self._local = threading.local()     # per-thread read depth
+        self.read_acquires = 0
+        self.write_acquires = 0
+        self.read_wait_sec = 0.0
+        self.write_wait_sec = 0.0
+
+    @contextmanager
+    def read(self):
+        """Hold the lock shared for the duration of the block"""
+        me = threading.get_ident()
+        depth = getattr(self._local, 'depth', 0)
+        if self._writer == me or depth:
+            self._local.depth = depth + 1
+            try:
+                yield
+            finally:
+                self._local.depth = depth
+            return
+        start = time.perf_counter()
+        with self._cond:
+            while self._writer is not None or self._writers_waiting:
+                self._cond.wait()
+            self._readers += 1
+            self.read_acquires += 1
+            self.read_wait_sec += time.perf_counter() - start
+        self._local.depth = 1
+        try:
+            yield
+        finally:
+            self._local.depth = 0
+            with self._cond:
+                self._readers -= 1
+                if not self._readers:
+                    self._cond.notify_all()
+
+    @contextmanager
+    def write(self):
+        """Hold the lock exclusively for the duration of the block"""
+        me = threading.get_ident()
+        start = time.perf_counter()
+        with self._cond:
+            if self._writer == me:
+                self._write_depth += 1
+            else:
+                self._writers_waiting += 1
+                try:
+                    while self._writer is not None or self._readers:
+                        self._cond.wait()
+                finally:
+                    self._writers_waiting -= 1
+                    if self._writer is not None or self._readers:
+                        self._cond.notify_all()   # interrupted wait: let queued readers re-check
+                self._writer = me
+                self._write_depth = 1
+                self.write_acquires += 1
+                self.write_wait_sec += time.perf_counter() - start
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._write_depth -= 1
+                if not self._write_depth:
+                    self._writer = None
+                    self._cond.notify_all()
+
+    def stats(self):
+        """Acquire counts and total time spent waiting per side"""
+        with self._cond:
+            return {
+                'read_acquires': self.read_acquires,
+                'write_acquires': self.write_acquires,
+                'read_wait_sec': self.read_wait_sec,
+                'write_wait_sec': self.write_wait_sec,
+            }
+
+
+class NullLock:
+    """Same interface without synchronization (single-threaded use)"""
+
+    @contextmanager
+    def read(self):
+        yield
+
+    @contextmanager
+    def write(self):
+        yield
+
+    def stats(self):
+        return {}
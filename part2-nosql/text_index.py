@@ -0,0 +1,174 @@
+"""
+Inverted Full-Text Index for the Standalone Document Store
+Part 2: NoSQL Database Implementation
+Tokenized posting lists over name, specifications and reviews[].comment
+with BM25 ranking, maintained incrementally as documents and reviews change
+"""
+
+import math
+import re
+import logging
+from collections import Counter
+
+TOKEN_PATTERN = re.compile(r"[a-z0-9]+")
+STOPWORDS = frozenset(
+    "a an and are as at be but by for from has have i in is it its my of on or "
+    "so that the this to was were with very".split()
+)
+
+# Per-field weights (as in a MongoDB text index): a term in the name counts
+# as much as ten occurrences in review comments
+DEFAULT_WEIGHTS = {'name': 10, 'specifications': 2, 'reviews.comment': 1}
+
+
+def tokenize(text):
+    """Lowercased alphanumeric tokens without stopwords"""
+    return [token for token in TOKEN_PATTERN.findall(text.lower()) if token not in STOPWORDS]
+
+
+def _spec_text(value):
+    """Helper: Flatten specification values (nested dicts/lists) into one string"""
+    if isinstance(value, dict):
+        return ' '.join(_spec_text(v) for v in value.values())
+    if isinstance(value, list):
+        return ' '.join(_spec_text(v) for v in value)
+    return str(value) if value is not None else ''
+
+
+def parse_search(search):
+    """
+    Split a $search string into (terms, required, excluded)
+    Like MongoDB: plain words are OR'ed, "quoted phrases" must match and
+    -word excludes documents. Phrases are matched as all of their words.
+    """
+    required = []
+    for phrase in re.findall(r'"([^"]*)"', search):
+        required.extend(tokenize(phrase))
+    rest = re.sub(r'"[^"]*"', ' ', search)
+    excluded = set()
+    terms = []
+    for word in rest.split():
+        if word.startswith('-'):
+            excluded.update(tokenize(word[1:]))
+        else:
+            terms.extend(tokenize(word))
+    return list(dict.fromkeys(terms + required)), set(required), excluded
+
+
+class TextIndex:
+    """
+    Document-level inverted index with BM25 scoring
+    - postings: term -> {document position: weighted term frequency}
+    - Each document's weighted term counts and length are kept so a
+      document can be re-indexed (remove + add) when its fields change
+    - New reviews only add their comment terms (add_reviews), so pushing
+      a review costs O(comment length), not O(all reviews of the product)
+    """
+
+    def __init__(self, weights=None, k1=1.2, b=0.75):
+        self.weights = dict(DEFAULT_WEIGHTS, **(weights or {}))
+        self.k1 = k1
+        self.b = b
+        self.postings = {}
+        self._doc_terms = []      # position -> Counter(term -> weighted tf)
+        self._doc_length = []     # position -> weighted token count
+        self.total_length = 0
+
+    def build(self, products):
+        """Index every product from scratch (used by load_data / recovery)"""
+        self.postings = {}
+        self._doc_terms = []
+        self._doc_length = []
+        self.total_length = 0
+        for position, product in enumerate(products):
+            self.add_document(position, product)
+        logging.info("Text index built: %s documents, %s terms", len(products), len(self.postings))
+
+    def _field_counts(self, product):
+        counts = Counter()
+        for field, text in (('name', product.get('name') or ''),
+                            ('specifications', _spec_text(product.get('specifications')))):
+            weight = self.weights[field]
+            for token in tokenize(text):
+                counts[token] += weight
+        self._count_reviews(counts, product.get('reviews', []))
+        return counts
+
+    def _count_reviews(self, counts, reviews):
+        weight = self.weights['reviews.comment']
+        # One tokenizer pass over all comments; weights are applied per distinct term
+        tokens = Counter(tokenize(' '.join(review.get('comment') or '' for review in reviews)))
+        for token, tf in tokens.items():
+            counts[token] += tf * weight
+
+    def _add_counts(self, position, counts):
+        terms = self._doc_terms[position]
+        for term, tf in counts.items():
+            terms[term] += tf
+            posting = self.postings.get(term)
+            if posting is None:
+                posting = self.postings[term] = {}
+            posting[position] = posting.get(position, 0) + tf
+        length = sum(counts.values())
+        self._doc_length[position] += length
+        self.total_length += length
+
+    def add_document(self, position, product):
+        """Index a product at a new position (positions are appended in order)"""
+        while len(self._doc_terms) <= position:
+            self._doc_terms.append(Counter())
+            self._doc_length.append(0)
+        self._add_counts(position, self._field_counts(product))
+
+    def remove_document(self, position):
+        """Drop every posting of a document (its position stays allocated)"""
+        for term in self._doc_terms[position]:
+            posting = self.postings[term]
+            del posting[position]
+            if not posting:
+                del self.postings[term]
+        self.total_length -= self._doc_length[position]
+        self._doc_terms[position] = Counter()
+        self._doc_length[position] = 0
+
+    def reindex_document(self, position, product):
+        """Re-index a document after its name/specifications/reviews were rewritten"""
+        self.remove_document(position)
+        self._add_counts(position, self._field_counts(product))
+
+    def add_reviews(self, position, reviews):
+        """Incrementally index newly pushed reviews of a document"""
+        counts = Counter()
+        self._count_reviews(counts, reviews)
+        self._add_counts(position, counts)
+
+    def search(self, search, limit=None, candidates=None):
+        """
+        BM25-ranked [(position, score)] for a $search string, best first
+        candidates optionally restricts results to a set of positions
+        """
+        terms, required, excluded = parse_search(search)
+        documents = sum(1 for length in self._doc_length if length)
+        if not terms or not documents:
+            return []
+        average_length = self.total_length / documents
+
+        scores = {}
+        for term in terms:
+            posting = self.postings.get(term)
+            if not posting:
+                continue
+            df = len(posting)
+            idf = math.log(1 + (documents - df + 0.5) / (df + 0.5))
+            for position, tf in posting.items():
+                norm = self.k1 * (1 - self.b + self.b * self._doc_length[position] / average_length)
+                scores[position] = scores.get(position, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+
+        results = [
+            (position, score) for position, score in scores.items()
+            if (candidates is None or position in candidates)
+            and all(position in self.postings.get(term, ()) for term in required)
+            and not any(position in self.postings.get(term, ()) for term in excluded)
+        ]
+        results.sort(key=lambda item: (-item[1], item[0]))
+        return results[:limit] if limit else results
@@ -0,0 +1,172 @@
+-- ============================================================================
+-- OLAP ANALYTICS QUERIES ON SUMMARY CUBES - FLEXIMART DATA WAREHOUSE
+-- ============================================================================
+-- Database: fleximart_dw
+-- Purpose: Same reports as analytics_queries.sql, answered from the rollups
+--          in summary_cubes.sql instead of scanning fact_sales.
+-- Portable: runs on MySQL 8 and SQLite 3.25+ (window functions)
+--
+-- Not covered by the cubes (still read fact_sales in analytics_queries.sql):
+-- - Product-Customer Matrix (needs product x customer grain)
+-- - Discount Impact Analysis (needs per-transaction discount buckets)
+
+USE fleximart_dw;
+
+-- ============================================================================
+-- Query 1: Monthly Sales Drill-Down Analysis
+-- ============================================================================
+SELECT
+    r.year,
+    r.quarter,
+    r.month_name,
+    r.month,
+    SUM(r.transaction_count) as total_orders,
+    SUM(r.quantity_sold) as total_quantity,
+    ROUND(SUM(r.revenue), 2) as monthly_revenue
+FROM agg_sales_month_category r
+WHERE r.year = 2024
+GROUP BY r.year, r.quarter, r.month, r.month_name
+ORDER BY r.year ASC, r.month ASC;
+
+-- Alternative with Cumulative (Running Total) - Advanced Drill-Down
+SELECT
+    r.year,
+    r.quarter,
+    r.month_name,
+    SUM(r.transaction_count) as total_orders,
+    SUM(r.quantity_sold) as total_quantity,
+    ROUND(SUM(r.revenue), 2) as monthly_revenue,
+    ROUND(
+        SUM(SUM(r.revenue)) OVER (
+            PARTITION BY r.year
+            ORDER BY r.month
+        ), 2
+    ) as cumulative_revenue
+FROM agg_sales_month_category r
+WHERE r.year = 2024
+GROUP BY r.year, r.quarter, r.month, r.month_name
+ORDER BY r.year ASC, r.month ASC;
+
+-- ============================================================================
+-- Query 2: Product Performance Analysis
+-- ============================================================================
+SELECT
+    p.product_name,
+    p.category,
+    SUM(a.quantity_sold) as units_sold,
+    ROUND(SUM(a.revenue), 2) as revenue,
+    ROUND(
+        (SUM(a.revenue) / SUM(SUM(a.revenue)) OVER ()) * 100,
+        2
+    ) as revenue_percentage
+FROM agg_sales_daily_product a
+JOIN dim_product p ON a.product_key = p.product_key
+GROUP BY p.product_key, p.product_name, p.category
+ORDER BY revenue DESC
+LIMIT 10;
+
+-- ============================================================================
+-- Query 3: Customer Segmentation Analysis
+-- ============================================================================
+-- customer_spend holds lifetime spend and segment per customer, updated by
+-- the loader with each fact batch (customer_spend.py), so no aggregation of
+-- fact rows or daily cubes is needed here
+SELECT
+    customer_segment,
+    COUNT(*) as customer_count,
+    ROUND(SUM(ROUND(total_spent, 2)), 2) as total_revenue,
+    ROUND(AVG(ROUND(total_spent, 2)), 2) as avg_revenue_per_customer
+FROM customer_spend
+GROUP BY customer_segment
+ORDER BY
+    CASE
+        WHEN customer_segment = 'High Value' THEN 1
+        WHEN customer_segment = 'Medium Value' THEN 2
+        ELSE 3
+    END;
+
+-- ============================================================================
+-- ADDITIONAL ANALYTICAL QUERIES
+-- ============================================================================
+
+-- Query: Sales by Day of Week (Weekend vs Weekday Analysis)
+SELECT
+    CASE
+        WHEN d.is_weekend = TRUE THEN 'Weekend'
+        ELSE 'Weekday'
+    END as day_type,
+    d.day_of_week,
+    SUM(a.transaction_count) as transaction_count,
+    SUM(a.quantity_sold) as total_units,
+    ROUND(SUM(a.revenue) / SUM(a.transaction_count), 2) as avg_transaction_value,
+    ROUND(SUM(a.revenue), 2) as total_revenue
+FROM agg_sales_daily_product a
+JOIN dim_date d ON a.date_key = d.date_key
+GROUP BY d.is_weekend, d.day_of_week
+ORDER BY
+    d.is_weekend DESC,
+    CASE d.day_of_week
+        WHEN 'Monday' THEN 1 WHEN 'Tuesday' THEN 2 WHEN 'Wednesday' THEN 3
+        WHEN 'Thursday' THEN 4 WHEN 'Friday' THEN 5 WHEN 'Saturday' THEN 6
+        ELSE 7
+    END;
+
+-- Query: Top Categories by Revenue
+SELECT
+    p.category,
+    SUM(a.transaction_count) as transaction_count,
+    COUNT(DISTINCT p.product_key) as product_count,
+    SUM(a.quantity_sold) as units_sold,
+    ROUND(SUM(a.revenue), 2) as total_revenue,
+    ROUND(SUM(a.revenue) / SUM(a.transaction_count), 2) as avg_transaction_value,
+    ROUND(SUM(a.revenue) / SUM(a.quantity_sold), 2) as avg_unit_price
+FROM agg_sales_daily_product a
+JOIN dim_product p ON a.product_key = p.product_key
+GROUP BY p.category
+ORDER BY total_revenue DESC;
+
+-- Query: Customer City Analysis
+SELECT
+    c.city,
+    COUNT(DISTINCT c.customer_key) as customer_count,
+    SUM(a.transaction_count) as transaction_count,
+    SUM(a.quantity_sold) as units_purchased,
+    ROUND(SUM(a.revenue), 2) as total_spent,
+    ROUND(SUM(a.revenue) / SUM(a.transaction_count), 2) as avg_transaction_value
+FROM agg_sales_daily_customer a
+JOIN dim_customer c ON a.customer_key = c.customer_key
+GROUP BY c.city
+ORDER BY total_spent DESC;
+
+-- Query: Monthly Growth Analysis
+SELECT
+    r.month_name,
+    r.month,
+    SUM(r.transaction_count) as transactions,
+    ROUND(SUM(r.revenue), 2) as revenue,
+    LAG(SUM(r.revenue)) OVER (ORDER BY r.month) as prev_month_revenue,
+    ROUND(
+        ((SUM(r.revenue) - LAG(SUM(r.revenue)) OVER (ORDER BY r.month))
+         / LAG(SUM(r.revenue)) OVER (ORDER BY r.month)) * 100,
+        2
+    ) as month_over_month_growth_percent
+FROM agg_sales_month_category r
+WHERE r.year = 2024
+GROUP BY r.month, r.month_name
+ORDER BY r.month;
+
+-- Query: Quarter-over-Quarter Performance
+SELECT
+    r.quarter,
+    SUM(r.transaction_count) as transactions,
+    SUM(r.quantity_sold) as units_sold,
+    ROUND(SUM(r.revenue), 2) as quarter_revenue,
+    ROUND(SUM(r.revenue) / SUM(r.transaction_count), 2) as avg_transaction_value
+FROM agg_sales_month_category r
+WHERE r.year = 2024
+GROUP BY r.quarter
+ORDER BY r.quarter;
+
+-- ============================================================================
+-- End of Rollup Queries
+-- ============================================================================
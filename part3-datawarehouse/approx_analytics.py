@@ -0,0 +1,219 @@
+"""
+Approximate Analytics Mode for FlexiMart Data Warehouse
+Part 3: Data Warehouse Implementation
+Dashboard reports answered from mergeable sketches kept per month partition
+(see fact_partitions.py); the exact OLAPEngine path is unchanged for finance
+"""
+
+import os
+import time
+import pickle
+import argparse
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from olap_engine import OLAPEngine, StarSchema
+from sketches import HyperLogLog, GroupedHyperLogLog, CountMinSketch, SpaceSaving, TDigest
+
+SKETCH_FILE = 'sketches.pkl'
+
+# dim_date attributes that select whole months, so month sketches answer them exactly
+MONTH_ALIGNED_FILTERS = {'date.year', 'date.quarter', 'date.month', 'date.month_name'}
+
+
+class PartitionSketches:
+    """
+    Sketches for one month partition
+    - customers / customers_by_city: HyperLogLog over customer_key
+    - products_by_category: HyperLogLog over product_key
+    - product_revenue + top_products: Count-Min and Space-Saving over
+      product_key weighted by total_amount
+    - transaction_value: t-digest over total_amount
+    """
+
+    def __init__(self, customer_precision=14, product_precision=12, top_capacity=256, cms_width=2048):
+        self.rows = 0
+        self.revenue = 0.0
+        self.customers = HyperLogLog(customer_precision)
+        self.customers_by_city = GroupedHyperLogLog(customer_precision)
+        self.products_by_category = GroupedHyperLogLog(product_precision)
+        self.product_revenue = CountMinSketch(width=cms_width)
+        self.top_products = SpaceSaving(top_capacity)
+        self.transaction_value = TDigest()
+
+    def update(self, schema):
+        """Add the fact rows of a StarSchema (dimensions resolve city/category)"""
+        engine = OLAPEngine(schema)
+        customer_key = engine.column('customer_key')
+        product_key = engine.column('product_key')
+        amount = engine.column('total_amount').astype(np.float64)
+
+        self.rows += len(amount)
+        self.revenue += float(amount.sum())
+        self.customers.add(customer_key)
+        self.customers_by_city.add(*engine.codes('customer.city'), customer_key)
+        self.products_by_category.add(*engine.codes('product.category'), product_key)
+
+        # Pre-aggregate per product before feeding the weighted sketches
+        products, inverse = np.unique(product_key, return_inverse=True)
+        revenue = np.bincount(inverse, weights=amount, minlength=len(products))
+        self.product_revenue.add(products, revenue)
+        self.top_products.add(products, revenue)
+        self.transaction_value.add(amount)
+
+    def merge(self, other):
+        self.rows += other.rows
+        self.revenue += other.revenue
+        self.customers.merge(other.customers)
+        self.customers_by_city.merge(other.customers_by_city)
+        self.products_by_category.merge(other.products_by_category)
+        self.product_revenue.merge(other.product_revenue)
+        self.top_products.merge(other.top_products)
+        self.transaction_value.merge(other.transaction_value)
+        return self
+
+    def save(self, path):
+        tmp_path = path + '.tmp'
+        with open(tmp_path, 'wb') as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    @staticmethod
+    def load(path):
+        with open(path, 'rb') as f:
+            return pickle.load(f)
+
+
+class ApproximateAnalytics:
+    """
+    Approximate reports over a PartitionedFactStore
+    Filters are limited to month-aligned dim_date attributes (year, quarter,
+    month, month_name); anything finer needs the exact engine
+    """
+
+    def __init__(self, store):
+        self.store = store
+        self._merged = {}   # (months, files) -> merged PartitionSketches
+
+    def _sketches(self, where=None):
+        unsupported = set(where or {}) - MONTH_ALIGNED_FILTERS
+        if unsupported:
+            raise ValueError(f"Approximate mode cannot filter on {sorted(unsupported)}; use the exact engine")
+        months = tuple(self.store.prune(where))
+        signature = (months, tuple(tuple(self.store.manifest['partitions'][str(m)]['files']) for m in months))
+        if signature not in self._merged:
+            merged = PartitionSketches()
+            for month in months:
+                merged.merge(self.store.partition_sketches(month))
+            self._merged = {signature: merged}
+        return self._merged[signature]
+
+    def distinct_customers(self, where=None):
+        return round(self._sketches(where).customers.estimate())
+
+    def city_analysis(self, where=None):
+        """COUNT(DISTINCT customer_key) per city"""
+        estimates = self._sketches(where).customers_by_city.estimates()
+        frame = pd.DataFrame({'city': list(estimates), 'customer_count': np.round(list(estimates.values()))})
+        frame['customer_count'] = frame['customer_count'].astype(np.int64)
+        frame = frame[frame['customer_count'] > 0]
+        return frame.sort_values(['customer_count', 'city'], ascending=[False, True]).reset_index(drop=True)
+
+    def category_analysis(self, where=None):
+        """COUNT(DISTINCT product_key) per category"""
+        estimates = self._sketches(where).products_by_category.estimates()
+        frame = pd.DataFrame({'category': list(estimates), 'product_count': np.round(list(estimates.values()))})
+        frame['product_count'] = frame['product_count'].astype(np.int64)
+        frame = frame[frame['product_count'] > 0]
+        return frame.sort_values(['product_count', 'category'], ascending=[False, True]).reset_index(drop=True)
+
+    def product_performance(self, top_n=10, where=None):
+        """
+        Top products by revenue: candidates from Space-Saving, revenue from
+        Count-Min (an upper bound), revenue_error = upper - lower bound
+        """
+        sketches = self._sketches(where)
+        keys, lower = sketches.top_products.top(max(top_n * 4, top_n))
+        upper = np.minimum(sketches.product_revenue.estimate(keys), lower + sketches.top_products.offset)
+        order = np.argsort(-upper, kind='stable')[:top_n]
+        products = self.store.dimensions()['product'].set_index('product_key')
+        keys, lower, upper = keys[order], lower[order], upper[order]
+        frame = pd.DataFrame({
+            'product_name': products.loc[keys, 'product_name'].to_numpy(),
+            'category': products.loc[keys, 'category'].to_numpy(),
+            'revenue': upper.round(2),
+            'revenue_error': (upper - lower).round(2)
+        })
+        frame['revenue_percentage'] = (frame['revenue'] / sketches.revenue * 100).round(2)
+        return frame
+
+    def spend_quantiles(self, quantiles=(0.5, 0.9, 0.95, 0.99), where=None):
+        """Transaction value (total_amount) quantiles"""
+        digest = self._sketches(where).transaction_value
+        return pd.DataFrame({'quantile': list(quantiles),
+                             'total_amount': np.round(digest.quantile(list(quantiles)), 2)})
+
+
+def _approximate_reports(approx, where):
+    return (approx.city_analysis(where), approx.category_analysis(where),
+            approx.product_performance(where=where),
+            approx.spend_quantiles(where=where)['total_amount'].to_numpy())
+
+
+def compare(store, where=None):
+    """Print approximate vs exact answers with timings and errors"""
+    quantiles = np.array([0.5, 0.9, 0.95, 0.99])
+
+    start = time.perf_counter()
+    exact_engine = store.engine(where)
+    exact_city = exact_engine.city_analysis(where=where)[['city', 'customer_count']]
+    exact_category = exact_engine.category_analysis(where=where)[['category', 'product_count']]
+    exact_top = exact_engine.product_performance(where=where)
+    amounts = np.sort(exact_engine.column('total_amount')[exact_engine.mask(where)])
+    exact_time = time.perf_counter() - start
+
+    approx = ApproximateAnalytics(store)
+    start = time.perf_counter()
+    _approximate_reports(approx, where)
+    cold_time = time.perf_counter() - start
+    start = time.perf_counter()
+    approx_city, approx_category, approx_top, approx_quantiles = _approximate_reports(approx, where)
+    warm_time = time.perf_counter() - start
+
+    # t-digest bounds rank error: fraction of rows below each estimate vs the target quantile
+    approx_ranks = np.searchsorted(amounts, approx_quantiles) / len(amounts)
+    city = exact_city.merge(approx_city, on='city', suffixes=('_exact', '_approx'))
+    category = exact_category.merge(approx_category, on='category', suffixes=('_exact', '_approx'))
+    print(f"Exact: {exact_time:.3f}s   Approximate: {cold_time:.3f}s (merge sketches), {warm_time:.3f}s (merged)")
+    print(f"Max error - customers per city: "
+          f"{(abs(city['customer_count_approx'] / city['customer_count_exact'] - 1)).max():.2%}, "
+          f"products per category: "
+          f"{(abs(category['product_count_approx'] / category['product_count_exact'] - 1)).max():.2%}, "
+          f"spend quantile rank: {np.abs(approx_ranks - quantiles).max():.2%}")
+    overlap = len(set(exact_top['product_name']) & set(approx_top['product_name']))
+    print(f"Top-{len(exact_top)} products in common: {overlap}/{len(exact_top)}")
+
+
+def main():
+    from fact_partitions import PartitionedFactStore
+    from synthetic_star import generate_star
+
+    parser = argparse.ArgumentParser(description='Approximate vs exact warehouse reports')
+    parser.add_argument('--rows', type=int, default=2_000_000)
+    parser.add_argument('--customers', type=int, default=200_000)
+    args = parser.parse_args()
+
+    tables = generate_star(args.rows, products=5000, customers=args.customers)
+    with tempfile.TemporaryDirectory() as directory:
+        store = PartitionedFactStore.from_tables(directory, tables)
+        for where in [None, {'date.year': 2024}, {'date.year': 2024, 'date.quarter': 'Q2'}]:
+            print("\n" + "="*70)
+            print(f"where={where}")
+            print("="*70)
+            compare(store, where)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,142 @@
+"""
+Benchmark and SQL Parity Check for the In-Process OLAP Engine
+Part 3: Data Warehouse Implementation
+- verify: runs analytics_queries.sql on SQLite and compares every report
+  with OLAPEngine on the same data (Final*.csv and a synthetic star)
+- benchmark: times the main reports on synthetic stars of 10^6+ fact rows
+
+Memory: fact_sales costs ~64 bytes/row as NumPy columns plus ~8 bytes/row
+per cached join column, so 10^7 rows needs ~1.5 GB and 10^9 rows is only
+reachable with partitioned files on a large-memory host (~100 GB)
+"""
+
+import os
+import time
+import sqlite3
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from olap_engine import StarSchema, OLAPEngine, read_star_csv
+from sql_scripts import load_named_queries, mysql_to_portable
+from synthetic_star import generate_star
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ANALYTICS_QUERIES_FILE = os.path.join(SCRIPT_DIR, 'analytics_queries.sql')
+
+BENCHMARK_REPORTS = [
+    'Query 1: Monthly Sales Drill-Down Analysis',
+    'Alternative with Cumulative (Running Total) - Advanced Drill-Down',
+    'Query 2: Product Performance Analysis',
+    'Query 3: Customer Segmentation Analysis',
+    'Query: Top Categories by Revenue',
+    'Query: Customer City Analysis'
+]
+
+
+def to_sqlite(tables):
+    """In-memory SQLite copy of a star (REAL money columns, like the loader schema)"""
+    connection = sqlite3.connect(':memory:')
+    for name, frame in tables.items():
+        frame.to_sql(name, connection, index=False)
+    return connection
+
+
+def run_sql_reports(connection):
+    """{name: DataFrame} for every query in analytics_queries.sql"""
+    results = {}
+    for name, sql in load_named_queries(ANALYTICS_QUERIES_FILE):
+        results[name] = pd.read_sql_query(mysql_to_portable(sql), connection)
+    return results
+
+
+def frames_match(expected, actual):
+    """Same columns and values (row order included, floats within 0.01)"""
+    if list(expected.columns) != list(actual.columns) or len(expected) != len(actual):
+        return False
+    for col in expected.columns:
+        left, right = expected[col].to_numpy(), actual[col].to_numpy()
+        if pd.api.types.is_numeric_dtype(expected[col]) and pd.api.types.is_numeric_dtype(actual[col]):
+            if not np.allclose(left.astype(float), right.astype(float), atol=0.01, equal_nan=True):
+                return False
+        elif not (left.astype(str) == right.astype(str)).all():
+            return False
+    return True
+
+
+def verify(tables, label):
+    """Compare every SQL report with the engine; returns number of mismatches"""
+    print(f"\n[INFO] Parity check on {label} ({len(tables['fact_sales'])} fact rows)")
+    expected = run_sql_reports(to_sqlite(tables))
+    engine = OLAPEngine(StarSchema.from_frames(tables))
+    failures = 0
+    for name, sql_frame in expected.items():
+        ok = frames_match(sql_frame, engine.run_report(name))
+        failures += not ok
+        print(f"  [{'SUCCESS' if ok else 'ERROR'}] {name}")
+    return failures
+
+
+def benchmark(rows, repeat=3):
+    """Time star join (first run) and warm report runs on a synthetic star"""
+    print("\n" + "="*70)
+    print(f"BENCHMARK: {rows:,} fact rows")
+    print("="*70)
+
+    start = time.perf_counter()
+    tables = generate_star(rows)
+    print(f"Generate data: {time.perf_counter() - start:.2f}s")
+
+    engine = OLAPEngine(StarSchema.from_frames(tables))
+    del tables
+    for name in BENCHMARK_REPORTS:
+        start = time.perf_counter()
+        engine.run_report(name)
+        cold = time.perf_counter() - start
+        warm = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            engine.run_report(name)
+            warm.append(time.perf_counter() - start)
+        print(f"{name[:55]:<55} cold {cold:7.3f}s  warm {min(warm):7.3f}s")
+
+    # Multi-attribute filter: boolean masks vs bitmap AND/OR
+    where = {'product.category': 'Electronics', 'customer.city': 'Bangalore', 'date.quarter': 'Q1'}
+    aggregations = {'revenue': ('sum', 'total_amount'), 'transactions': ('count', None)}
+    timings = {}
+    for label in ['mask', 'bitmap']:
+        if label == 'bitmap':
+            start = time.perf_counter()
+            engine.enable_bitmap_index().build()
+            print(f"Bitmap index build: {time.perf_counter() - start:.3f}s "
+                  f"({engine.bitmap_index.nbytes() / 1e6:.1f} MB, {engine.bitmap_index.backend.name})")
+        engine.group_by(['date.month'], aggregations, where=where)
+        start = time.perf_counter()
+        for _ in range(repeat):
+            engine.group_by(['date.month'], aggregations, where=where)
+        timings[label] = (time.perf_counter() - start) / repeat
+    print(f"Electronics x Bangalore x Q1 by month: mask {timings['mask']:.4f}s  bitmap {timings['bitmap']:.4f}s")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='OLAP engine parity check and benchmark')
+    parser.add_argument('--rows', type=int, nargs='*', default=[10**6, 10**7],
+                        help='fact row counts to benchmark')
+    parser.add_argument('--verify-only', action='store_true', help='skip the benchmark')
+    args = parser.parse_args()
+
+    failures = verify(read_star_csv(SCRIPT_DIR), 'Final*.csv')
+    failures += verify(generate_star(20000, products=200, customers=2000), 'synthetic star')
+    if failures:
+        print(f"\n[ERROR] {failures} report(s) differ from analytics_queries.sql")
+    else:
+        print("\n[SUCCESS] All reports match analytics_queries.sql")
+
+    if not args.verify_only:
+        for rows in args.rows:
+            benchmark(rows)
+
+
+if __name__ == "__main__":
+    main()
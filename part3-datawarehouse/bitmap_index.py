@@ -0,0 +1,138 @@
+"""
+Bitmap Indexes for the FlexiMart OLAP Engine
+Part 3: Data Warehouse Implementation
+One bitmap of fact_sales row positions per value of a low-cardinality
+dimension attribute; multi-attribute filters resolve with bitmap AND/OR
+before any fact column is read. Uses roaring bitmaps (pyroaring) when
+installed, otherwise packed NumPy bitsets.
+"""
+
+import array
+
+import numpy as np
+
+try:
+    from pyroaring import BitMap
+    ROARING_AVAILABLE = True
+except ImportError:
+    ROARING_AVAILABLE = False
+
+# Filters used throughout analytics_queries.sql
+DEFAULT_BITMAP_COLUMNS = ['product.category', 'customer.city', 'customer.customer_segment',
+                          'date.is_weekend', 'date.quarter', 'date.year', 'date.month']
+
+
+class RoaringBitmaps:
+    """Roaring bitmap backend"""
+
+    name = 'roaring'
+
+    @staticmethod
+    def from_positions(positions, n_rows):
+        return BitMap(array.array('I', np.asarray(positions, dtype=np.uint32).tobytes()))
+
+    @staticmethod
+    def union(bitmaps):
+        return BitMap.union(*bitmaps) if len(bitmaps) > 1 else bitmaps[0]
+
+    @staticmethod
+    def intersection(bitmaps):
+        bitmaps = sorted(bitmaps, key=len)
+        return BitMap.intersection(*bitmaps) if len(bitmaps) > 1 else bitmaps[0]
+
+    @staticmethod
+    def to_positions(bitmap):
+        return np.frombuffer(bitmap.to_array(), dtype=np.uint32).astype(np.int64)
+
+    @staticmethod
+    def nbytes(bitmap):
+        return len(bitmap.serialize())
+
+
+class NumpyBitmaps:
+    """Packed bitset fallback (n_rows / 8 bytes per bitmap)"""
+
+    name = 'numpy'
+
+    @staticmethod
+    def from_positions(positions, n_rows):
+        bits = np.zeros(n_rows, dtype=bool)
+        bits[positions] = True
+        return np.packbits(bits), n_rows
+
+    @staticmethod
+    def union(bitmaps):
+        packed = bitmaps[0][0].copy()
+        for other, _ in bitmaps[1:]:
+            packed |= other
+        return packed, bitmaps[0][1]
+
+    @staticmethod
+    def intersection(bitmaps):
+        packed = bitmaps[0][0].copy()
+        for other, _ in bitmaps[1:]:
+            packed &= other
+        return packed, bitmaps[0][1]
+
+    @staticmethod
+    def to_positions(bitmap):
+        packed, n_rows = bitmap
+        return np.flatnonzero(np.unpackbits(packed, count=n_rows))
+
+    @staticmethod
+    def nbytes(bitmap):
+        return bitmap[0].nbytes
+
+
+class BitmapIndex:
+    """
+    Bitmap indexes over an OLAPEngine's fact rows
+    Bitmaps for a column are built on first use: a stable counting sort of the
+    column codes yields each value's row positions already in order
+    """
+
+    def __init__(self, engine, columns=DEFAULT_BITMAP_COLUMNS, backend=None):
+        self.engine = engine
+        self.columns = set(columns)
+        self.backend = backend or (RoaringBitmaps if ROARING_AVAILABLE else NumpyBitmaps)
+        self._bitmaps = {}   # column -> {label: bitmap}
+
+    def covers(self, where):
+        return bool(where) and set(where) <= self.columns
+
+    def bitmaps(self, column):
+        if column not in self._bitmaps:
+            codes, labels = self.engine.codes(column)
+            small = codes.astype(np.int16) if len(labels) < np.iinfo(np.int16).max else codes
+            order = np.argsort(small, kind='stable')      # radix sort for 16-bit codes
+            counts = np.bincount(codes, minlength=len(labels))
+            n_rows = len(codes)
+            self._bitmaps[column] = {
+                label: self.backend.from_positions(positions, n_rows)
+                for label, positions in zip(labels.tolist(), np.split(order, np.cumsum(counts)[:-1]))
+            }
+        return self._bitmaps[column]
+
+    def build(self):
+        for column in self.columns:
+            self.bitmaps(column)
+        return self
+
+    def lookup(self, where):
+        """
+        Sorted fact row positions matching {column: value | [values]}:
+        OR within a column, AND across columns (smallest bitmap first)
+        """
+        per_column = []
+        for column, value in where.items():
+            values = value if isinstance(value, (list, tuple, set)) else [value]
+            bitmaps = self.bitmaps(column)
+            matched = [bitmaps[v] for v in values if v in bitmaps]
+            if not matched:
+                return np.zeros(0, dtype=np.int64)
+            per_column.append(self.backend.union(matched))
+        return self.backend.to_positions(self.backend.intersection(per_column))
+
+    def nbytes(self):
+        return sum(self.backend.nbytes(bitmap) for bitmaps in self._bitmaps.values()
+                   for bitmap in bitmaps.values())
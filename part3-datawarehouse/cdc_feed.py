@@ -0,0 +1,587 @@
+"""
+Change-Data-Capture Feed for FlexiMart Data Warehouse
+Part 3: Data Warehouse Implementation
+Keeps the star schema in step with the OLTP tables from part 1's
+create_tables (customers, products, orders, order_items) without reloads:
+- AFTER INSERT/UPDATE/DELETE triggers append (table, row id, operation) to
+  change_log in the OLTP database (SQLite stands in for MySQL locally)
+- CDCFeed reads change_log above its watermark in micro-batches, folds the
+  changes per row and applies each row's current state:
+  products / customers -> SCD2 merge into dim_product / dim_customer
+  orders / order_items -> fact_sales, one row per order item
+- fact_sales holds exactly the rows a full load would: a changed, cancelled
+  or deleted item's fact row is deleted (and taken back out of the summary
+  cubes and customer_spend) and a new row inserted if it still counts;
+  cdc_fact_map holds each item's live sale_key
+- Deletes, new facts, cube/spend corrections, cdc_fact_map and the watermark
+  commit in one transaction, so an interrupted batch is simply applied again
+OLTP integer ids map to the ETL natural ids: customer 7 -> 'C007', product 3 -> 'P003'
+
+python cdc_feed.py --seed --once --verify          # build the warehouse from an OLTP copy
+python cdc_feed.py --simulate 20 --once --verify   # make OLTP changes and apply them
+python cdc_feed.py --interval 60                   # keep applying every minute
+"""
+
+import os
+import sys
+import random
+import sqlite3
+import logging
+import argparse
+import time
+
+import pandas as pd
+
+from warehouse_loader import WarehouseLoader, FACT_COLUMNS, ETL_DIR, PROJECT_ROOT
+from summary_cubes import SummaryCubeRefresher, DEFAULT_DW_PATH
+
+# Shared helpers (fleximart/) live at the project root
+if PROJECT_ROOT not in sys.path:
+    sys.path.append(PROJECT_ROOT)
+from fleximart.logs import configure_logging
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_OLTP_PATH = os.path.join(SCRIPT_DIR, 'fleximart_oltp.sqlite')
+
+# SQLite dialect of ETLPipeline.create_tables (part1) plus the change log
+OLTP_SQLITE_SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS customers (
+        customer_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        first_name VARCHAR(50) NOT NULL,
+        last_name VARCHAR(50) NOT NULL,
+        email VARCHAR(100) UNIQUE NOT NULL,
+        phone VARCHAR(20),
+        city VARCHAR(50),
+        registration_date DATE
+    )""",
+    """CREATE TABLE IF NOT EXISTS products (
+        product_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        product_name VARCHAR(100) NOT NULL,
+        category VARCHAR(50) NOT NULL,
+        price DECIMAL(10,2) NOT NULL,
+        stock_quantity INT DEFAULT 0
+    )""",
+    """CREATE TABLE IF NOT EXISTS orders (
+        order_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        customer_id INT NOT NULL REFERENCES customers(customer_id),
+        order_date DATE NOT NULL,
+        total_amount DECIMAL(10,2) NOT NULL,
+        status VARCHAR(20) DEFAULT 'Pending'
+    )""",
+    """CREATE TABLE IF NOT EXISTS order_items (
+        order_item_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        order_id INT NOT NULL REFERENCES orders(order_id),
+        product_id INT NOT NULL REFERENCES products(product_id),
+        quantity INT NOT NULL,
+        unit_price DECIMAL(10,2) NOT NULL,
+        subtotal DECIMAL(10,2) NOT NULL
+    )""",
+    """CREATE TABLE IF NOT EXISTS change_log (
+        change_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        table_name VARCHAR(20) NOT NULL,
+        row_id INTEGER NOT NULL,
+        operation CHAR(1) NOT NULL,
+        changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )"""
+]
+
+# Captured table -> primary key
+CAPTURED_TABLES = {'customers': 'customer_id', 'products': 'product_id',
+                   'orders': 'order_id', 'order_items': 'order_item_id'}
+
+# Warehouse-side CDC bookkeeping
+CDC_SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS cdc_state (
+        source VARCHAR(50) PRIMARY KEY,
+        last_change_id INTEGER NOT NULL DEFAULT 0,
+        applied_at TIMESTAMP
+    )""",
+    """CREATE TABLE IF NOT EXISTS cdc_fact_map (
+        order_item_id INTEGER PRIMARY KEY,
+        sale_key INTEGER NOT NULL
+    )""",
+    """CREATE TABLE IF NOT EXISTS cdc_pending_items (
+        order_item_id INTEGER PRIMARY KEY
+    )"""
+]
+
+
+def trigger_statements(table, key):
+    """AFTER INSERT/UPDATE/DELETE triggers feeding change_log for one table"""
+    return [
+        f"""CREATE TRIGGER IF NOT EXISTS cdc_{table}_{operation.lower()} AFTER {operation} ON {table}
+        BEGIN
+            INSERT INTO change_log (table_name, row_id, operation) VALUES ('{table}', {row}.{key}, '{operation[0]}');
+        END"""
+        for operation, row in [('INSERT', 'NEW'), ('UPDATE', 'NEW'), ('DELETE', 'OLD')]
+    ]
+
+
+def open_oltp(path=DEFAULT_OLTP_PATH):
+    """Open (or create) the SQLite OLTP database with change capture installed"""
+    connection = sqlite3.connect(path)
+    cursor = connection.cursor()
+    for statement in OLTP_SQLITE_SCHEMA:
+        cursor.execute(statement)
+    for table, key in CAPTURED_TABLES.items():
+        for statement in trigger_statements(table, key):
+            cursor.execute(statement)
+    connection.commit()
+    return connection
+
+
+def snapshot_changes(connection):
+    """
+    Log every existing OLTP row as an insert (for tables populated before the
+    triggers existed); returns rows logged
+    """
+    cursor = connection.cursor()
+    logged = 0
+    for table, key in CAPTURED_TABLES.items():
+        cursor.execute(f"INSERT INTO change_log (table_name, row_id, operation) "
+                       f"SELECT '{table}', {key}, 'I' FROM {table} ORDER BY {key}")
+        logged += cursor.rowcount
+    connection.commit()
+    return logged
+
+
+def seed_oltp(connection, directory=ETL_DIR):
+    """Fill an empty OLTP database from part 1's cleaned CSVs (one order item per transaction)"""
+    if connection.execute("SELECT 1 FROM customers LIMIT 1").fetchone():
+        return 0
+    customers = pd.read_csv(os.path.join(directory, 'customers_cleaned.csv'))
+    products = pd.read_csv(os.path.join(directory, 'products_cleaned.csv'))
+    orders = pd.read_csv(os.path.join(directory, 'orders_cleaned.csv')).dropna(
+        subset=['order_date', 'customer_id', 'product_id'])
+
+    def number(ids):
+        return ids.str[1:].astype(int).tolist()
+
+    cursor = connection.cursor()
+    cursor.executemany(
+        "INSERT INTO customers (customer_id, first_name, last_name, email, phone, city, registration_date) "
+        "VALUES (?, ?, ?, ?, ?, ?, ?)",
+        zip(number(customers['customer_id']), customers['first_name'], customers['last_name'],
+            customers['email'], customers['phone'].astype(object).where(customers['phone'].notna(), None),
+            customers['city'], customers['registration_date'].astype(object)
+            .where(customers['registration_date'].notna(), None)))
+    cursor.executemany(
+        "INSERT INTO products (product_id, product_name, category, price, stock_quantity) VALUES (?, ?, ?, ?, ?)",
+        zip(number(products['product_id']), products['product_name'], products['category'],
+            products['price'].astype(float), products['stock_quantity'].astype(int).tolist()))
+    order_ids = number(orders['order_id'])
+    amounts = (orders['quantity'] * orders['unit_price']).round(2).tolist()
+    cursor.executemany(
+        "INSERT INTO orders (order_id, customer_id, order_date, total_amount, status) VALUES (?, ?, ?, ?, ?)",
+        zip(order_ids, number(orders['customer_id']), orders['order_date'], amounts, orders['status']))
+    cursor.executemany(
+        "INSERT INTO order_items (order_item_id, order_id, product_id, quantity, unit_price, subtotal) "
+        "VALUES (?, ?, ?, ?, ?, ?)",
+        zip(order_ids, order_ids, number(orders['product_id']), orders['quantity'].astype(int).tolist(),
+            orders['unit_price'].astype(float), amounts))
+    connection.commit()
+    return len(customers) + len(products) + 2 * len(orders)
+
+
+def _in_clause(ids):
+    return f"({', '.join('?' * len(ids))})"
+
+
+class CDCFeed:
+    """
+    Applies OLTP change_log entries to the warehouse in micro-batches
+    - apply_batch(): up to batch_size changes above the watermark; each
+      touched row is applied once, from its current OLTP state
+    - drain(): batches until change_log is exhausted
+    - run(): drain, refresh the summary cubes, sleep, repeat
+    Items whose customer/product does not resolve yet are parked in
+    cdc_pending_items and retried with every batch.
+    """
+
+    def __init__(self, oltp_connection, loader, source='oltp', batch_size=1000):
+        """oltp_connection: OLTP database (open_oltp); loader: WarehouseLoader on the warehouse"""
+        if loader.partition_store is not None:
+            raise ValueError("CDC deletes superseded fact rows; the append-only month partitions cannot follow")
+        self.oltp = oltp_connection
+        self.loader = loader
+        self.connection = loader.connection
+        self.cubes = SummaryCubeRefresher(self.connection)
+        self.source = source
+        self.batch_size = batch_size
+
+    def create_tables(self):
+        self.cubes.create_tables()
+        cursor = self.connection.cursor()
+        for statement in CDC_SCHEMA:
+            cursor.execute(statement)
+        cursor.execute("INSERT OR IGNORE INTO cdc_state (source, last_change_id) VALUES (?, 0)", (self.source,))
+        self.connection.commit()
+
+    def watermark(self):
+        return self.connection.execute(
+            "SELECT last_change_id FROM cdc_state WHERE source = ?", (self.source,)).fetchone()[0]
+
+    def lag(self):
+        """Change log entries not applied yet"""
+        return self.oltp.execute("SELECT COUNT(*) FROM change_log WHERE change_id > ?",
+                                 (self.watermark(),)).fetchone()[0]
+
+    # ------------------------------------------------------------------
+    # Reading current OLTP state (as the cleaned ETL frames look)
+    # ------------------------------------------------------------------
+    def _read(self, sql, ids):
+        ids = sorted(ids)
+        frames = [pd.read_sql_query(sql.format(ids=_in_clause(chunk)), self.oltp, params=chunk)
+                  for chunk in (ids[i:i + 500] for i in range(0, len(ids), 500))]
+        return pd.concat(frames, ignore_index=True) if frames else pd.DataFrame()
+
+    def read_products(self, ids):
+        products = self._read("SELECT product_id, product_name, category, price FROM products "
+                              "WHERE product_id IN {ids}", ids)
+        if len(products):
+            products['product_id'] = products['product_id'].map('P{:03d}'.format)
+        return products
+
+    def read_customers(self, ids):
+        customers = self._read("SELECT customer_id, first_name, last_name, city FROM customers "
+                               "WHERE customer_id IN {ids}", ids)
+        if len(customers):
+            customers['customer_id'] = customers['customer_id'].map('C{:03d}'.format)
+        return customers
+
+    def read_items(self, ids):
+        """Order items joined to their orders, indexed by order_item_id"""
+        items = self._read(
+            "SELECT i.order_item_id, i.order_id, o.customer_id, i.product_id, i.quantity, i.unit_price, "
+            "o.order_date, o.status FROM order_items i JOIN orders o ON o.order_id = i.order_id "
+            "WHERE i.order_item_id IN {ids}", ids)
+        if len(items) == 0:
+            return pd.DataFrame(columns=['customer_id', 'product_id', 'quantity', 'unit_price', 'order_date', 'status'],
+                                index=pd.Index([], name='order_item_id'))
+        items['customer_id'] = items['customer_id'].map('C{:03d}'.format)
+        items['product_id'] = items['product_id'].map('P{:03d}'.format)
+        return items.set_index('order_item_id')
+
+    def _affected_items(self, touched):
+        """Order items whose fact row may change: touched items, items of touched orders, parked items"""
+        items = set(touched.get('order_items', ()))
+        orders = sorted(touched.get('orders', ()))
+        # Also finds the items of a deleted order: they still reference its order_id
+        for i in range(0, len(orders), 500):
+            chunk = orders[i:i + 500]
+            items.update(row[0] for row in self.oltp.execute(
+                f"SELECT order_item_id FROM order_items WHERE order_id IN {_in_clause(chunk)}", chunk))
+        items.update(row[0] for row in self.connection.execute("SELECT order_item_id FROM cdc_pending_items"))
+        return items
+
+    def _live_facts(self, item_ids):
+        """Current fact row of each mapped item, indexed by order_item_id"""
+        ids = sorted(item_ids)
+        frames = [pd.read_sql_query(
+            f"SELECT m.order_item_id, f.sale_key, {', '.join('f.' + col for col in FACT_COLUMNS)} "
+            f"FROM cdc_fact_map m JOIN fact_sales f ON f.sale_key = m.sale_key "
+            f"WHERE m.order_item_id IN {_in_clause(chunk)}", self.connection, params=chunk)
+            for chunk in (ids[i:i + 500] for i in range(0, len(ids), 500))]
+        live = pd.concat(frames, ignore_index=True) if frames else pd.DataFrame(columns=['order_item_id'])
+        return live.set_index('order_item_id')
+
+    # ------------------------------------------------------------------
+    # Applying a batch
+    # ------------------------------------------------------------------
+    def apply_batch(self, as_of=None):
+        """
+        Apply the next micro-batch of changes
+        Returns a report dict, or None when there is nothing to apply
+        """
+        start = time.perf_counter()
+        watermark = self.watermark()
+        changes = self.oltp.execute(
+            "SELECT change_id, table_name, row_id FROM change_log WHERE change_id > ? ORDER BY change_id LIMIT ?",
+            (watermark, self.batch_size)).fetchall()
+        if not changes:
+            return None
+        last_change_id = changes[-1][0]
+        touched = {}
+        for _, table, row_id in changes:
+            touched.setdefault(table, set()).add(row_id)
+
+        # Dimensions first, so new members resolve for this batch's facts
+        report = {'changes': len(changes), 'dim_product': 0, 'dim_customer': 0}
+        products = self.read_products(touched.get('products', ()))
+        if len(products):
+            report['dim_product'] = self.loader.load_dim_product(products, as_of)
+        customers = self.read_customers(touched.get('customers', ()))
+        if len(customers):
+            report['dim_customer'] = self.loader.load_dim_customer(customers, as_of)
+
+        item_ids = self._affected_items(touched)
+        current = self.read_items(item_ids)
+        desired, _ = self.loader.build_fact_rows(current) if len(current) else (
+            pd.DataFrame(columns=FACT_COLUMNS), None)
+        live = self._live_facts(item_ids)
+
+        # Items that should have a fact but whose keys do not resolve yet
+        counted = current[~current['status'].isin(self.loader.exclude_statuses) & current['order_date'].notna()]
+        pending = counted.index.difference(desired.index)
+
+        # Unchanged items keep their fact; everything else is deleted and/or re-inserted
+        common = desired.index.intersection(live.index)
+        same = common[(desired.loc[common, FACT_COLUMNS].astype(float).round(2).to_numpy() ==
+                       live.loc[common, FACT_COLUMNS].astype(float).round(2).to_numpy()).all(axis=1)]
+        deleted_items = live.index.difference(same)
+        inserted_items = desired.index.difference(same)
+        deleted = live.loc[deleted_items, ['sale_key'] + FACT_COLUMNS]
+        inserts = desired.loc[inserted_items, FACT_COLUMNS].astype(
+            {'date_key': 'int64', 'product_key': 'int64', 'customer_key': 'int64', 'quantity_sold': 'int64'})
+
+        def bookkeeping(rows_with_keys):
+            cursor = self.connection.cursor()
+            dropped = [(int(item),) for item in deleted_items.difference(inserted_items)]
+            cursor.executemany("DELETE FROM cdc_fact_map WHERE order_item_id = ?", dropped)
+            new_keys = rows_with_keys['sale_key'].astype('int64').tolist()
+            cursor.executemany("INSERT OR REPLACE INTO cdc_fact_map (order_item_id, sale_key) VALUES (?, ?)",
+                               zip([int(item) for item in inserted_items], new_keys))
+            cursor.execute("DELETE FROM cdc_pending_items")
+            cursor.executemany("INSERT INTO cdc_pending_items (order_item_id) VALUES (?)",
+                               [(int(item),) for item in pending])
+            cursor.execute("UPDATE cdc_state SET last_change_id = ?, applied_at = CURRENT_TIMESTAMP WHERE source = ?",
+                           (last_change_id, self.source))
+
+        # dim_date commits on its own (idempotent), so extend it before the batch transaction opens
+        self.loader.ensure_dates(inserts['date_key'])
+        try:
+            self.delete_facts(deleted)
+            if len(inserts):
+                self.loader.append_facts(inserts, before_commit=bookkeeping)   # commits or rolls back
+            else:
+                bookkeeping(inserts.assign(sale_key=pd.Series(dtype='int64')))
+                self.connection.commit()
+        except Exception:
+            self.connection.rollback()
+            raise
+
+        report.update({'facts_inserted': len(inserts), 'facts_deleted': len(deleted),
+                       'items_pending': len(pending), 'last_change_id': last_change_id,
+                       'seconds': round(time.perf_counter() - start, 3)})
+        logging.info("CDC batch applied: %s", report)
+        return report
+
+    def delete_facts(self, facts):
+        """
+        Delete superseded fact rows (sale_key + FACT_COLUMNS), first taking them
+        out of the summary cubes and customer_spend; runs in the open
+        transaction and does not commit
+        """
+        if len(facts) == 0:
+            return
+        self.cubes.retract(facts['sale_key'])
+        self.loader.customer_spend.apply_batch(facts, sign=-1)
+        self.connection.executemany("DELETE FROM fact_sales WHERE sale_key = ?",
+                                    [(int(key),) for key in facts['sale_key']])
+
+    def drain(self, as_of=None):
+        """Apply batches until the change log is exhausted; returns the batch reports"""
+        reports = []
+        while True:
+            report = self.apply_batch(as_of)
+            if report is None:
+                return reports
+            reports.append(report)
+
+    def run(self, interval=60.0, max_cycles=None):
+        """Micro-batch loop: drain, refresh summary cubes, sleep interval seconds"""
+        cycle = 0
+        while max_cycles is None or cycle < max_cycles:
+            reports = self.drain()
+            if reports:
+                self.cubes.refresh()
+                print_reports(reports)
+            cycle += 1
+            if max_cycles is None or cycle < max_cycles:
+                time.sleep(interval)
+
+
+def print_reports(reports):
+    totals = {key: sum(report[key] for report in reports)
+              for key in ['changes', 'dim_product', 'dim_customer', 'facts_inserted', 'facts_deleted']}
+    print(f"[SUCCESS] {len(reports)} CDC batch(es) up to change {reports[-1]['last_change_id']}: "
+          f"{totals['changes']} changes, dim_product {totals['dim_product']}, "
+          f"dim_customer {totals['dim_customer']}, facts +{totals['facts_inserted']} "
+          f"/ -{totals['facts_deleted']}, {reports[-1]['items_pending']} items pending")
+
+
+# ============================================================================
+# SIMULATION & VERIFICATION
+# ============================================================================
+def simulate_changes(connection, count, seed=None):
+    """Random OLTP activity: new orders, quantity/status changes, deleted items, price and city updates"""
+    rng = random.Random(seed)
+    cursor = connection.cursor()
+    customer_ids = [row[0] for row in cursor.execute("SELECT customer_id FROM customers")]
+    products = cursor.execute("SELECT product_id, price FROM products").fetchall()
+    cities = [row[0] for row in cursor.execute("SELECT DISTINCT city FROM customers WHERE city IS NOT NULL")]
+    applied = {}
+    for _ in range(count):
+        items = [row[0] for row in cursor.execute("SELECT order_item_id FROM order_items")]
+        action = rng.choice(['new_order', 'new_order', 'quantity', 'cancel', 'delete_item', 'price', 'city'])
+        if action == 'new_order' or not items:
+            action = 'new_order'
+            product_id, price = rng.choice(products)
+            quantity = rng.randint(1, 3)
+            cursor.execute("INSERT INTO orders (customer_id, order_date, total_amount, status) "
+                           "VALUES (?, date('2024-01-01', ?), ?, 'Completed')",
+                           (rng.choice(customer_ids), f"+{rng.randint(0, 120)} days", round(quantity * price, 2)))
+            cursor.execute("INSERT INTO order_items (order_id, product_id, quantity, unit_price, subtotal) "
+                           "VALUES (?, ?, ?, ?, ?)", (cursor.lastrowid, product_id, quantity, price,
+                                                      round(quantity * price, 2)))
+        elif action == 'quantity':
+            cursor.execute("UPDATE order_items SET quantity = quantity + 1, subtotal = unit_price * (quantity + 1) "
+                           "WHERE order_item_id = ?", (rng.choice(items),))
+        elif action == 'cancel':
+            cursor.execute("UPDATE orders SET status = 'Cancelled' WHERE order_id = "
+                           "(SELECT order_id FROM order_items WHERE order_item_id = ?)", (rng.choice(items),))
+        elif action == 'delete_item':
+            cursor.execute("DELETE FROM order_items WHERE order_item_id = ?", (rng.choice(items),))
+        elif action == 'price':
+            product_id, _ = rng.choice(products)
+            cursor.execute("UPDATE products SET price = ROUND(price * 1.1, 2) WHERE product_id = ?", (product_id,))
+        elif action == 'city' and cities:
+            cursor.execute("UPDATE customers SET city = ? WHERE customer_id = ?",
+                           (rng.choice(cities), rng.choice(customer_ids)))
+        applied[action] = applied.get(action, 0) + 1
+    connection.commit()
+    return applied
+
+
+def verify_against_full_load(feed):
+    """
+    Load the OLTP's current state into a fresh in-memory warehouse and compare
+    it with the CDC-maintained one by natural ids (SCD versions do not matter):
+    - fact_sales per (customer, product, date): row count, quantity, revenue,
+      and the average / min / max transaction value
+    - customer_spend per customer: total, transaction count and segment
+    - dim_customer.customer_segment on every version of each customer
+    - the daily summary cubes, when refreshed up to the last fact row
+    """
+    customers = feed.read_customers([row[0] for row in feed.oltp.execute("SELECT customer_id FROM customers")])
+    products = feed.read_products([row[0] for row in feed.oltp.execute("SELECT product_id FROM products")])
+    items = feed.read_items([row[0] for row in feed.oltp.execute("SELECT order_item_id FROM order_items")])
+
+    fresh = WarehouseLoader(sqlite3.connect(':memory:'))
+    fresh.create_schema()
+    fresh.load_dim_product(products)
+    fresh.load_dim_customer(customers)
+    if len(items):
+        fresh.load_fact_sales(items)
+
+    checks = {
+        'fact_sales': """SELECT c.customer_id, p.product_id, f.date_key, COUNT(*), SUM(f.quantity_sold),
+                                ROUND(SUM(f.total_amount), 2), ROUND(AVG(f.total_amount), 2),
+                                ROUND(MIN(f.total_amount), 2), ROUND(MAX(f.total_amount), 2)
+                         FROM fact_sales f
+                         JOIN dim_customer c ON c.customer_key = f.customer_key
+                         JOIN dim_product p ON p.product_key = f.product_key
+                         GROUP BY c.customer_id, p.product_id, f.date_key
+                         ORDER BY 1, 2, 3""",
+        'customer_spend': """SELECT customer_id, ROUND(total_spent, 2), transaction_count, customer_segment
+                             FROM customer_spend ORDER BY 1""",
+        'dim_customer_segment': """SELECT DISTINCT customer_id, customer_segment
+                                   FROM dim_customer ORDER BY 1, 2"""
+    }
+    # Expected cube contents are the fresh facts grouped at the cube grain
+    cube_checks = {
+        'agg_sales_daily_product': (
+            """SELECT p.product_id, a.date_key, SUM(a.transaction_count), SUM(a.quantity_sold),
+                      ROUND(SUM(a.revenue), 2)
+               FROM agg_sales_daily_product a JOIN dim_product p ON p.product_key = a.product_key
+               GROUP BY p.product_id, a.date_key ORDER BY 1, 2""",
+            """SELECT p.product_id, f.date_key, COUNT(*), SUM(f.quantity_sold), ROUND(SUM(f.total_amount), 2)
+               FROM fact_sales f JOIN dim_product p ON p.product_key = f.product_key
+               GROUP BY p.product_id, f.date_key ORDER BY 1, 2"""),
+        'agg_sales_daily_customer': (
+            """SELECT c.customer_id, a.date_key, SUM(a.transaction_count), SUM(a.quantity_sold),
+                      ROUND(SUM(a.revenue), 2)
+               FROM agg_sales_daily_customer a JOIN dim_customer c ON c.customer_key = a.customer_key
+               GROUP BY c.customer_id, a.date_key ORDER BY 1, 2""",
+            """SELECT c.customer_id, f.date_key, COUNT(*), SUM(f.quantity_sold), ROUND(SUM(f.total_amount), 2)
+               FROM fact_sales f JOIN dim_customer c ON c.customer_key = f.customer_key
+               GROUP BY c.customer_id, f.date_key ORDER BY 1, 2""")
+    }
+    results = {name: (fresh.connection.execute(sql).fetchall(), feed.connection.execute(sql).fetchall())
+               for name, sql in checks.items()}
+    max_sale_key = feed.connection.execute("SELECT COALESCE(MAX(sale_key), 0) FROM fact_sales").fetchone()[0]
+    if feed.cubes.watermark() >= max_sale_key:
+        for name, (cube_sql, fact_sql) in cube_checks.items():
+            results[name] = (fresh.connection.execute(fact_sql).fetchall(),
+                             feed.connection.execute(cube_sql).fetchall())
+    else:
+        print("[INFO] Summary cubes not refreshed up to the last fact row; cube check skipped")
+    fresh.close()
+
+    failed = {name: (expected, actual) for name, (expected, actual) in results.items() if expected != actual}
+    if not failed:
+        print(f"[SUCCESS] Warehouse matches a full load of the OLTP state "
+              f"({len(results['fact_sales'][0])} customer/product/day cells; {', '.join(results)})")
+        return True
+    for name, (expected, actual) in failed.items():
+        mismatched = set(expected) ^ set(actual)
+        print(f"[ERROR] {name} differs from a full load: {len(mismatched)} rows")
+        for row in sorted(mismatched, key=str)[:10]:
+            print(f"   {row}")
+    return False
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Apply OLTP change_log entries to the warehouse')
+    parser.add_argument('--oltp', default=DEFAULT_OLTP_PATH, help='OLTP SQLite database')
+    parser.add_argument('--dw', default=DEFAULT_DW_PATH, help='warehouse SQLite database')
+    parser.add_argument('--seed', action='store_true', help='fill an empty OLTP database from the cleaned CSVs')
+    parser.add_argument('--simulate', type=int, default=0, help='make N random OLTP changes first')
+    parser.add_argument('--batch-size', type=int, default=1000)
+    parser.add_argument('--interval', type=float, default=60.0, help='seconds between micro-batch cycles')
+    parser.add_argument('--once', action='store_true', help='apply pending changes and exit')
+    parser.add_argument('--verify', action='store_true', help='compare with a full load of the OLTP state')
+    args = parser.parse_args(argv)
+
+    configure_logging('cdc_feed.log')
+    print("="*70)
+    print("CDC FEED - OLTP change log -> star schema")
+    print("="*70)
+
+    oltp = open_oltp(args.oltp)
+    if args.seed:
+        print(f"[INFO] Seeded OLTP with {seed_oltp(oltp)} rows")
+    if args.simulate:
+        print(f"[INFO] Simulated OLTP changes: {simulate_changes(oltp, args.simulate)}")
+
+    loader = WarehouseLoader.open_sqlite(args.dw)
+    feed = CDCFeed(oltp, loader, batch_size=args.batch_size)
+    has_state = loader.connection.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'cdc_state'").fetchone()
+    if not has_state and loader.connection.execute("SELECT 1 FROM fact_sales LIMIT 1").fetchone():
+        print(f"[ERROR] {args.dw} was loaded without CDC; point --dw at a new warehouse file")
+        return 1
+    feed.create_tables()
+    print(f"[INFO] {feed.lag()} change(s) pending after change_id {feed.watermark()}")
+
+    if args.once:
+        reports = feed.drain()
+        if reports:
+            feed.cubes.refresh()
+            print_reports(reports)
+        else:
+            print("[INFO] Warehouse is up to date")
+    else:
+        try:
+            feed.run(args.interval)
+        except KeyboardInterrupt:
+            print("\n[INFO] Stopped")
+
+    ok = verify_against_full_load(feed) if args.verify else True
+    loader.close()
+    oltp.close()
+    return 0 if ok else 1
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,79 @@
+-- ============================================================================
+-- CHANGE DATA CAPTURE - FLEXIMART OLTP -> FLEXIMART_DW
+-- ============================================================================
+-- Database: fleximart (the OLTP schema from part1 create_tables)
+-- Purpose: Triggers append every insert/update/delete on the captured tables
+--          to change_log; cdc_feed.py applies the log to the star schema in
+--          micro-batches (locally the same DDL runs on SQLite, see
+--          OLTP_SQLITE_SCHEMA in cdc_feed.py)
+
+USE fleximart;
+
+CREATE TABLE IF NOT EXISTS change_log (
+    change_id BIGINT PRIMARY KEY AUTO_INCREMENT,
+    table_name VARCHAR(20) NOT NULL,
+    row_id INT NOT NULL,
+    operation CHAR(1) NOT NULL,
+    changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+);
+
+-- ============================================================================
+-- customers
+-- ============================================================================
+CREATE TRIGGER cdc_customers_insert AFTER INSERT ON customers FOR EACH ROW
+    INSERT INTO change_log (table_name, row_id, operation) VALUES ('customers', NEW.customer_id, 'I');
+CREATE TRIGGER cdc_customers_update AFTER UPDATE ON customers FOR EACH ROW
+    INSERT INTO change_log (table_name, row_id, operation) VALUES ('customers', NEW.customer_id, 'U');
+CREATE TRIGGER cdc_customers_delete AFTER DELETE ON customers FOR EACH ROW
+    INSERT INTO change_log (table_name, row_id, operation) VALUES ('customers', OLD.customer_id, 'D');
+
+-- ============================================================================
+-- products
+-- ============================================================================
+CREATE TRIGGER cdc_products_insert AFTER INSERT ON products FOR EACH ROW
+    INSERT INTO change_log (table_name, row_id, operation) VALUES ('products', NEW.product_id, 'I');
+CREATE TRIGGER cdc_products_update AFTER UPDATE ON products FOR EACH ROW
+    INSERT INTO change_log (table_name, row_id, operation) VALUES ('products', NEW.product_id, 'U');
+CREATE TRIGGER cdc_products_delete AFTER DELETE ON products FOR EACH ROW
+    INSERT INTO change_log (table_name, row_id, operation) VALUES ('products', OLD.product_id, 'D');
+
+-- ============================================================================
+-- orders
+-- ============================================================================
+CREATE TRIGGER cdc_orders_insert AFTER INSERT ON orders FOR EACH ROW
+    INSERT INTO change_log (table_name, row_id, operation) VALUES ('orders', NEW.order_id, 'I');
+CREATE TRIGGER cdc_orders_update AFTER UPDATE ON orders FOR EACH ROW
+    INSERT INTO change_log (table_name, row_id, operation) VALUES ('orders', NEW.order_id, 'U');
+CREATE TRIGGER cdc_orders_delete AFTER DELETE ON orders FOR EACH ROW
+    INSERT INTO change_log (table_name, row_id, operation) VALUES ('orders', OLD.order_id, 'D');
+
+-- ============================================================================
+-- order_items
+-- ============================================================================
+CREATE TRIGGER cdc_order_items_insert AFTER INSERT ON order_items FOR EACH ROW
+    INSERT INTO change_log (table_name, row_id, operation) VALUES ('order_items', NEW.order_item_id, 'I');
+CREATE TRIGGER cdc_order_items_update AFTER UPDATE ON order_items FOR EACH ROW
+    INSERT INTO change_log (table_name, row_id, operation) VALUES ('order_items', NEW.order_item_id, 'U');
+CREATE TRIGGER cdc_order_items_delete AFTER DELETE ON order_items FOR EACH ROW
+    INSERT INTO change_log (table_name, row_id, operation) VALUES ('order_items', OLD.order_item_id, 'D');
+
+-- ============================================================================
+-- Warehouse-side bookkeeping (fleximart_dw)
+-- ============================================================================
+USE fleximart_dw;
+
+CREATE TABLE IF NOT EXISTS cdc_state (
+    source VARCHAR(50) PRIMARY KEY,
+    last_change_id BIGINT NOT NULL DEFAULT 0,
+    applied_at TIMESTAMP NULL
+);
+
+-- order item -> its live fact_sales row (deleted and re-inserted on change)
+CREATE TABLE IF NOT EXISTS cdc_fact_map (
+    order_item_id INT PRIMARY KEY,
+    sale_key INT NOT NULL
+);
+
+CREATE TABLE IF NOT EXISTS cdc_pending_items (
+    order_item_id INT PRIMARY KEY
+);
@@ -0,0 +1,199 @@
+"""
+Incremental Customer Spend & Segmentation for FlexiMart Data Warehouse
+Part 3: Data Warehouse Implementation
+Keeps lifetime spend per customer_id in customer_spend, updated by the fact
+loader with each batch's per-customer deltas. Keying on the natural id keeps
+all SCD2 versions of a customer in one row. Segments (Query 3 thresholds)
+are recomputed only for the customers a batch touched, and transitions
+between segments are logged to customer_segment_history.
+"""
+
+import logging
+import time
+
+# Query 3 thresholds from analytics_queries.sql, applied to ROUND(total_spent, 2)
+HIGH_VALUE_MIN = 50000
+MEDIUM_VALUE_MIN = 20000
+
+SEGMENT_CASE = f"""CASE
+            WHEN ROUND(total_spent, 2) > {HIGH_VALUE_MIN} THEN 'High Value'
+            WHEN ROUND(total_spent, 2) >= {MEDIUM_VALUE_MIN} THEN 'Medium Value'
+            ELSE 'Low Value'
+        END"""
+
+SPEND_SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS customer_spend (
+        customer_id VARCHAR(20) PRIMARY KEY,
+        total_spent REAL NOT NULL,
+        transaction_count INTEGER NOT NULL,
+        customer_segment VARCHAR(20) NOT NULL,
+        last_sale_key INTEGER NOT NULL,
+        updated_at TIMESTAMP
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_cs_segment ON customer_spend(customer_segment)",
+    """CREATE TABLE IF NOT EXISTS customer_segment_history (
+        customer_id VARCHAR(20) NOT NULL,
+        previous_segment VARCHAR(20) NOT NULL,
+        customer_segment VARCHAR(20) NOT NULL,
+        total_spent REAL NOT NULL,
+        sale_key INTEGER NOT NULL,
+        changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_csh_customer ON customer_segment_history(customer_id)"
+]
+
+# Segment report answered from customer_spend (one row per customer, no fact scan)
+SEGMENT_REPORT_SQL = f"""
+SELECT
+    customer_segment,
+    COUNT(*) as customer_count,
+    ROUND(SUM(ROUND(total_spent, 2)), 2) as total_revenue,
+    ROUND(AVG(ROUND(total_spent, 2)), 2) as avg_revenue_per_customer
+FROM customer_spend
+GROUP BY customer_segment
+ORDER BY
+    CASE
+        WHEN customer_segment = 'High Value' THEN 1
+        WHEN customer_segment = 'Medium Value' THEN 2
+        ELSE 3
+    END"""
+
+
+class CustomerSpendTable:
+    """
+    Per-customer lifetime spend maintained from fact batches
+    - apply_batch(rows): merges one batch's per-customer deltas (vectorized
+      group-by in pandas, rolled up from customer_key versions to
+      customer_id, one upsert per touched customer) inside the caller's
+      fact transaction
+    - segments are re-evaluated for the touched customers only; changes are
+      logged and copied onto dim_customer.customer_segment
+    - sync_segments(ids): re-copies segments onto customers whose
+      dim_customer rows were versioned without new sales
+    - rebuild(): recomputes everything from fact_sales (first run on an
+      existing warehouse)
+    """
+
+    def __init__(self, connection):
+        """Initialize on an open sqlite3 connection to the warehouse"""
+        self.connection = connection
+
+    def create_tables(self):
+        cursor = self.connection.cursor()
+        for statement in SPEND_SCHEMA:
+            cursor.execute(statement)
+        self.connection.commit()
+
+    def apply_batch(self, rows, sign=1):
+        """
+        Merge fact rows (sale_key, customer_key, total_amount) inserted into
+        fact_sales in the open transaction; the caller commits or rolls back
+        together with the facts. sign=-1 takes deleted fact rows back out
+        (customers left without sales are dropped).
+        Returns (customers touched, segment transitions)
+        """
+        if len(rows) == 0:
+            return 0, 0
+        start = time.perf_counter()
+        deltas = rows.groupby('customer_key', sort=False).agg(
+            amount=('total_amount', 'sum'), transactions=('total_amount', 'size'), last_sale_key=('sale_key', 'max'))
+        records = list(zip(deltas.index.astype('int64').tolist(), (sign * deltas['amount'].astype(float)).tolist(),
+                           (sign * deltas['transactions'].astype('int64')).tolist(),
+                           deltas['last_sale_key'].astype('int64').tolist()))
+
+        cursor = self.connection.cursor()
+        cursor.execute("""CREATE TEMP TABLE IF NOT EXISTS spend_batch (
+            customer_key INTEGER PRIMARY KEY, amount REAL, transactions INTEGER, last_sale_key INTEGER)""")
+        cursor.execute("CREATE TEMP TABLE IF NOT EXISTS spend_delta (customer_id VARCHAR(20) PRIMARY KEY)")
+        cursor.execute("DELETE FROM spend_batch")
+        cursor.execute("DELETE FROM spend_delta")
+        cursor.executemany("INSERT INTO spend_batch (customer_key, amount, transactions, last_sale_key) "
+                           "VALUES (?, ?, ?, ?)", records)
+        # Versions of one customer (SCD2 customer_keys) share a customer_id
+        cursor.execute(
+            """INSERT INTO spend_delta (customer_id)
+            SELECT DISTINCT c.customer_id FROM spend_batch b JOIN dim_customer c ON c.customer_key = b.customer_key""")
+        cursor.execute(
+            """INSERT INTO customer_spend
+                (customer_id, total_spent, transaction_count, customer_segment, last_sale_key, updated_at)
+            SELECT c.customer_id, SUM(b.amount), SUM(b.transactions), '', MAX(b.last_sale_key), CURRENT_TIMESTAMP
+            FROM spend_batch b
+            JOIN dim_customer c ON c.customer_key = b.customer_key
+            GROUP BY c.customer_id
+            ON CONFLICT (customer_id) DO UPDATE SET
+                total_spent = total_spent + excluded.total_spent,
+                transaction_count = transaction_count + excluded.transaction_count,
+                last_sale_key = MAX(last_sale_key, excluded.last_sale_key),
+                updated_at = CURRENT_TIMESTAMP""")
+        if sign < 0:
+            cursor.execute("DELETE FROM customer_spend WHERE transaction_count <= 0 "
+                           "AND customer_id IN (SELECT customer_id FROM spend_delta)")
+        customers = cursor.execute("SELECT COUNT(*) FROM spend_delta").fetchone()[0]
+        transitions = self._resegment(cursor)
+
+        elapsed = time.perf_counter() - start
+        logging.info("customer_spend: %s customers updated, %s segment transitions in %.3fs",
+                     customers, transitions, elapsed)
+        return customers, transitions
+
+    def _resegment(self, cursor):
+        """Re-evaluate segments of the customers in spend_delta"""
+        touched = "customer_id IN (SELECT customer_id FROM spend_delta)"
+        cursor.execute(
+            f"""INSERT INTO customer_segment_history
+                (customer_id, previous_segment, customer_segment, total_spent, sale_key)
+            SELECT customer_id, customer_segment, {SEGMENT_CASE}, total_spent, last_sale_key
+            FROM customer_spend
+            WHERE {touched} AND customer_segment <> '' AND customer_segment <> {SEGMENT_CASE}""")
+        transitions = cursor.rowcount
+        cursor.execute(
+            f"UPDATE customer_spend SET customer_segment = {SEGMENT_CASE} "
+            f"WHERE {touched} AND customer_segment <> {SEGMENT_CASE}")
+        self._copy_to_dimension(cursor)
+        return transitions
+
+    def _copy_to_dimension(self, cursor):
+        """Every dim_customer version of the customers in spend_delta carries the lifetime segment"""
+        cursor.execute(
+            """UPDATE dim_customer SET customer_segment = (
+                SELECT s.customer_segment FROM customer_spend s WHERE s.customer_id = dim_customer.customer_id)
+            WHERE customer_id IN (SELECT customer_id FROM spend_delta)""")
+
+    def sync_segments(self, customer_ids):
+        """
+        Copy the current segment onto dim_customer for customers whose dimension
+        rows changed (new SCD2 versions) in a batch without new sales; the
+        caller commits
+        """
+        cursor = self.connection.cursor()
+        cursor.execute("CREATE TEMP TABLE IF NOT EXISTS spend_delta (customer_id VARCHAR(20) PRIMARY KEY)")
+        cursor.execute("DELETE FROM spend_delta")
+        cursor.executemany("INSERT OR IGNORE INTO spend_delta (customer_id) VALUES (?)",
+                           [(str(customer_id),) for customer_id in customer_ids])
+        self._copy_to_dimension(cursor)
+
+    def rebuild(self):
+        """Recompute customer_spend (and segments) from all of fact_sales"""
+        self.create_tables()
+        cursor = self.connection.cursor()
+        cursor.execute("DELETE FROM customer_spend")
+        cursor.execute(
+            """INSERT INTO customer_spend
+                (customer_id, total_spent, transaction_count, customer_segment, last_sale_key, updated_at)
+            SELECT c.customer_id, SUM(f.total_amount), COUNT(*), '', MAX(f.sale_key), CURRENT_TIMESTAMP
+            FROM fact_sales f
+            JOIN dim_customer c ON c.customer_key = f.customer_key
+            GROUP BY c.customer_id""")
+        cursor.execute("CREATE TEMP TABLE IF NOT EXISTS spend_delta (customer_id VARCHAR(20) PRIMARY KEY)")
+        cursor.execute("DELETE FROM spend_delta")
+        cursor.execute("INSERT INTO spend_delta SELECT customer_id FROM customer_spend")
+        self._resegment(cursor)
+        self.connection.commit()
+        customers = cursor.execute("SELECT COUNT(*) FROM customer_spend").fetchone()[0]
+        logging.info("customer_spend rebuilt for %s customers", customers)
+        return customers
+
+    def segment_report(self):
+        """Query 3 result columns from customer_spend: (columns, rows)"""
+        cursor = self.connection.execute(SEGMENT_REPORT_SQL)
+        return [col[0] for col in cursor.description], cursor.fetchall()
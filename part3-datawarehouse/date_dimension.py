@@ -0,0 +1,67 @@
+"""
+Date Dimension Generator for FlexiMart Data Warehouse
+Part 3: Data Warehouse Implementation
+Builds dim_date rows for any date range in one vectorized pass
+(replaces the hand-typed 2024 rows in warehouse_data.sql / Final1.csv)
+"""
+
+import argparse
+
+import pandas as pd
+
+DIM_DATE_COLUMNS = ['date_key', 'full_date', 'day_of_week', 'day_of_month', 'month',
+                    'month_name', 'quarter', 'year', 'is_weekend']
+
+
+def build_dim_date(start, end):
+    """
+    Generate dim_date rows for every day in [start, end]
+    start/end: anything pd.Timestamp accepts ('2024-01-01', date, YYYYMMDD int as str)
+    """
+    dates = pd.Series(pd.date_range(pd.Timestamp(start), pd.Timestamp(end), freq='D'))
+    return pd.DataFrame({
+        'date_key': (dates.dt.year * 10000 + dates.dt.month * 100 + dates.dt.day).astype('int64'),
+        'full_date': dates.dt.strftime('%Y-%m-%d'),
+        'day_of_week': dates.dt.day_name(),
+        'day_of_month': dates.dt.day.astype('int64'),
+        'month': dates.dt.month.astype('int64'),
+        'month_name': dates.dt.month_name(),
+        'quarter': 'Q' + dates.dt.quarter.astype(str),
+        'year': dates.dt.year.astype('int64'),
+        'is_weekend': (dates.dt.dayofweek >= 5).astype('int64')
+    }, columns=DIM_DATE_COLUMNS)
+
+
+def key_to_timestamp(date_key):
+    """YYYYMMDD integer key -> pd.Timestamp"""
+    date_key = int(date_key)
+    return pd.Timestamp(year=date_key // 10000, month=date_key // 100 % 100, day=date_key % 100)
+
+
+def covering_range(min_key, max_key, pad_to_year=True):
+    """
+    Date range to generate for keys in [min_key, max_key]
+    Padding to whole calendar years means a multi-year history load extends
+    dim_date once per year rather than once per newly seen date
+    """
+    start, end = key_to_timestamp(min_key), key_to_timestamp(max_key)
+    if pad_to_year:
+        start = pd.Timestamp(year=start.year, month=1, day=1)
+        end = pd.Timestamp(year=end.year, month=12, day=31)
+    return start, end
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate dim_date rows as CSV (Final1.csv layout)")
+    parser.add_argument('--start', required=True, help="first date, e.g. 2023-01-01")
+    parser.add_argument('--end', required=True, help="last date, e.g. 2025-12-31")
+    parser.add_argument('--output', default='dim_date.csv', help="CSV file to write")
+    args = parser.parse_args()
+
+    rows = build_dim_date(args.start, args.end)
+    rows.to_csv(args.output, index=False)
+    print(f"[SUCCESS] Wrote {len(rows)} dim_date rows to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
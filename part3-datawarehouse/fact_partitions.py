@@ -0,0 +1,301 @@
+"""
+Month-Partitioned Fact Storage for FlexiMart Data Warehouse
+Part 3: Data Warehouse Implementation
+Local counterpart of warehouse_schema_partitioned.sql: fact_sales is stored
+as one directory per month (date_key // 100) of immutable .npz part files,
+and queries filtered on dim_date attributes only read the months they touch
+"""
+
+import os
+import re
+import json
+import inspect
+import logging
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from olap_engine import (StarSchema, OLAPEngine, REPORTS, FACT_COLUMNS, DIMENSIONS, read_star_csv,
+                         write_npz, read_npz, write_dimensions, read_dimensions)
+
+MANIFEST_FILE = 'manifest.json'
+FACT_DIR = 'fact_sales'
+MONEY_COLUMNS = {'unit_price', 'discount_amount', 'total_amount'}
+
+
+def month_of(date_keys):
+    """YYYYMM partition key for YYYYMMDD date keys"""
+    return np.asarray(date_keys, dtype=np.int64) // 100
+
+
+def next_month(month):
+    year, mon = divmod(int(month), 100)
+    return (year + 1) * 100 + 1 if mon == 12 else month + 1
+
+
+def mysql_partition_name(month):
+    return f"p{month // 100}_{month % 100:02d}"
+
+
+def reorganize_statement(months):
+    """
+    MySQL DDL splitting p_future so each new month gets its own RANGE
+    partition (run before loading months past the last defined partition)
+    """
+    parts = [f"    PARTITION {mysql_partition_name(m)} VALUES LESS THAN ({next_month(m) * 100 + 1})"
+             for m in sorted(set(int(m) for m in months))]
+    parts.append("    PARTITION p_future VALUES LESS THAN MAXVALUE")
+    return "ALTER TABLE fact_sales REORGANIZE PARTITION p_future INTO (\n" + ",\n".join(parts) + "\n);"
+
+
+def is_partition_store(directory):
+    """
+    True if directory holds a PartitionedFactStore (manifest.json) and
+    nothing else, i.e. it is safe to delete before writing a fresh store
+    """
+    from approx_analytics import SKETCH_FILE
+    if not os.path.isfile(os.path.join(directory, MANIFEST_FILE)):
+        return False
+    expected = {MANIFEST_FILE, MANIFEST_FILE + '.tmp', FACT_DIR} | {f'{table}.npz' for table, _ in DIMENSIONS.values()}
+    if set(os.listdir(directory)) - expected:
+        return False
+    fact_dir = os.path.join(directory, FACT_DIR)
+    for root, dirs, files in os.walk(fact_dir):
+        if root == fact_dir:
+            if files or not all(re.fullmatch(r'month=\d{6}', name) for name in dirs):
+                return False
+        elif dirs or not all(re.fullmatch(r'part-\d{6}\.npz', name) or name in (SKETCH_FILE, SKETCH_FILE + '.tmp')
+                                 for name in files):
+            return False
+    return True
+
+
+class PartitionedFactStore:
+    """
+    fact_sales partitioned by month on local disk
+
+    <directory>/
+        manifest.json               partitions -> files, rows, date_key range
+        dim_date.npz, dim_product.npz, dim_customer.npz
+        fact_sales/month=YYYYMM/part-NNNNNN.npz
+
+    - append(): splits new fact rows by month and writes one new part file
+      per touched month (existing files are never rewritten)
+    - prune(where): months whose dim_date rows satisfy the date.* filters
+    - engine(where) / group_by() / run_report(): query only pruned months
+    - with sketches=True each month also keeps sketches.pkl (approx_analytics),
+      updated on every append
+    """
+
+    def __init__(self, directory, sketches=True):
+        self.directory = directory
+        self.sketches = sketches
+        self.manifest_path = os.path.join(directory, MANIFEST_FILE)
+        os.makedirs(os.path.join(directory, FACT_DIR), exist_ok=True)
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, 'r', encoding='utf-8') as f:
+                self.manifest = json.load(f)
+        else:
+            self.manifest = {'next_part': 0, 'partitions': {}}
+        self._dims = None
+        self._cache = {}    # part file -> {column: ndarray}
+
+    @classmethod
+    def from_tables(cls, directory, tables):
+        """Create a store from {'fact_sales', 'dim_date', 'dim_product', 'dim_customer'} DataFrames"""
+        store = cls(directory)
+        store.write_dimensions({'date': tables['dim_date'], 'product': tables['dim_product'],
+                                'customer': tables['dim_customer']})
+        store.append(tables['fact_sales'])
+        return store
+
+    # ------------------------------------------------------------------
+    # Writes
+    # ------------------------------------------------------------------
+    def _save_manifest(self):
+        """Replace the manifest atomically so readers never see a partial file"""
+        tmp_path = self.manifest_path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump(self.manifest, f, indent=2, sort_keys=True)
+        os.replace(tmp_path, self.manifest_path)
+
+    def write_dimensions(self, dims):
+        """Replace the dimension files ({'date', 'product', 'customer'} DataFrames)"""
+        write_dimensions(self.directory, dims)
+        self._dims = None
+
+    def append(self, fact):
+        """
+        Write fact rows (DataFrame or {column: array}) into their month partitions
+        Returns {month: rows written}
+        """
+        if isinstance(fact, pd.DataFrame):
+            fact = {col: fact[col].to_numpy() for col in fact.columns}
+        if len(fact['date_key']) == 0:
+            return {}
+
+        months = month_of(fact['date_key'])
+        order = np.argsort(months, kind='stable')
+        sorted_months = months[order]
+        bounds = np.flatnonzero(np.diff(sorted_months)) + 1
+        written = {}
+        for rows in np.split(order, bounds):
+            month = int(months[rows[0]])
+            part_dir = os.path.join(self.directory, FACT_DIR, f'month={month}')
+            os.makedirs(part_dir, exist_ok=True)
+            file_name = f"part-{self.manifest['next_part']:06d}.npz"
+            self.manifest['next_part'] += 1
+            date_keys = fact['date_key'][rows]
+            write_npz(os.path.join(part_dir, file_name), {col: values[rows] for col, values in fact.items()})
+
+            entry = self.manifest['partitions'].setdefault(
+                str(month), {'files': [], 'rows': 0, 'min_date_key': None, 'max_date_key': None})
+            entry['files'].append(file_name)
+            entry['rows'] += len(rows)
+            low, high = int(date_keys.min()), int(date_keys.max())
+            entry['min_date_key'] = low if entry['min_date_key'] is None else min(entry['min_date_key'], low)
+            entry['max_date_key'] = high if entry['max_date_key'] is None else max(entry['max_date_key'], high)
+            written[month] = len(rows)
+            if self.sketches:
+                self._update_sketches(month, {col: values[rows] for col, values in fact.items()})
+
+        self._save_manifest()
+        logging.info("Fact partitions appended: %s", written)
+        return written
+
+    def compact(self, months=None):
+        """Merge each month's part files into one; returns months compacted"""
+        compacted = []
+        for month in months or self.partitions():
+            entry = self.manifest['partitions'][str(month)]
+            if len(entry['files']) <= 1:
+                continue
+            part_dir = os.path.join(self.directory, FACT_DIR, f'month={month}')
+            merged = self._read_partition(month)
+            file_name = f"part-{self.manifest['next_part']:06d}.npz"
+            self.manifest['next_part'] += 1
+            write_npz(os.path.join(part_dir, file_name), merged)
+            old_files = entry['files']
+            entry['files'] = [file_name]
+            self._save_manifest()
+            for old in old_files:
+                self._cache.pop(os.path.join(part_dir, old), None)
+                os.remove(os.path.join(part_dir, old))
+            compacted.append(month)
+        return compacted
+
+    def _sketch_path(self, month):
+        from approx_analytics import SKETCH_FILE
+        return os.path.join(self.directory, FACT_DIR, f'month={month}', SKETCH_FILE)
+
+    def _update_sketches(self, month, fact):
+        """Merge the new rows of a month into its sketches"""
+        from approx_analytics import PartitionSketches
+        path = self._sketch_path(month)
+        sketches = PartitionSketches.load(path) if os.path.exists(path) else PartitionSketches()
+        dims = self.dimensions()
+        sketches.update(StarSchema(fact, dims['date'], dims['product'], dims['customer']))
+        sketches.save(path)
+
+    def partition_sketches(self, month):
+        """Sketches of one month, built from its part files if missing"""
+        from approx_analytics import PartitionSketches
+        path = self._sketch_path(month)
+        if not os.path.exists(path):
+            sketches = PartitionSketches()
+            sketches.update(self.load(months=[month]))
+            sketches.save(path)
+            return sketches
+        return PartitionSketches.load(path)
+
+    # ------------------------------------------------------------------
+    # Reads
+    # ------------------------------------------------------------------
+    def partitions(self):
+        return sorted(int(month) for month in self.manifest['partitions'])
+
+    def dimensions(self):
+        if self._dims is None:
+            self._dims = read_dimensions(self.directory)
+        return self._dims
+
+    def prune(self, where=None):
+        """
+        Months that can hold rows matching the date.* equality filters in where
+        (other filters do not prune; they are applied by the engine)
+        """
+        date_filters = {name.split('.', 1)[1]: value for name, value in (where or {}).items()
+                        if name.startswith('date.')}
+        months = self.partitions()
+        if not date_filters:
+            return months
+        dim_date = self.dimensions()['date']
+        matched = np.ones(len(dim_date), dtype=bool)
+        for column, value in date_filters.items():
+            values = value if isinstance(value, (list, tuple, set)) else [value]
+            matched &= dim_date[column].isin(list(values)).to_numpy()
+        touched = set(month_of(dim_date['date_key'].to_numpy()[matched]).tolist())
+        return [month for month in months if month in touched]
+
+    def _read_partition(self, month):
+        part_dir = os.path.join(self.directory, FACT_DIR, f'month={month}')
+        chunks = []
+        for file_name in self.manifest['partitions'][str(month)]['files']:
+            path = os.path.join(part_dir, file_name)
+            if path not in self._cache:
+                self._cache[path] = read_npz(path)
+            chunks.append(self._cache[path])
+        return {col: np.concatenate([chunk[col] for chunk in chunks]) for col in chunks[0]}
+
+    def load(self, where=None, months=None):
+        """StarSchema over the pruned months only"""
+        months = self.prune(where) if months is None else months
+        parts = [self._read_partition(month) for month in months]
+        if parts:
+            fact = {col: np.concatenate([part[col] for part in parts]) for col in parts[0]}
+        else:
+            fact = {col: np.array([], dtype=np.float64 if col in MONEY_COLUMNS else np.int64)
+                    for col in FACT_COLUMNS}
+        dims = self.dimensions()
+        return StarSchema(fact, dims['date'], dims['product'], dims['customer'])
+
+    def engine(self, where=None):
+        """OLAPEngine over the months touched by where"""
+        return OLAPEngine(self.load(where))
+
+    def group_by(self, keys, aggregations, where=None):
+        return self.engine(where).group_by(keys, aggregations, where=where)
+
+    def run_report(self, name, **kwargs):
+        """Run an analytics_queries.sql report reading only the months it filters on"""
+        method, defaults = REPORTS[name]
+        params = dict(defaults, **kwargs)
+        where = dict(params.get('where') or {})
+        signature = inspect.signature(getattr(OLAPEngine, method))
+        if 'year' in signature.parameters:
+            where['date.year'] = params.get('year', signature.parameters['year'].default)
+        return self.engine(where).run_report(name, **kwargs)
+
+    def stats(self):
+        return {'partitions': len(self.manifest['partitions']),
+                'rows': sum(entry['rows'] for entry in self.manifest['partitions'].values()),
+                'files': sum(len(entry['files']) for entry in self.manifest['partitions'].values())}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Month-partitioned fact_sales store')
+    parser.add_argument('--source', default=os.path.dirname(os.path.abspath(__file__)),
+                        help='directory with Final*.csv warehouse exports')
+    parser.add_argument('--output', required=True, help='partition store directory')
+    args = parser.parse_args()
+
+    store = PartitionedFactStore.from_tables(args.output, read_star_csv(args.source))
+    print(f"[SUCCESS] Partition store written to {args.output}: {store.stats()}")
+    for month in store.partitions():
+        entry = store.manifest['partitions'][str(month)]
+        print(f"   {month}  rows={entry['rows']:<8} date_key {entry['min_date_key']}..{entry['max_date_key']}")
+
+
+if __name__ == "__main__":
+    main()
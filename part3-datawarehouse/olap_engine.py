@@ -0,0 +1,589 @@
+"""
+In-Process OLAP Engine for FlexiMart Data Warehouse
+Part 3: Data Warehouse Implementation
+Runs the analytics_queries.sql reports locally on NumPy/pandas:
+- star joins resolve surrogate keys to dimension rows by array indexing
+- group-by / rollup aggregate over integer codes with bincount
+- window helpers for running totals, share of total and LAG
+"""
+
+import os
+import glob
+import sqlite3
+
+import numpy as np
+import pandas as pd
+
+from bitmap_index import BitmapIndex, DEFAULT_BITMAP_COLUMNS
+
+# Dimension alias -> (table, surrogate key column)
+DIMENSIONS = {
+    'date': ('dim_date', 'date_key'),
+    'product': ('dim_product', 'product_key'),
+    'customer': ('dim_customer', 'customer_key')
+}
+FACT_COLUMNS = ['sale_key', 'date_key', 'product_key', 'customer_key', 'quantity_sold',
+                'unit_price', 'discount_amount', 'total_amount']
+WEEKDAY_ORDER = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+
+def read_star_csv(directory):
+    """
+    Read warehouse CSV exports (e.g. Final*.csv) into {table: DataFrame};
+    each file is identified by its key column header, not its file name
+    """
+    tables = {}
+    for path in sorted(glob.glob(os.path.join(directory, '*.csv'))):
+        frame = pd.read_csv(path)
+        first = frame.columns[0]
+        if first == 'sale_key':
+            tables['fact_sales'] = frame
+        elif first == 'date_key':
+            tables['dim_date'] = frame
+        elif first == 'product_key':
+            tables['dim_product'] = frame
+        elif first == 'customer_key':
+            tables['dim_customer'] = frame
+    missing = {'fact_sales', 'dim_date', 'dim_product', 'dim_customer'} - set(tables)
+    if missing:
+        raise FileNotFoundError(f"Missing warehouse tables in {directory}: {sorted(missing)}")
+    return tables
+
+
+class KeyIndex:
+    """
+    Maps surrogate keys to dimension row positions
+    Dense lookup array when the key span is compact (typical for surrogate
+    and YYYYMMDD date keys), otherwise binary search over sorted keys
+    """
+
+    def __init__(self, keys):
+        keys = np.asarray(keys, dtype=np.int64)
+        self.min_key = int(keys.min()) if len(keys) else 0
+        span = int(keys.max()) - self.min_key + 1 if len(keys) else 0
+        if span <= max(4 * len(keys), 1 << 20):
+            self.dense = np.full(span, -1, dtype=np.int64)
+            self.dense[keys - self.min_key] = np.arange(len(keys))
+        else:
+            self.dense = None
+            self.order = np.argsort(keys, kind='stable')
+            self.sorted_keys = keys[self.order]
+
+    def positions(self, fact_keys):
+        """Dimension row position for each fact key (-1 when missing)"""
+        fact_keys = np.asarray(fact_keys, dtype=np.int64)
+        if self.dense is not None:
+            offsets = fact_keys - self.min_key
+            valid = (offsets >= 0) & (offsets < len(self.dense))
+            return np.where(valid, self.dense[np.clip(offsets, 0, max(len(self.dense) - 1, 0))], -1)
+        found = np.searchsorted(self.sorted_keys, fact_keys)
+        found = np.clip(found, 0, len(self.sorted_keys) - 1)
+        return np.where(self.sorted_keys[found] == fact_keys, self.order[found], -1)
+
+
+class StarSchema:
+    """Fact columns as NumPy arrays plus dimension DataFrames"""
+
+    def __init__(self, fact, dim_date, dim_product, dim_customer):
+        if isinstance(fact, pd.DataFrame):
+            fact = {col: fact[col].to_numpy() for col in fact.columns}
+        self.fact = fact
+        self.dims = {'date': dim_date, 'product': dim_product, 'customer': dim_customer}
+
+    def __len__(self):
+        return len(self.fact['date_key'])
+
+    @classmethod
+    def from_frames(cls, tables):
+        """Build from {'fact_sales', 'dim_date', 'dim_product', 'dim_customer'} DataFrames"""
+        return cls(tables['fact_sales'], tables['dim_date'], tables['dim_product'], tables['dim_customer'])
+
+    @classmethod
+    def from_csv(cls, directory):
+        """Load CSV exports (e.g. Final*.csv)"""
+        return cls.from_frames(read_star_csv(directory))
+
+    @classmethod
+    def from_sqlite(cls, connection):
+        """Load from a SQLite warehouse built by warehouse_loader.py"""
+        if isinstance(connection, str):
+            connection = sqlite3.connect(connection)
+        tables = {name: pd.read_sql_query(f"SELECT * FROM {name}", connection)
+                  for name in ['fact_sales', 'dim_date', 'dim_product', 'dim_customer']}
+        return cls.from_frames(tables)
+
+    def save_columnar(self, directory):
+        """Write fact_sales.npz (one array per column) and dimension .npz files"""
+        os.makedirs(directory, exist_ok=True)
+        write_npz(os.path.join(directory, 'fact_sales.npz'), self.fact)
+        write_dimensions(directory, self.dims)
+
+    @classmethod
+    def from_columnar(cls, directory):
+        """Load the .npz files written by save_columnar()"""
+        dims = read_dimensions(directory)
+        return cls(read_npz(os.path.join(directory, 'fact_sales.npz')),
+                   dims['date'], dims['product'], dims['customer'])
+
+
+def write_npz(path, columns):
+    """Write {column: array-like} (or a DataFrame) as one .npz array per column"""
+    if isinstance(columns, pd.DataFrame):
+        columns = {col: columns[col] for col in columns.columns}
+    arrays = {}
+    for col, values in columns.items():
+        values = pd.Series(values) if not isinstance(values, pd.Series) else values
+        arrays[col] = (values.to_numpy() if pd.api.types.is_numeric_dtype(values)
+                       else values.astype(str).to_numpy(dtype=str))
+    np.savez(path, **arrays)
+
+
+def read_npz(path):
+    """Read an .npz written by write_npz() into {column: ndarray}"""
+    with np.load(path) as data:
+        return {col: data[col] for col in data.files}
+
+
+def write_dimensions(directory, dims):
+    """Write {'date', 'product', 'customer'} DataFrames as dim_*.npz"""
+    for alias, (table, _) in DIMENSIONS.items():
+        write_npz(os.path.join(directory, f'{table}.npz'), dims[alias])
+
+
+def read_dimensions(directory):
+    """Read dim_*.npz back into {'date', 'product', 'customer'} DataFrames"""
+    return {alias: pd.DataFrame(read_npz(os.path.join(directory, f'{table}.npz')))
+            for alias, (table, _) in DIMENSIONS.items()}
+
+
+class OLAPEngine:
+    """
+    Query engine over a StarSchema
+    Columns are named 'quantity_sold' (fact) or '<dim>.<column>' with
+    dim in {date, product, customer}, e.g. 'date.month', 'product.category'
+    """
+
+    def __init__(self, schema):
+        self.schema = schema
+        self._positions = {}
+        self._codes = {}
+        self.bitmap_index = None
+
+    def enable_bitmap_index(self, columns=DEFAULT_BITMAP_COLUMNS):
+        """Resolve equality filters on these columns with bitmap AND/OR (built lazily)"""
+        self.bitmap_index = BitmapIndex(self, columns)
+        return self.bitmap_index
+
+    # ------------------------------------------------------------------
+    # Star join
+    # ------------------------------------------------------------------
+    def _dim_positions(self, alias):
+        """Fact-aligned dimension row positions (the star join)"""
+        if alias not in self._positions:
+            table, key = DIMENSIONS[alias]
+            index = KeyIndex(self.schema.dims[alias][key].to_numpy())
+            positions = index.positions(self.schema.fact[key])
+            if (positions < 0).any():
+                raise ValueError(f"fact_sales has {int((positions < 0).sum())} rows with unknown {key}")
+            self._positions[alias] = positions
+        return self._positions[alias]
+
+    def _column_codes(self, name):
+        """
+        (alias, codes, labels) for a column: dimension columns are factorized
+        at dimension-row level (alias set), fact columns at fact-row level
+        """
+        if name not in self._codes:
+            if '.' in name:
+                alias, column = name.split('.', 1)
+                codes, labels = pd.factorize(self.schema.dims[alias][column], sort=True)
+            else:
+                alias = None
+                codes, labels = pd.factorize(self.schema.fact[name], sort=True)
+            self._codes[name] = (alias, codes.astype(np.int64), np.asarray(labels))
+        return self._codes[name]
+
+    def codes(self, name):
+        """(fact-aligned int codes, labels) for a fact or dimension column"""
+        alias, codes, labels = self._column_codes(name)
+        if alias is not None:
+            codes = codes[self._dim_positions(alias)]
+        return codes, labels
+
+    def column(self, name):
+        """Fact-aligned values of a fact or dimension column"""
+        if '.' in name:
+            alias, column = name.split('.', 1)
+            return self.schema.dims[alias][column].to_numpy()[self._dim_positions(alias)]
+        return self.schema.fact[name]
+
+    def mask(self, where):
+        """
+        Boolean row mask for {column: value | [values]} equality filters (ANDed)
+        Dimension filters are evaluated on the dimension rows and gathered once per dimension
+        """
+        selected = np.ones(len(self.schema), dtype=bool)
+        dim_masks = {}
+        for name, value in (where or {}).items():
+            values = value if isinstance(value, (list, tuple, set)) else [value]
+            alias, codes, labels = self._column_codes(name)
+            matched = np.isin(labels, list(values))[codes]
+            if alias is None:
+                selected &= matched
+            else:
+                dim_masks[alias] = dim_masks[alias] & matched if alias in dim_masks else matched
+        for alias, dim_mask in dim_masks.items():
+            selected &= dim_mask[self._dim_positions(alias)]
+        return selected
+
+    # ------------------------------------------------------------------
+    # Aggregation
+    # ------------------------------------------------------------------
+    def select(self, where=None, rows=None):
+        """
+        Selected fact rows: None (all), sorted positions or a boolean mask
+        Filters covered by the bitmap index resolve to positions without
+        reading fact columns; others fall back to mask()
+        """
+        selection = None
+        if where:
+            if self.bitmap_index is not None and self.bitmap_index.covers(where):
+                selection = self.bitmap_index.lookup(where)
+            else:
+                selection = self.mask(where)
+        if rows is not None:
+            rows = np.flatnonzero(rows) if np.asarray(rows).dtype == bool else np.asarray(rows)
+            if selection is None:
+                selection = np.sort(rows)
+            else:
+                if selection.dtype == bool:
+                    selection = np.flatnonzero(selection)
+                selection = np.intersect1d(selection, rows)
+        return selection
+
+    def _combined_codes(self, keys, selection=None):
+        """
+        Row-major cell id over all keys (for the selected rows), plus per-key
+        labels and the cube shape
+        Keys from the same dimension are combined on the dimension rows, so the
+        fact table is gathered once per dimension rather than once per key
+        """
+        columns = [self._column_codes(key) for key in keys]
+        key_labels = [labels for _, _, labels in columns]
+        shape = tuple(max(len(labels), 1) for labels in key_labels)
+        strides = np.cumprod((1,) + shape[:0:-1])[::-1] if keys else ()
+
+        partials = {}
+        for (alias, codes, _), stride in zip(columns, strides):
+            partials[alias] = partials.get(alias, 0) + codes * int(stride)
+        combined = None
+        for alias, partial in partials.items():
+            positions = None if alias is None else self._dim_positions(alias)
+            if selection is not None:
+                positions = selection if positions is None else positions[selection]
+            part = partial if positions is None else partial[positions]
+            combined = part if combined is None else combined + part
+        return combined, key_labels, shape
+
+    def group_by(self, keys, aggregations, where=None, rows=None):
+        """
+        GROUP BY keys with aggregations {out: (func, column)}
+        func: sum | count | mean | min | max | nunique (column ignored for count)
+        rows: optional fact row positions (or boolean mask) to restrict to
+        """
+        selection = self.select(where, rows)
+        if selection is None:
+            n_rows = len(self.schema)
+        else:
+            n_rows = int(selection.sum()) if selection.dtype == bool else len(selection)
+
+        if keys:
+            combined, key_labels, shape = self._combined_codes(keys, selection)
+            cells = int(np.prod(shape, dtype=np.int64))
+            if cells <= max(n_rows, 1 << 22):
+                # Dense cube: aggregate straight into the key space, keep non-empty cells
+                bins, n_bins = combined, cells
+                counts = np.bincount(bins, minlength=n_bins)
+                groups = np.flatnonzero(counts)
+                keep = groups
+            else:
+                groups, bins = np.unique(combined, return_inverse=True)
+                n_bins = len(groups)
+                counts = np.bincount(bins, minlength=n_bins)
+                keep = slice(None)
+        else:
+            bins, n_bins = np.zeros(n_rows, dtype=np.int64), 1
+            counts = np.array([n_rows])
+            keep = slice(None)
+
+        result = {}
+        if keys:
+            unravelled = np.unravel_index(groups, shape) if len(keys) > 1 else (groups,)
+            for key, labels, idx in zip(keys, key_labels, unravelled):
+                result[key.split('.', 1)[-1]] = labels[idx]
+
+        for out, (func, column) in aggregations.items():
+            if func == 'count':
+                result[out] = counts[keep]
+                continue
+            values = self.column(column)
+            if selection is not None:
+                values = values[selection]
+            if func in ('sum', 'mean'):
+                sums = np.bincount(bins, weights=values.astype(np.float64), minlength=n_bins)
+                result[out] = (sums if func == 'sum' else sums / np.maximum(counts, 1))[keep]
+            elif func in ('min', 'max'):
+                acc = np.full(n_bins, np.inf if func == 'min' else -np.inf)
+                (np.minimum if func == 'min' else np.maximum).at(acc, bins, values)
+                result[out] = acc[keep]
+            elif func == 'nunique':
+                value_codes, value_labels = self.codes(column)
+                if selection is not None:
+                    value_codes = value_codes[selection]
+                width = max(len(value_labels), 1)
+                pairs = bins * width + value_codes
+                if n_bins * width <= max(n_rows, 1 << 22):
+                    seen = np.bincount(pairs, minlength=n_bins * width).reshape(n_bins, width)
+                    distinct = np.count_nonzero(seen, axis=1)
+                else:
+                    distinct = np.bincount(np.unique(pairs) // width, minlength=n_bins)
+                result[out] = distinct[keep]
+            else:
+                raise ValueError(f"Unsupported aggregation: {func}")
+        return pd.DataFrame(result)
+
+    def rollup(self, keys, aggregations, where=None):
+        """GROUP BY ... WITH ROLLUP: every key prefix plus the grand total (None = rolled up)"""
+        levels = []
+        for depth in range(len(keys), -1, -1):
+            frame = self.group_by(keys[:depth], aggregations, where=where)
+            for key in keys[depth:]:
+                frame.insert(len(frame.columns) - len(aggregations), key.split('.', 1)[-1], None)
+            levels.append(frame)
+        return pd.concat(levels, ignore_index=True)
+
+    # ------------------------------------------------------------------
+    # Window helpers
+    # ------------------------------------------------------------------
+    @staticmethod
+    def running_total(frame, column, order_by, partition_by=None):
+        """SUM(column) OVER (PARTITION BY ... ORDER BY ...)"""
+        ordered = frame.sort_values(order_by, kind='stable')
+        if partition_by:
+            totals = ordered.groupby(partition_by, sort=False)[column].cumsum()
+        else:
+            totals = ordered[column].cumsum()
+        return totals.reindex(frame.index)
+
+    @staticmethod
+    def share_of_total(frame, column):
+        """column / SUM(column) OVER () * 100"""
+        total = frame[column].sum()
+        return frame[column] / total * 100 if total else frame[column] * 0.0
+
+    @staticmethod
+    def lag(frame, column, order_by):
+        """LAG(column) OVER (ORDER BY ...)"""
+        ordered = frame.sort_values(order_by, kind='stable')
+        return ordered[column].shift(1).reindex(frame.index)
+
+    # ------------------------------------------------------------------
+    # analytics_queries.sql reports
+    # ------------------------------------------------------------------
+    def monthly_drill_down(self, year=2024, cumulative=False, where=None):
+        """Query 1: Year -> Quarter -> Month drill-down (optionally with running total)"""
+        where = dict(where or {}, **{'date.year': year})
+        frame = self.group_by(['date.year', 'date.quarter', 'date.month', 'date.month_name'], {
+            'total_orders': ('count', None),
+            'total_quantity': ('sum', 'quantity_sold'),
+            'revenue': ('sum', 'total_amount')
+        }, where=where).sort_values(['year', 'month'], kind='stable').reset_index(drop=True)
+        frame['total_quantity'] = frame['total_quantity'].astype(np.int64)
+        frame['monthly_revenue'] = frame['revenue'].round(2)
+        if cumulative:
+            frame['cumulative_revenue'] = self.running_total(frame, 'revenue', 'month', 'year').round(2)
+            return frame[['year', 'quarter', 'month_name', 'total_orders', 'total_quantity',
+                          'monthly_revenue', 'cumulative_revenue']]
+        return frame[['year', 'quarter', 'month_name', 'month', 'total_orders',
+                      'total_quantity', 'monthly_revenue']]
+
+    def product_performance(self, top_n=10, where=None):
+        """Query 2: Top products by revenue with share of total revenue"""
+        frame = self.group_by(['product.product_key'], {
+            'units_sold': ('sum', 'quantity_sold'),
+            'revenue': ('sum', 'total_amount')
+        }, where=where)
+        products = self.schema.dims['product'].set_index('product_key')
+        frame['product_name'] = products.loc[frame['product_key'], 'product_name'].to_numpy()
+        frame['category'] = products.loc[frame['product_key'], 'category'].to_numpy()
+        frame['revenue_percentage'] = self.share_of_total(frame, 'revenue').round(2)
+        frame['units_sold'] = frame['units_sold'].astype(np.int64)
+        frame = frame.sort_values('revenue', ascending=False, kind='stable').head(top_n)
+        frame['revenue'] = frame['revenue'].round(2)
+        return frame[['product_name', 'category', 'units_sold', 'revenue',
+                      'revenue_percentage']].reset_index(drop=True)
+
+    def customer_spending(self, where=None):
+        """Total spend per customer_key (input of the segmentation report)"""
+        return self.group_by(['customer.customer_key'], {'total_spent': ('sum', 'total_amount')}, where=where)
+
+    def customer_segmentation(self, where=None):
+        """Query 3: High / Medium / Low value customer segments"""
+        spending = self.customer_spending(where)
+        spent = spending['total_spent'].round(2)
+        segment = np.where(spent > 50000, 'High Value', np.where(spent >= 20000, 'Medium Value', 'Low Value'))
+        frame = (pd.DataFrame({'customer_segment': segment, 'total_spent': spent})
+                 .groupby('customer_segment', sort=False)['total_spent']
+                 .agg(customer_count='count', total_revenue='sum', avg_revenue_per_customer='mean')
+                 .reset_index())
+        order = {'High Value': 1, 'Medium Value': 2, 'Low Value': 3}
+        frame = frame.sort_values('customer_segment', key=lambda s: s.map(order)).reset_index(drop=True)
+        frame['total_revenue'] = frame['total_revenue'].round(2)
+        frame['avg_revenue_per_customer'] = frame['avg_revenue_per_customer'].round(2)
+        return frame
+
+    def weekday_weekend(self, where=None):
+        """Sales by day of week, weekend vs weekday"""
+        frame = self.group_by(['date.is_weekend', 'date.day_of_week'], {
+            'transaction_count': ('count', None),
+            'total_units': ('sum', 'quantity_sold'),
+            'avg_transaction_value': ('mean', 'total_amount'),
+            'total_revenue': ('sum', 'total_amount')
+        }, where=where)
+        frame['day_type'] = np.where(frame['is_weekend'].astype(bool), 'Weekend', 'Weekday')
+        frame['weekday'] = frame['day_of_week'].map({d: i for i, d in enumerate(WEEKDAY_ORDER)})
+        frame = frame.sort_values(['is_weekend', 'weekday'], ascending=[False, True], kind='stable')
+        frame['total_units'] = frame['total_units'].astype(np.int64)
+        for col in ['avg_transaction_value', 'total_revenue']:
+            frame[col] = frame[col].round(2)
+        return frame[['day_type', 'day_of_week', 'transaction_count', 'total_units',
+                      'avg_transaction_value', 'total_revenue']].reset_index(drop=True)
+
+    def category_analysis(self, where=None):
+        """Top categories by revenue"""
+        frame = self.group_by(['product.category'], {
+            'transaction_count': ('count', None),
+            'product_count': ('nunique', 'product_key'),
+            'units_sold': ('sum', 'quantity_sold'),
+            'total_revenue': ('sum', 'total_amount'),
+            'avg_transaction_value': ('mean', 'total_amount')
+        }, where=where)
+        frame['avg_unit_price'] = (frame['total_revenue'] / frame['units_sold']).round(2)
+        frame['units_sold'] = frame['units_sold'].astype(np.int64)
+        frame = frame.sort_values('total_revenue', ascending=False, kind='stable')
+        for col in ['total_revenue', 'avg_transaction_value']:
+            frame[col] = frame[col].round(2)
+        return frame[['category', 'transaction_count', 'product_count', 'units_sold', 'total_revenue',
+                      'avg_transaction_value', 'avg_unit_price']].reset_index(drop=True)
+
+    def city_analysis(self, where=None):
+        """Customer city analysis"""
+        frame = self.group_by(['customer.city'], {
+            'customer_count': ('nunique', 'customer_key'),
+            'transaction_count': ('count', None),
+            'units_purchased': ('sum', 'quantity_sold'),
+            'total_spent': ('sum', 'total_amount'),
+            'avg_transaction_value': ('mean', 'total_amount')
+        }, where=where)
+        frame['units_purchased'] = frame['units_purchased'].astype(np.int64)
+        frame = frame.sort_values('total_spent', ascending=False, kind='stable')
+        for col in ['total_spent', 'avg_transaction_value']:
+            frame[col] = frame[col].round(2)
+        return frame[['city', 'customer_count', 'transaction_count', 'units_purchased',
+                      'total_spent', 'avg_transaction_value']].reset_index(drop=True)
+
+    def monthly_growth(self, year=2024, where=None):
+        """Month-over-month revenue growth"""
+        where = dict(where or {}, **{'date.year': year})
+        frame = self.group_by(['date.month', 'date.month_name'], {
+            'transactions': ('count', None),
+            'revenue_raw': ('sum', 'total_amount')
+        }, where=where).sort_values('month', kind='stable').reset_index(drop=True)
+        frame['revenue'] = frame['revenue_raw'].round(2)
+        frame['prev_month_revenue'] = self.lag(frame, 'revenue_raw', 'month')
+        frame['month_over_month_growth_percent'] = (
+            (frame['revenue_raw'] - frame['prev_month_revenue']) / frame['prev_month_revenue'] * 100
+        ).round(2)
+        return frame[['month_name', 'month', 'transactions', 'revenue', 'prev_month_revenue',
+                      'month_over_month_growth_percent']]
+
+    def product_city_matrix(self, top_n=5, where=None):
+        """Top products by revenue within each city"""
+        frame = self.group_by(['customer.city', 'product.product_name'],
+                              {'revenue': ('sum', 'total_amount')}, where=where)
+        frame = frame.sort_values(['city', 'revenue'], ascending=[True, False], kind='stable')
+        frame['rank'] = frame.groupby('city').cumcount() + 1
+        return frame[frame['rank'] <= top_n][['city', 'product_name', 'revenue']].reset_index(drop=True)
+
+    def discount_impact(self, where=None):
+        """Revenue by discount bucket"""
+        discount = self.column('discount_amount').astype(np.float64)
+        buckets = np.select(
+            [discount == 0, discount < 1000, discount < 5000],
+            ['No Discount', 'Small Discount (< ₹1000)', 'Medium Discount (₹1000-₹5000)'],
+            'Large Discount (> ₹5000)'
+        )
+        frame = pd.DataFrame({'discount_range': buckets, 'discount_amount': discount,
+                              'total_amount': self.column('total_amount').astype(np.float64)})
+        if where:
+            frame = frame[self.mask(where)]
+        frame = (frame.groupby('discount_range')
+                 .agg(transaction_count=('total_amount', 'size'),
+                      total_discount_amount=('discount_amount', 'sum'),
+                      avg_discount=('discount_amount', 'mean'),
+                      revenue_after_discount=('total_amount', 'sum'))
+                 .reset_index().sort_values('avg_discount', ascending=False, kind='stable'))
+        for col in ['total_discount_amount', 'avg_discount', 'revenue_after_discount']:
+            frame[col] = frame[col].round(2)
+        return frame.reset_index(drop=True)
+
+    def quarter_performance(self, year=2024, where=None):
+        """Quarter-over-quarter performance"""
+        where = dict(where or {}, **{'date.year': year})
+        frame = self.group_by(['date.quarter'], {
+            'transactions': ('count', None),
+            'units_sold': ('sum', 'quantity_sold'),
+            'quarter_revenue': ('sum', 'total_amount')
+        }, where=where).sort_values('quarter', kind='stable').reset_index(drop=True)
+        frame['avg_transaction_value'] = (frame['quarter_revenue'] / frame['transactions']).round(2)
+        frame['quarter_revenue'] = frame['quarter_revenue'].round(2)
+        frame['units_sold'] = frame['units_sold'].astype(np.int64)
+        return frame
+
+    def run_report(self, name, **kwargs):
+        """Run a report by its analytics_queries.sql name"""
+        method, defaults = REPORTS[name]
+        return getattr(self, method)(**dict(defaults, **kwargs))
+
+
+# analytics_queries.sql statement name -> (engine method, default arguments)
+REPORTS = {
+    'Query 1: Monthly Sales Drill-Down Analysis': ('monthly_drill_down', {}),
+    'Alternative with Cumulative (Running Total) - Advanced Drill-Down': ('monthly_drill_down', {'cumulative': True}),
+    'Query 2: Product Performance Analysis': ('product_performance', {}),
+    'Alternative with CTE for clarity': ('product_performance', {}),
+    'Query 3: Customer Segmentation Analysis': ('customer_segmentation', {}),
+    'Query: Sales by Day of Week (Weekend vs Weekday Analysis)': ('weekday_weekend', {}),
+    'Query: Top Categories by Revenue': ('category_analysis', {}),
+    'Query: Customer City Analysis': ('city_analysis', {}),
+    'Query: Monthly Growth Analysis': ('monthly_growth', {}),
+    'Query: Product-Customer Matrix (Top 5 products for each city)': ('product_city_matrix', {}),
+    'Query: Discount Impact Analysis': ('discount_impact', {}),
+    'Query: Quarter-over-Quarter Performance': ('quarter_performance', {})
+}
+
+
+def main():
+    """Run every report over the Final*.csv exports"""
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    engine = OLAPEngine(StarSchema.from_csv(script_dir))
+    pd.set_option('display.width', 140)
+    for name in REPORTS:
+        print("\n" + "="*70)
+        print(name)
+        print("="*70)
+        print(engine.run_report(name).to_string(index=False))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,297 @@
+"""
+Scale Benchmark for analytics_queries.sql
+Part 3: Data Warehouse Implementation
+Generates synthetic stars at configurable scale factors (1 = 100,000 fact
+rows), loads them into on-disk SQLite (loader schema and indexes) and DuckDB,
+then runs every named query in analytics_queries.sql:
+- cold timing: first run on a fresh connection; warm: median of repeats
+- EXPLAIN plans per engine, and which fact_sales indexes each plan uses
+- probe queries that show when idx_fs_date_product / idx_fs_date_customer apply
+- regressions flagged against a stored JSON baseline
+"""
+
+import os
+import json
+import time
+import sqlite3
+import argparse
+import tempfile
+import statistics
+
+from sql_scripts import load_named_queries, mysql_to_portable
+from synthetic_star import generate_star
+from warehouse_loader import SQLITE_SCHEMA
+
+try:
+    import duckdb
+    DUCKDB_AVAILABLE = True
+except ImportError:
+    DUCKDB_AVAILABLE = False
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ANALYTICS_QUERIES_FILE = os.path.join(SCRIPT_DIR, 'analytics_queries.sql')
+DEFAULT_BASELINE = os.path.join(SCRIPT_DIR, 'query_benchmark_baseline.json')
+
+ROWS_PER_SCALE = 100_000
+TABLE_ORDER = ['dim_date', 'dim_product', 'dim_customer', 'fact_sales']
+COMPOSITE_INDEXES = ['idx_fs_date_product', 'idx_fs_date_customer']
+FACT_INDEXES = ['idx_date_key', 'idx_product_key', 'idx_customer_key'] + COMPOSITE_INDEXES
+
+# Access paths the composite indexes are meant for: a date range combined
+# with a product or customer (the drill-down and per-customer lookups)
+INDEX_PROBES = [
+    ('Probe: date range x product',
+     "SELECT COUNT(*) AS transactions, SUM(total_amount) AS revenue FROM fact_sales "
+     "WHERE date_key BETWEEN 20240101 AND 20240331 AND product_key = 1"),
+    ('Probe: date range x customer',
+     "SELECT COUNT(*) AS transactions, SUM(total_amount) AS revenue FROM fact_sales "
+     "WHERE date_key BETWEEN 20240101 AND 20240331 AND customer_key = 1"),
+    ('Probe: one month by product',
+     "SELECT product_key, SUM(total_amount) AS revenue FROM fact_sales "
+     "WHERE date_key BETWEEN 20240301 AND 20240331 GROUP BY product_key"),
+]
+
+
+def benchmark_queries():
+    """[(name, portable sql)] for analytics_queries.sql plus the index probes"""
+    queries = [(name, mysql_to_portable(sql)) for name, sql in load_named_queries(ANALYTICS_QUERIES_FILE)]
+    return queries + INDEX_PROBES
+
+
+class SQLiteTarget:
+    """On-disk SQLite built with the loader schema (indexes created after the bulk load)"""
+
+    name = 'sqlite'
+
+    def __init__(self, directory):
+        self.path = os.path.join(directory, 'benchmark.sqlite')
+
+    def load(self, tables):
+        connection = sqlite3.connect(self.path)
+        tables_ddl = [s for s in SQLITE_SCHEMA if not s.startswith('CREATE INDEX')]
+        index_ddl = [s for s in SQLITE_SCHEMA if s.startswith('CREATE INDEX')]
+        for statement in tables_ddl:
+            connection.execute(statement)
+        for name in TABLE_ORDER:
+            tables[name].to_sql(name, connection, if_exists='append', index=False, chunksize=50_000)
+        for statement in index_ddl:
+            connection.execute(statement)
+        connection.execute("ANALYZE")
+        connection.commit()
+        connection.close()
+
+    def connect(self):
+        return sqlite3.connect(self.path)
+
+    @staticmethod
+    def execute(connection, sql):
+        return connection.execute(sql).fetchall()
+
+    @staticmethod
+    def explain(connection, sql):
+        """EXPLAIN QUERY PLAN rows indented by depth"""
+        rows = connection.execute(f"EXPLAIN QUERY PLAN {sql}").fetchall()
+        depth = {0: -1}
+        lines = []
+        for node_id, parent, _, detail in rows:
+            depth[node_id] = depth.get(parent, -1) + 1
+            lines.append('  ' * depth[node_id] + detail)
+        return '\n'.join(lines)
+
+
+class DuckDBTarget:
+    """On-disk DuckDB with the same composite indexes (ART) as the SQLite schema"""
+
+    name = 'duckdb'
+
+    def __init__(self, directory):
+        self.path = os.path.join(directory, 'benchmark.duckdb')
+
+    def load(self, tables):
+        connection = duckdb.connect(self.path)
+        for name in TABLE_ORDER:
+            connection.register('incoming', tables[name])
+            connection.execute(f"CREATE TABLE {name} AS SELECT * FROM incoming")
+            connection.unregister('incoming')
+        for statement in SQLITE_SCHEMA:
+            if statement.startswith('CREATE INDEX') and 'ON fact_sales' in statement:
+                connection.execute(statement)
+        connection.execute("CHECKPOINT")
+        connection.close()
+
+    def connect(self):
+        return duckdb.connect(self.path, read_only=True)
+
+    @staticmethod
+    def execute(connection, sql):
+        return connection.execute(sql).fetchall()
+
+    @staticmethod
+    def explain(connection, sql):
+        return '\n'.join(plan for _, plan in connection.execute(f"EXPLAIN {sql}").fetchall())
+
+
+def indexes_used(plan):
+    """fact_sales index names that appear in a plan"""
+    return [index for index in FACT_INDEXES if index in plan]
+
+
+def time_query(target, sql, repeat):
+    """(cold seconds on a fresh connection, median warm seconds, plan)"""
+    connection = target.connect()
+    try:
+        start = time.perf_counter()
+        target.execute(connection, sql)
+        cold = time.perf_counter() - start
+        warm = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            target.execute(connection, sql)
+            warm.append(time.perf_counter() - start)
+        plan = target.explain(connection, sql)
+    finally:
+        connection.close()
+    return cold, statistics.median(warm), plan
+
+
+def run_benchmark(scale, engines, repeat=3, seed=7):
+    """{'scale', 'rows', 'engines': {engine: {query: {cold_ms, warm_ms, indexes, plan}}}}"""
+    rows = int(scale * ROWS_PER_SCALE)
+    print("\n" + "="*70)
+    print(f"SCALE FACTOR {scale}: {rows:,} fact rows")
+    print("="*70)
+
+    start = time.perf_counter()
+    tables = generate_star(rows, products=max(500, rows // 2000), customers=max(10_000, rows // 100), seed=seed)
+    print(f"[INFO] Generated star in {time.perf_counter() - start:.2f}s")
+
+    queries = benchmark_queries()
+    result = {'scale': scale, 'rows': rows, 'repeat': repeat, 'engines': {}}
+    with tempfile.TemporaryDirectory() as directory:
+        for engine in engines:
+            target = SQLiteTarget(directory) if engine == 'sqlite' else DuckDBTarget(directory)
+            start = time.perf_counter()
+            target.load(tables)
+            print(f"[INFO] Loaded {engine} in {time.perf_counter() - start:.2f}s")
+
+            timings = {}
+            for name, sql in queries:
+                cold, warm, plan = time_query(target, sql, repeat)
+                timings[name] = {'cold_ms': round(cold * 1000, 3), 'warm_ms': round(warm * 1000, 3),
+                                 'indexes': indexes_used(plan), 'plan': plan}
+            result['engines'][engine] = timings
+    return result
+
+
+def print_results(result, show_plans=False):
+    for engine, timings in result['engines'].items():
+        print(f"\n--- {engine} ({result['rows']:,} fact rows) ---")
+        print(f"{'Query':<58}{'cold ms':>10}{'warm ms':>10}  fact_sales indexes")
+        for name, timing in timings.items():
+            indexes = ', '.join(timing['indexes']) or '-'
+            print(f"{name[:57]:<58}{timing['cold_ms']:>10.1f}{timing['warm_ms']:>10.1f}  {indexes}")
+            if show_plans:
+                print('\n'.join('      ' + line for line in timing['plan'].splitlines()))
+
+        for index in COMPOSITE_INDEXES:
+            users = [name for name, timing in timings.items() if index in timing['indexes']]
+            status = f"used by {len(users)} quer{'y' if len(users) == 1 else 'ies'}" if users else "NOT used"
+            print(f"[INFO] {engine}: {index} {status}" + (f" ({'; '.join(users)})" if users else ''))
+
+
+def compare_with_baseline(result, baseline, threshold=0.25, min_delta_ms=5.0):
+    """
+    Warm timings slower than baseline by more than threshold (relative) and
+    min_delta_ms (absolute, so sub-millisecond noise never trips it)
+    Returns [(engine, query, baseline_ms, current_ms)]
+    """
+    regressions = []
+    for engine, timings in result['engines'].items():
+        previous = baseline.get('engines', {}).get(engine, {})
+        for name, timing in timings.items():
+            if name not in previous:
+                continue
+            before, now = previous[name]['warm_ms'], timing['warm_ms']
+            if now > before * (1 + threshold) and now - before > min_delta_ms:
+                regressions.append((engine, name, before, now))
+    return regressions
+
+
+def baseline_entry(results):
+    """Baseline file content: timings and index usage per scale factor (plans omitted)"""
+    return {str(result['scale']): {
+        'rows': result['rows'],
+        'engines': {engine: {name: {key: timing[key] for key in ('cold_ms', 'warm_ms', 'indexes')}
+                             for name, timing in timings.items()}
+                    for engine, timings in result['engines'].items()}
+    } for result in results}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark analytics_queries.sql on SQLite/DuckDB at scale')
+    parser.add_argument('--scale', type=float, nargs='+', default=[1, 10],
+                        help=f'scale factors (1 = {ROWS_PER_SCALE:,} fact rows)')
+    parser.add_argument('--engines', nargs='+', choices=['sqlite', 'duckdb'], default=['sqlite', 'duckdb'])
+    parser.add_argument('--repeat', type=int, default=3, help='warm runs per query (median reported)')
+    parser.add_argument('--plans', action='store_true', help='print EXPLAIN plans')
+    parser.add_argument('--output', help='write full results (including plans) as JSON')
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE)
+    parser.add_argument('--save-baseline', action='store_true', help='store these timings as the new baseline')
+    parser.add_argument('--threshold', type=float, default=0.25, help='relative slowdown that counts as a regression')
+    parser.add_argument('--min-delta-ms', type=float, default=5.0)
+    args = parser.parse_args()
+
+    engines = args.engines
+    if 'duckdb' in engines and not DUCKDB_AVAILABLE:
+        print("[WARNING] duckdb not installed (pip install duckdb); running SQLite only")
+        engines = [engine for engine in engines if engine != 'duckdb']
+
+    results = []
+    for scale in args.scale:
+        result = run_benchmark(scale, engines, repeat=args.repeat)
+        print_results(result, show_plans=args.plans)
+        results.append(result)
+
+    if args.output:
+        with open(args.output, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\n[SUCCESS] Results written to {args.output}")
+
+    if args.save_baseline:
+        stored = {}
+        if os.path.exists(args.baseline):
+            with open(args.baseline, 'r', encoding='utf-8') as f:
+                stored = json.load(f)
+        stored.update(baseline_entry(results))
+        with open(args.baseline, 'w', encoding='utf-8') as f:
+            json.dump(stored, f, indent=2)
+        print(f"[SUCCESS] Baseline saved to {args.baseline}")
+        return 0
+
+    if not os.path.exists(args.baseline):
+        print(f"\n[INFO] No baseline at {args.baseline}; run with --save-baseline to create one")
+        return 0
+
+    with open(args.baseline, 'r', encoding='utf-8') as f:
+        stored = json.load(f)
+    regressions = []
+    print("\n" + "="*70)
+    print("BASELINE COMPARISON")
+    print("="*70)
+    for result in results:
+        baseline = stored.get(str(result['scale']))
+        if baseline is None:
+            print(f"[WARNING] No baseline for scale factor {result['scale']}")
+            continue
+        for engine, name, before, now in compare_with_baseline(result, baseline, args.threshold, args.min_delta_ms):
+            regressions.append(name)
+            print(f"[REGRESSION] scale {result['scale']} {engine}: {name} {before:.1f}ms -> {now:.1f}ms")
+    if regressions:
+        print(f"[ERROR] {len(regressions)} regression(s) above {args.threshold:.0%}")
+        return 1
+    print("[SUCCESS] No regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
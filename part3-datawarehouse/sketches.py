@@ -0,0 +1,233 @@
+"""
+Mergeable Sketches for FlexiMart Data Warehouse
+Part 3: Data Warehouse Implementation
+Vectorized NumPy sketches used by the approximate analytics mode:
+- HyperLogLog / GroupedHyperLogLog: distinct counts (~1.04/sqrt(2^p) error)
+- CountMinSketch: weighted point estimates (overestimates by <= e/width * total)
+- SpaceSaving: weighted heavy hitters (mergeable Misra-Gries form)
+- TDigest: quantiles, most accurate in the tails
+Every sketch has merge(), so per-partition sketches combine into any range
+"""
+
+import math
+
+import numpy as np
+import pandas as pd
+
+
+def hash64(values):
+    """64-bit hash per value (any dtype) via pandas' vectorized hashing"""
+    return pd.util.hash_array(np.asarray(values))
+
+
+def _hll_index_rank(hashes, p):
+    """Register index (top p bits) and rank (leading zeros + 1 of the next 32 bits)"""
+    index = (hashes >> np.uint64(64 - p)).astype(np.intp)
+    window = ((hashes << np.uint64(p)) >> np.uint64(32)).astype(np.float64)
+    bit_length = np.frexp(window)[1]     # exact: window < 2**32
+    rank = np.where(window > 0, 33 - bit_length, 33).astype(np.uint8)
+    return index, rank
+
+
+def _hll_estimate(registers, axis=-1):
+    """Standard HyperLogLog estimate with linear counting for small ranges"""
+    m = registers.shape[axis]
+    alpha = 0.7213 / (1 + 1.079 / m)
+    raw = alpha * m * m / np.sum(np.ldexp(1.0, -registers.astype(np.int64)), axis=axis)
+    zeros = np.sum(registers == 0, axis=axis)
+    with np.errstate(divide='ignore'):
+        linear = m * np.log(m / np.maximum(zeros, 1))
+    return np.where((raw <= 2.5 * m) & (zeros > 0), linear, raw)
+
+
+class HyperLogLog:
+    """Distinct count estimator with 2^p one-byte registers"""
+
+    def __init__(self, p=12):
+        self.p = p
+        self.registers = np.zeros(1 << p, dtype=np.uint8)
+
+    def add(self, values):
+        index, rank = _hll_index_rank(hash64(values), self.p)
+        np.maximum.at(self.registers, index, rank)
+
+    def merge(self, other):
+        np.maximum(self.registers, other.registers, out=self.registers)
+        return self
+
+    def estimate(self):
+        return float(_hll_estimate(self.registers))
+
+    def relative_error(self):
+        return 1.04 / math.sqrt(1 << self.p)
+
+
+class GroupedHyperLogLog:
+    """One HyperLogLog per group label (e.g. distinct customers per city)"""
+
+    def __init__(self, p=12):
+        self.p = p
+        self.labels = []
+        self._positions = {}
+        self.registers = np.zeros((0, 1 << p), dtype=np.uint8)
+
+    def _rows_for(self, labels):
+        """Register rows for labels, adding rows for unseen labels"""
+        new = [label for label in labels if label not in self._positions]
+        if new:
+            for label in new:
+                self._positions[label] = len(self.labels)
+                self.labels.append(label)
+            self.registers = np.vstack([self.registers,
+                                        np.zeros((len(new), 1 << self.p), dtype=np.uint8)])
+        return np.array([self._positions[label] for label in labels], dtype=np.intp)
+
+    def add(self, group_codes, group_labels, values):
+        """group_codes index into group_labels (as from pd.factorize)"""
+        rows = self._rows_for(list(group_labels))[group_codes]
+        index, rank = _hll_index_rank(hash64(values), self.p)
+        np.maximum.at(self.registers.reshape(-1), rows * (1 << self.p) + index, rank)
+
+    def merge(self, other):
+        rows = self._rows_for(other.labels)
+        np.maximum.at(self.registers, rows, other.registers)
+        return self
+
+    def estimates(self):
+        """{label: estimated distinct count}"""
+        return dict(zip(self.labels, _hll_estimate(self.registers).tolist()))
+
+
+class CountMinSketch:
+    """Weighted frequency table; estimate(key) >= true weight"""
+
+    def __init__(self, width=2048, depth=4):
+        self.width = width
+        self.depth = depth
+        self.table = np.zeros((depth, width), dtype=np.float64)
+        self.total = 0.0
+
+    def _columns(self, keys):
+        hashes = hash64(keys)
+        low = (hashes & np.uint64(0xFFFFFFFF)).astype(np.int64)
+        high = (hashes >> np.uint64(32)).astype(np.int64) | 1
+        return [(low + row * high) % self.width for row in range(self.depth)]
+
+    def add(self, keys, weights):
+        weights = np.asarray(weights, dtype=np.float64)
+        for row, columns in enumerate(self._columns(keys)):
+            self.table[row] += np.bincount(columns, weights=weights, minlength=self.width)
+        self.total += float(weights.sum())
+
+    def estimate(self, keys):
+        columns = self._columns(keys)
+        return np.min([self.table[row][cols] for row, cols in enumerate(columns)], axis=0)
+
+    def merge(self, other):
+        self.table += other.table
+        self.total += other.total
+        return self
+
+    def error_bound(self):
+        """Overestimate bound e/width * total (holds with probability 1 - e^-depth)"""
+        return math.e / self.width * self.total
+
+
+class SpaceSaving:
+    """
+    Weighted heavy hitters in the mergeable Misra-Gries form of Space-Saving
+    counts are lower bounds; true weight <= count + offset
+    """
+
+    def __init__(self, capacity=256):
+        self.capacity = capacity
+        self.keys = np.zeros(0, dtype=np.int64)
+        self.counts = np.zeros(0, dtype=np.float64)
+        self.offset = 0.0
+
+    def _combine(self, keys, counts):
+        unique, inverse = np.unique(keys, return_inverse=True)
+        counts = np.bincount(inverse, weights=counts, minlength=len(unique))
+        if len(unique) > self.capacity:
+            order = np.argsort(-counts, kind='stable')
+            threshold = counts[order[self.capacity]]
+            keep = order[:self.capacity]
+            unique, counts = unique[keep], counts[keep] - threshold
+            self.offset += threshold
+            positive = counts > 0
+            unique, counts = unique[positive], counts[positive]
+        self.keys, self.counts = unique, counts
+
+    def add(self, keys, weights):
+        self._combine(np.concatenate([self.keys, np.asarray(keys, dtype=np.int64)]),
+                      np.concatenate([self.counts, np.asarray(weights, dtype=np.float64)]))
+
+    def merge(self, other):
+        self.offset += other.offset
+        self._combine(np.concatenate([self.keys, other.keys]),
+                      np.concatenate([self.counts, other.counts]))
+        return self
+
+    def top(self, k):
+        """(keys, lower-bound counts) of the k largest counters"""
+        order = np.argsort(-self.counts, kind='stable')[:k]
+        return self.keys[order], self.counts[order]
+
+
+class TDigest:
+    """
+    Merging t-digest: centroids are rebuilt in one vectorized pass by bucketing
+    sorted points on the k2 scale function, so each centroid covers about one
+    k-unit (small centroids in the tails, larger ones near the median)
+    """
+
+    def __init__(self, compression=200):
+        self.compression = compression
+        self.means = np.zeros(0, dtype=np.float64)
+        self.weights = np.zeros(0, dtype=np.float64)
+        self.min = math.inf
+        self.max = -math.inf
+
+    def _compress(self, means, weights):
+        order = np.argsort(means, kind='stable')
+        means, weights = means[order], weights[order]
+        total = weights.sum()
+        q_mid = (np.cumsum(weights) - weights / 2) / total
+        # k2 scale: bucket width shrinks with q(1 - q), bounding relative tail error
+        normalizer = 4 * math.log(max(total / self.compression, 1.0)) + 24
+        k = self.compression / normalizer * np.log(q_mid / (1 - q_mid))
+        bucket = np.floor(k - k.min()).astype(np.intp)
+        _, bucket = np.unique(bucket, return_inverse=True)
+        weight_sums = np.bincount(bucket, weights=weights)
+        self.means = np.bincount(bucket, weights=means * weights) / weight_sums
+        self.weights = weight_sums
+
+    def add(self, values, weights=None):
+        values = np.asarray(values, dtype=np.float64)
+        if len(values) == 0:
+            return
+        weights = np.ones(len(values)) if weights is None else np.asarray(weights, dtype=np.float64)
+        self.min = min(self.min, float(values.min()))
+        self.max = max(self.max, float(values.max()))
+        self._compress(np.concatenate([self.means, values]), np.concatenate([self.weights, weights]))
+
+    def merge(self, other):
+        if len(other.weights):
+            self.min = min(self.min, other.min)
+            self.max = max(self.max, other.max)
+            self._compress(np.concatenate([self.means, other.means]),
+                           np.concatenate([self.weights, other.weights]))
+        return self
+
+    def count(self):
+        return float(self.weights.sum())
+
+    def quantile(self, q):
+        """Estimated value at quantile(s) q in [0, 1]"""
+        total = self.weights.sum()
+        if total == 0:
+            return np.full(np.shape(q), np.nan)
+        centers = np.cumsum(self.weights) - self.weights / 2
+        return np.interp(np.asarray(q) * total,
+                         np.concatenate([[0.0], centers, [total]]),
+                         np.concatenate([[self.min], self.means, [self.max]]))
@@ -0,0 +1,63 @@
+"""
+SQL Script Helpers for FlexiMart Data Warehouse
+Part 3: Data Warehouse Implementation
+Splits the project's .sql files into named statements so they can be run
+programmatically against the local SQLite warehouse
+"""
+
+import re
+
+_NAME_COMMENT = re.compile(r'^--\s*((?:Query|Alternative)\b.*?)\s*$')
+
+
+def _strip_comments(sql):
+    lines = []
+    for line in sql.splitlines():
+        code = line.split('--', 1)[0] if not line.lstrip().startswith('--') else ''
+        lines.append(code)
+    return '\n'.join(lines)
+
+
+def load_named_queries(path):
+    """
+    Return [(name, sql)] for each statement in a .sql file
+    A statement is named after the nearest preceding '-- Query ...' or
+    '-- Alternative ...' comment; USE statements are skipped
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        text = f.read()
+
+    # Drop the trailing /* ... */ notes blocks
+    text = re.sub(r'/\*.*?\*/', '', text, flags=re.S)
+
+    queries = []
+    current_name = None
+    buffer = []
+    has_code = False
+    for line in text.splitlines():
+        match = _NAME_COMMENT.match(line.strip())
+        if match and not has_code:
+            current_name = re.sub(r'\s*\(\d+ marks\)$', '', match.group(1))
+        buffer.append(line)
+        has_code = has_code or bool(_strip_comments(line).strip())
+        if line.rstrip().endswith(';') and has_code:
+            statement = _strip_comments('\n'.join(buffer)).strip().rstrip(';').strip()
+            buffer = []
+            has_code = False
+            if not statement or statement.upper().startswith('USE '):
+                continue
+            queries.append((current_name or f"statement_{len(queries) + 1}", statement))
+    return queries
+
+
+# FIELD(col, 'a', 'b', ...) -> CASE col WHEN 'a' THEN 1 WHEN 'b' THEN 2 ... END
+_FIELD_CALL = re.compile(r"FIELD\(\s*([\w.]+)\s*,\s*((?:'[^']*'\s*,\s*)*'[^']*')\s*\)", re.I)
+
+
+def mysql_to_portable(sql):
+    """Rewrite MySQL-only syntax used in the analytics scripts for SQLite / DuckDB"""
+    def field_to_case(match):
+        values = re.findall(r"'[^']*'", match.group(2))
+        whens = ' '.join(f"WHEN {value} THEN {i}" for i, value in enumerate(values, 1))
+        return f"CASE {match.group(1)} {whens} ELSE 0 END"
+    return _FIELD_CALL.sub(field_to_case, sql)
@@ -0,0 +1,220 @@
+"""
+Summary Cube Refresh Job for FlexiMart Data Warehouse
+Part 3: Data Warehouse Implementation
+Maintains the rollups from summary_cubes.sql (SQLite dialect) incrementally:
+only fact_sales rows above the stored sale_key watermark are aggregated
+"""
+
+import os
+import sqlite3
+import logging
+import time
+
+from sql_scripts import load_named_queries
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+ROLLUP_QUERIES_FILE = os.path.join(SCRIPT_DIR, 'analytics_rollup_queries.sql')
+DEFAULT_DW_PATH = os.path.join(SCRIPT_DIR, 'fleximart_dw.sqlite')
+
+CUBE_SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS agg_sales_daily_product (
+        date_key INTEGER NOT NULL,
+        product_key INTEGER NOT NULL,
+        transaction_count INTEGER NOT NULL,
+        quantity_sold INTEGER NOT NULL,
+        discount_amount REAL NOT NULL,
+        revenue REAL NOT NULL,
+        PRIMARY KEY (date_key, product_key)
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_adp_product ON agg_sales_daily_product(product_key)",
+    """CREATE TABLE IF NOT EXISTS agg_sales_daily_customer (
+        date_key INTEGER NOT NULL,
+        customer_key INTEGER NOT NULL,
+        transaction_count INTEGER NOT NULL,
+        quantity_sold INTEGER NOT NULL,
+        revenue REAL NOT NULL,
+        PRIMARY KEY (date_key, customer_key)
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_adc_customer ON agg_sales_daily_customer(customer_key)",
+    """CREATE TABLE IF NOT EXISTS agg_sales_month_category (
+        year INTEGER NOT NULL,
+        month INTEGER NOT NULL,
+        quarter VARCHAR(2) NOT NULL,
+        month_name VARCHAR(10) NOT NULL,
+        category VARCHAR(50) NOT NULL,
+        transaction_count INTEGER NOT NULL,
+        quantity_sold INTEGER NOT NULL,
+        revenue REAL NOT NULL,
+        PRIMARY KEY (year, month, category)
+    )""",
+    """CREATE TABLE IF NOT EXISTS agg_refresh_state (
+        cube_name VARCHAR(50) PRIMARY KEY,
+        last_sale_key INTEGER NOT NULL DEFAULT 0,
+        refreshed_at TIMESTAMP
+    )""",
+    "INSERT OR IGNORE INTO agg_refresh_state (cube_name, last_sale_key) VALUES ('fact_sales', 0)"
+]
+
+# Cube merges over the fact rows selected by {rows}; {sign} is '-' to take
+# rows back out (cdc_feed.py deletes superseded facts)
+MERGE_TEMPLATES = [
+    """INSERT INTO agg_sales_daily_product
+        (date_key, product_key, transaction_count, quantity_sold, discount_amount, revenue)
+    SELECT date_key, product_key, {sign}COUNT(*), {sign}SUM(quantity_sold), {sign}SUM(discount_amount),
+           {sign}SUM(total_amount)
+    FROM fact_sales f
+    WHERE {rows}
+    GROUP BY date_key, product_key
+    ON CONFLICT (date_key, product_key) DO UPDATE SET
+        transaction_count = transaction_count + excluded.transaction_count,
+        quantity_sold = quantity_sold + excluded.quantity_sold,
+        discount_amount = discount_amount + excluded.discount_amount,
+        revenue = revenue + excluded.revenue""",
+    """INSERT INTO agg_sales_daily_customer
+        (date_key, customer_key, transaction_count, quantity_sold, revenue)
+    SELECT date_key, customer_key, {sign}COUNT(*), {sign}SUM(quantity_sold), {sign}SUM(total_amount)
+    FROM fact_sales f
+    WHERE {rows}
+    GROUP BY date_key, customer_key
+    ON CONFLICT (date_key, customer_key) DO UPDATE SET
+        transaction_count = transaction_count + excluded.transaction_count,
+        quantity_sold = quantity_sold + excluded.quantity_sold,
+        revenue = revenue + excluded.revenue""",
+    """INSERT INTO agg_sales_month_category
+        (year, month, quarter, month_name, category, transaction_count, quantity_sold, revenue)
+    SELECT d.year, d.month, d.quarter, d.month_name, p.category,
+           {sign}COUNT(*), {sign}SUM(f.quantity_sold), {sign}SUM(f.total_amount)
+    FROM fact_sales f
+    JOIN dim_date d ON f.date_key = d.date_key
+    JOIN dim_product p ON f.product_key = p.product_key
+    WHERE {rows}
+    GROUP BY d.year, d.month, d.quarter, d.month_name, p.category
+    ON CONFLICT (year, month, category) DO UPDATE SET
+        transaction_count = transaction_count + excluded.transaction_count,
+        quantity_sold = quantity_sold + excluded.quantity_sold,
+        revenue = revenue + excluded.revenue"""
+]
+
+REFRESH_STATEMENTS = [template.format(sign='', rows="f.sale_key > :from_key AND f.sale_key <= :to_key")
+                      for template in MERGE_TEMPLATES]
+
+# Only rows at or below the watermark were aggregated; later ones never will be
+RETRACT_STATEMENTS = [template.format(sign='-', rows="f.sale_key IN (SELECT sale_key FROM retracted_facts) "
+                                                     "AND f.sale_key <= :to_key")
+                      for template in MERGE_TEMPLATES]
+
+CUBE_TABLES = ['agg_sales_daily_product', 'agg_sales_daily_customer', 'agg_sales_month_category']
+
+
+class SummaryCubeRefresher:
+    """
+    Incremental maintenance of the summary cubes
+    - refresh(): aggregates fact rows with sale_key in (watermark, max] and
+      merges them into the cubes; cubes and watermark commit atomically
+    - retract(sale_keys): takes fact rows about to be deleted back out of
+      the cubes, in the caller's transaction
+    - rebuild(): truncates the cubes and refreshes from sale_key 0
+    """
+
+    def __init__(self, connection):
+        """Initialize on an open sqlite3 connection to the warehouse"""
+        self.connection = connection
+
+    def create_tables(self):
+        cursor = self.connection.cursor()
+        for statement in CUBE_SCHEMA:
+            cursor.execute(statement)
+        self.connection.commit()
+
+    def watermark(self):
+        row = self.connection.execute(
+            "SELECT last_sale_key FROM agg_refresh_state WHERE cube_name = 'fact_sales'"
+        ).fetchone()
+        return row[0] if row else 0
+
+    def refresh(self):
+        """Merge newly loaded fact rows into the cubes; returns fact rows aggregated"""
+        self.create_tables()
+        start = time.perf_counter()
+        cursor = self.connection.cursor()
+        try:
+            cursor.execute("BEGIN IMMEDIATE")
+            from_key = self.watermark()
+            to_key = cursor.execute("SELECT COALESCE(MAX(sale_key), 0) FROM fact_sales").fetchone()[0]
+            if to_key <= from_key:
+                self.connection.rollback()
+                return 0
+
+            new_rows = cursor.execute(
+                "SELECT COUNT(*) FROM fact_sales WHERE sale_key > ? AND sale_key <= ?", (from_key, to_key)
+            ).fetchone()[0]
+            params = {'from_key': from_key, 'to_key': to_key}
+            for statement in REFRESH_STATEMENTS:
+                cursor.execute(statement, params)
+            cursor.execute(
+                "UPDATE agg_refresh_state SET last_sale_key = ?, refreshed_at = CURRENT_TIMESTAMP "
+                "WHERE cube_name = 'fact_sales'", (to_key,)
+            )
+            self.connection.commit()
+        except sqlite3.Error as e:
+            self.connection.rollback()
+            logging.error("Summary cube refresh failed: %s", e)
+            raise
+
+        elapsed = time.perf_counter() - start
+        logging.info("Summary cubes refreshed: %s fact rows (sale_key %s..%s) in %.3fs",
+                     new_rows, from_key, to_key, elapsed)
+        print(f"[SUCCESS] Summary cubes refreshed with {new_rows} new fact rows")
+        return new_rows
+
+    def retract(self, sale_keys):
+        """
+        Subtract already-aggregated fact rows (before the caller deletes them
+        and commits); cells left without transactions are removed
+        """
+        cursor = self.connection.cursor()
+        cursor.execute("CREATE TEMP TABLE IF NOT EXISTS retracted_facts (sale_key INTEGER PRIMARY KEY)")
+        cursor.execute("DELETE FROM retracted_facts")
+        cursor.executemany("INSERT INTO retracted_facts (sale_key) VALUES (?)", [(int(key),) for key in sale_keys])
+        params = {'to_key': self.watermark()}
+        for statement in RETRACT_STATEMENTS:
+            cursor.execute(statement, params)
+        for table in CUBE_TABLES:
+            cursor.execute(f"DELETE FROM {table} WHERE transaction_count = 0")
+
+    def rebuild(self):
+        """Recompute all cubes from scratch"""
+        self.create_tables()
+        cursor = self.connection.cursor()
+        for table in CUBE_TABLES:
+            cursor.execute(f"DELETE FROM {table}")
+        cursor.execute("UPDATE agg_refresh_state SET last_sale_key = 0 WHERE cube_name = 'fact_sales'")
+        self.connection.commit()
+        return self.refresh()
+
+
+def run_rollup_queries(connection, path=ROLLUP_QUERIES_FILE):
+    """Run every named rollup query; returns {name: (columns, rows)}"""
+    results = {}
+    for name, sql in load_named_queries(path):
+        cursor = connection.execute(sql)
+        results[name] = ([col[0] for col in cursor.description], cursor.fetchall())
+    return results
+
+
+def main():
+    connection = sqlite3.connect(DEFAULT_DW_PATH)
+    refresher = SummaryCubeRefresher(connection)
+    refresher.refresh()
+
+    for name, (columns, rows) in run_rollup_queries(connection).items():
+        print(f"\n{name}")
+        print("-" * 70)
+        print(" | ".join(columns))
+        for row in rows:
+            print(" | ".join(str(v) for v in row))
+    connection.close()
+
+
+if __name__ == "__main__":
+    main()
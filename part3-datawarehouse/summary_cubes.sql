@@ -0,0 +1,190 @@
+-- ============================================================================
+-- SUMMARY CUBES (MATERIALIZED AGGREGATES) - FLEXIMART DATA WAREHOUSE
+-- ============================================================================
+-- Database: fleximart_dw
+-- Purpose: Pre-aggregated rollups read by analytics_rollup_queries.sql
+-- Refresh: Incremental - only fact_sales rows with sale_key above the stored
+--          watermark are aggregated and merged into the cubes
+
+USE fleximart_dw;
+
+-- ============================================================================
+-- Cube 1: Daily x Product
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS agg_sales_daily_product (
+    date_key INT NOT NULL,
+    product_key INT NOT NULL,
+    transaction_count INT NOT NULL,
+    quantity_sold INT NOT NULL,
+    discount_amount DECIMAL(14,2) NOT NULL,
+    revenue DECIMAL(14,2) NOT NULL,
+    PRIMARY KEY (date_key, product_key),
+    INDEX idx_adp_product (product_key)
+);
+
+-- ============================================================================
+-- Cube 2: Daily x Customer
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS agg_sales_daily_customer (
+    date_key INT NOT NULL,
+    customer_key INT NOT NULL,
+    transaction_count INT NOT NULL,
+    quantity_sold INT NOT NULL,
+    revenue DECIMAL(14,2) NOT NULL,
+    PRIMARY KEY (date_key, customer_key),
+    INDEX idx_adc_customer (customer_key)
+);
+
+-- ============================================================================
+-- Cube 3: Month x Category
+-- ============================================================================
+CREATE TABLE IF NOT EXISTS agg_sales_month_category (
+    year INT NOT NULL,
+    month INT NOT NULL,
+    quarter VARCHAR(2) NOT NULL,
+    month_name VARCHAR(10) NOT NULL,
+    category VARCHAR(50) NOT NULL,
+    transaction_count INT NOT NULL,
+    quantity_sold INT NOT NULL,
+    revenue DECIMAL(14,2) NOT NULL,
+    PRIMARY KEY (year, month, category)
+);
+
+-- Refresh watermark: highest fact_sales.sale_key already aggregated
+CREATE TABLE IF NOT EXISTS agg_refresh_state (
+    cube_name VARCHAR(50) PRIMARY KEY,
+    last_sale_key BIGINT NOT NULL DEFAULT 0,
+    refreshed_at TIMESTAMP NULL
+);
+
+INSERT IGNORE INTO agg_refresh_state (cube_name, last_sale_key) VALUES ('fact_sales', 0);
+
+-- ============================================================================
+-- Incremental Refresh (run after each fact load)
+-- ============================================================================
+START TRANSACTION;
+
+SET @from_key = (SELECT last_sale_key FROM agg_refresh_state WHERE cube_name = 'fact_sales' FOR UPDATE);
+SET @to_key = (SELECT COALESCE(MAX(sale_key), 0) FROM fact_sales);
+
+INSERT INTO agg_sales_daily_product
+    (date_key, product_key, transaction_count, quantity_sold, discount_amount, revenue)
+SELECT date_key, product_key, COUNT(*), SUM(quantity_sold), SUM(discount_amount), SUM(total_amount)
+FROM fact_sales
+WHERE sale_key > @from_key AND sale_key <= @to_key
+GROUP BY date_key, product_key
+ON DUPLICATE KEY UPDATE
+    transaction_count = transaction_count + VALUES(transaction_count),
+    quantity_sold = quantity_sold + VALUES(quantity_sold),
+    discount_amount = discount_amount + VALUES(discount_amount),
+    revenue = revenue + VALUES(revenue);
+
+INSERT INTO agg_sales_daily_customer
+    (date_key, customer_key, transaction_count, quantity_sold, revenue)
+SELECT date_key, customer_key, COUNT(*), SUM(quantity_sold), SUM(total_amount)
+FROM fact_sales
+WHERE sale_key > @from_key AND sale_key <= @to_key
+GROUP BY date_key, customer_key
+ON DUPLICATE KEY UPDATE
+    transaction_count = transaction_count + VALUES(transaction_count),
+    quantity_sold = quantity_sold + VALUES(quantity_sold),
+    revenue = revenue + VALUES(revenue);
+
+INSERT INTO agg_sales_month_category
+    (year, month, quarter, month_name, category, transaction_count, quantity_sold, revenue)
+SELECT d.year, d.month, d.quarter, d.month_name, p.category,
+       COUNT(*), SUM(f.quantity_sold), SUM(f.total_amount)
+FROM fact_sales f
+JOIN dim_date d ON f.date_key = d.date_key
+JOIN dim_product p ON f.product_key = p.product_key
+WHERE f.sale_key > @from_key AND f.sale_key <= @to_key
+GROUP BY d.year, d.month, d.quarter, d.month_name, p.category
+ON DUPLICATE KEY UPDATE
+    transaction_count = transaction_count + VALUES(transaction_count),
+    quantity_sold = quantity_sold + VALUES(quantity_sold),
+    revenue = revenue + VALUES(revenue);
+
+UPDATE agg_refresh_state
+SET last_sale_key = @to_key, refreshed_at = CURRENT_TIMESTAMP
+WHERE cube_name = 'fact_sales';
+
+COMMIT;
+
+-- ============================================================================
+-- Customer Spend (maintained by the fact loader, see customer_spend.py)
+-- ============================================================================
+-- Lifetime spend and Query 3 segment per customer_id (all SCD2 versions of a
+-- customer share one row). Each fact batch merges its per-customer deltas in
+-- the same transaction as the fact rows; only the touched customers are
+-- re-segmented.
+CREATE TABLE IF NOT EXISTS customer_spend (
+    customer_id VARCHAR(20) PRIMARY KEY,
+    total_spent DECIMAL(14,2) NOT NULL,
+    transaction_count INT NOT NULL,
+    customer_segment VARCHAR(20) NOT NULL,
+    last_sale_key BIGINT NOT NULL,
+    updated_at TIMESTAMP NULL,
+    INDEX idx_cs_segment (customer_segment)
+);
+
+CREATE TABLE IF NOT EXISTS customer_segment_history (
+    customer_id VARCHAR(20) NOT NULL,
+    previous_segment VARCHAR(20) NOT NULL,
+    customer_segment VARCHAR(20) NOT NULL,
+    total_spent DECIMAL(14,2) NOT NULL,
+    sale_key BIGINT NOT NULL,
+    changed_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+    INDEX idx_csh_customer (customer_id)
+);
+
+-- Per batch, inside the transaction that inserts the batch's fact rows
+-- (sale_key in @from_key..@to_key), before its COMMIT:
+CREATE TEMPORARY TABLE spend_delta AS
+SELECT c.customer_id, SUM(f.total_amount) as amount, COUNT(*) as transactions, MAX(f.sale_key) as last_sale_key
+FROM fact_sales f
+JOIN dim_customer c ON f.customer_key = c.customer_key
+WHERE f.sale_key > @from_key AND f.sale_key <= @to_key
+GROUP BY c.customer_id;
+
+INSERT INTO customer_spend
+    (customer_id, total_spent, transaction_count, customer_segment, last_sale_key, updated_at)
+SELECT customer_id, amount, transactions, '', last_sale_key, CURRENT_TIMESTAMP
+FROM spend_delta
+ON DUPLICATE KEY UPDATE
+    total_spent = total_spent + VALUES(total_spent),
+    transaction_count = transaction_count + VALUES(transaction_count),
+    last_sale_key = GREATEST(last_sale_key, VALUES(last_sale_key)),
+    updated_at = CURRENT_TIMESTAMP;
+
+INSERT INTO customer_segment_history
+    (customer_id, previous_segment, customer_segment, total_spent, sale_key)
+SELECT s.customer_id, s.customer_segment, seg.new_segment, s.total_spent, s.last_sale_key
+FROM customer_spend s
+JOIN spend_delta d ON s.customer_id = d.customer_id
+CROSS JOIN LATERAL (
+    SELECT CASE
+        WHEN ROUND(s.total_spent, 2) > 50000 THEN 'High Value'
+        WHEN ROUND(s.total_spent, 2) >= 20000 THEN 'Medium Value'
+        ELSE 'Low Value'
+    END as new_segment
+) seg
+WHERE s.customer_segment <> '' AND s.customer_segment <> seg.new_segment;
+
+UPDATE customer_spend s
+JOIN spend_delta d ON s.customer_id = d.customer_id
+SET s.customer_segment = CASE
+    WHEN ROUND(s.total_spent, 2) > 50000 THEN 'High Value'
+    WHEN ROUND(s.total_spent, 2) >= 20000 THEN 'Medium Value'
+    ELSE 'Low Value'
+END;
+
+UPDATE dim_customer c
+JOIN customer_spend s ON s.customer_id = c.customer_id
+JOIN spend_delta d ON d.customer_id = c.customer_id
+SET c.customer_segment = s.customer_segment;
+
+DROP TEMPORARY TABLE spend_delta;
+
+-- ============================================================================
+-- End of Summary Cubes
+-- ============================================================================
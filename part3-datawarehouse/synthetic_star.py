@@ -0,0 +1,79 @@
+"""
+Synthetic Star-Schema Data for FlexiMart Data Warehouse
+Part 3: Data Warehouse Implementation
+Generates dim_date / dim_product / dim_customer / fact_sales at any scale
+with vectorized NumPy sampling (used by the benchmark scripts)
+"""
+
+import numpy as np
+import pandas as pd
+
+from date_dimension import build_dim_date
+from warehouse_loader import CITY_STATE
+
+CATEGORIES = {
+    'Electronics': ['Smartphones', 'Laptops', 'Audio', 'Monitors', 'Televisions'],
+    'Fashion': ['Footwear', 'Clothing', 'Accessories'],
+    'Groceries': ['Staples', 'Dry Fruits', 'Beverages']
+}
+PRICE_RANGE = {'Electronics': (999, 199999), 'Fashion': (299, 9999), 'Groceries': (49, 1999)}
+SEGMENTS = ['Premium', 'Regular', 'Occasional']
+
+
+def generate_star(fact_rows, products=500, customers=10000,
+                  start='2023-01-01', end='2024-12-31', seed=7):
+    """
+    Return {'dim_date', 'dim_product', 'dim_customer', 'fact_sales'} DataFrames
+    fact_sales has sale_key 1..fact_rows with keys sampled from the dimensions
+    """
+    rng = np.random.default_rng(seed)
+
+    dim_date = build_dim_date(start, end)
+
+    categories = np.array(list(CATEGORIES))
+    product_category = categories[rng.integers(0, len(categories), products)]
+    subcategory = np.array([rng.choice(CATEGORIES[c]) for c in product_category])
+    low = np.array([PRICE_RANGE[c][0] for c in product_category])
+    high = np.array([PRICE_RANGE[c][1] for c in product_category])
+    unit_price = np.round(rng.uniform(low, high), 2)
+    dim_product = pd.DataFrame({
+        'product_key': np.arange(1, products + 1),
+        'product_id': [f"P{i:06d}" for i in range(1, products + 1)],
+        'product_name': [f"Product {i}" for i in range(1, products + 1)],
+        'category': product_category,
+        'subcategory': subcategory,
+        'unit_price': unit_price
+    })
+
+    cities = np.array(list(CITY_STATE))
+    customer_city = cities[rng.integers(0, len(cities), customers)]
+    dim_customer = pd.DataFrame({
+        'customer_key': np.arange(1, customers + 1),
+        'customer_id': [f"C{i:07d}" for i in range(1, customers + 1)],
+        'customer_name': [f"Customer {i}" for i in range(1, customers + 1)],
+        'city': customer_city,
+        'state': [CITY_STATE[c] for c in customer_city],
+        'customer_segment': np.array(SEGMENTS)[rng.integers(0, len(SEGMENTS), customers)]
+    })
+
+    # Skewed product popularity so top-N queries are meaningful
+    product_weights = 1.0 / np.arange(1, products + 1) ** 0.8
+    product_weights /= product_weights.sum()
+    product_idx = rng.choice(products, size=fact_rows, p=product_weights)
+    quantity = rng.integers(1, 6, fact_rows)
+    price = unit_price[product_idx]
+    discount = np.where(rng.random(fact_rows) < 0.3, np.round(price * quantity * 0.1, 2), 0.0)
+
+    fact_sales = pd.DataFrame({
+        'sale_key': np.arange(1, fact_rows + 1),
+        'date_key': dim_date['date_key'].values[rng.integers(0, len(dim_date), fact_rows)],
+        'product_key': product_idx + 1,
+        'customer_key': rng.integers(1, customers + 1, fact_rows),
+        'quantity_sold': quantity,
+        'unit_price': price,
+        'discount_amount': discount,
+        'total_amount': np.round(price * quantity - discount, 2)
+    })
+
+    return {'dim_date': dim_date, 'dim_product': dim_product,
+            'dim_customer': dim_customer, 'fact_sales': fact_sales}
@@ -0,0 +1,546 @@
+"""
+Star Schema Loader for FlexiMart Data Warehouse
+Part 3: Data Warehouse Implementation
+Builds dim_product / dim_customer / dim_date from the cleaned ETL output
+and bulk-loads fact_sales with vectorized surrogate-key resolution.
+SQLite is used as the local target (same tables as warehouse_schema.sql).
+"""
+
+import os
+import shutil
+import sqlite3
+import logging
+import argparse
+
+import numpy as np
+import pandas as pd
+
+from date_dimension import build_dim_date, covering_range, key_to_timestamp
+from summary_cubes import SummaryCubeRefresher, DEFAULT_DW_PATH
+from customer_spend import CustomerSpendTable
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ETL_DIR = os.path.join(PROJECT_ROOT, 'part1-database-etl')
+
+# City -> state lookup for dim_customer.state
+CITY_STATE = {
+    'Ahmedabad': 'Gujarat',
+    'Bangalore': 'Karnataka',
+    'Chandigarh': 'Chandigarh',
+    'Chennai': 'Tamil Nadu',
+    'Delhi': 'Delhi',
+    'Hyderabad': 'Telangana',
+    'Indore': 'Madhya Pradesh',
+    'Jaipur': 'Rajasthan',
+    'Kochi': 'Kerala',
+    'Kolkata': 'West Bengal',
+    'Lucknow': 'Uttar Pradesh',
+    'Mumbai': 'Maharashtra',
+    'Pune': 'Maharashtra',
+    'Trivandrum': 'Kerala'
+}
+
+# SQLite dialect of warehouse_schema.sql (REAL for money columns so SQLite
+# division/averages behave like MySQL DECIMAL instead of integer arithmetic)
+SQLITE_SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS dim_date (
+        date_key INTEGER PRIMARY KEY,
+        full_date DATE NOT NULL UNIQUE,
+        day_of_week VARCHAR(10),
+        day_of_month INTEGER,
+        month INTEGER,
+        month_name VARCHAR(10),
+        quarter VARCHAR(2),
+        year INTEGER,
+        is_weekend BOOLEAN
+    )""",
+    """CREATE TABLE IF NOT EXISTS dim_product (
+        product_key INTEGER PRIMARY KEY,
+        product_id VARCHAR(20),
+        product_name VARCHAR(100),
+        category VARCHAR(50),
+        subcategory VARCHAR(50),
+        unit_price REAL,
+        effective_date DATE NOT NULL DEFAULT '1900-01-01',
+        expiry_date DATE NOT NULL DEFAULT '9999-12-31',
+        is_current BOOLEAN NOT NULL DEFAULT 1,
+        row_hash INTEGER,
+        UNIQUE (product_id, effective_date)
+    )""",
+    """CREATE TABLE IF NOT EXISTS dim_customer (
+        customer_key INTEGER PRIMARY KEY,
+        customer_id VARCHAR(20),
+        customer_name VARCHAR(100),
+        city VARCHAR(50),
+        state VARCHAR(50),
+        customer_segment VARCHAR(20),
+        effective_date DATE NOT NULL DEFAULT '1900-01-01',
+        expiry_date DATE NOT NULL DEFAULT '9999-12-31',
+        is_current BOOLEAN NOT NULL DEFAULT 1,
+        row_hash INTEGER,
+        UNIQUE (customer_id, effective_date)
+    )""",
+    """CREATE TABLE IF NOT EXISTS fact_sales (
+        sale_key INTEGER PRIMARY KEY AUTOINCREMENT,
+        date_key INTEGER NOT NULL REFERENCES dim_date(date_key),
+        product_key INTEGER NOT NULL REFERENCES dim_product(product_key),
+        customer_key INTEGER NOT NULL REFERENCES dim_customer(customer_key),
+        quantity_sold INTEGER NOT NULL,
+        unit_price REAL NOT NULL,
+        discount_amount REAL DEFAULT 0,
+        total_amount REAL NOT NULL
+    )""",
+    "CREATE INDEX IF NOT EXISTS idx_date_key ON fact_sales(date_key)",
+    "CREATE INDEX IF NOT EXISTS idx_product_key ON fact_sales(product_key)",
+    "CREATE INDEX IF NOT EXISTS idx_customer_key ON fact_sales(customer_key)",
+    "CREATE INDEX IF NOT EXISTS idx_fs_date_product ON fact_sales(date_key, product_key)",
+    "CREATE INDEX IF NOT EXISTS idx_fs_date_customer ON fact_sales(date_key, customer_key)",
+    "CREATE INDEX IF NOT EXISTS idx_fs_product_category ON dim_product(category)",
+    "CREATE INDEX IF NOT EXISTS idx_fs_customer_city ON dim_customer(city)",
+    "CREATE INDEX IF NOT EXISTS idx_product_current ON dim_product(product_id, is_current)",
+    "CREATE INDEX IF NOT EXISTS idx_customer_current ON dim_customer(customer_id, is_current)"
+]
+
+# SCD Type 2: the first version of a member is valid from SCD_START so older
+# facts still resolve; current versions expire at SCD_END
+SCD_START = '1900-01-01'
+SCD_END = '9999-12-31'
+
+# table -> (natural key, surrogate key, attributes whose change creates a new version)
+SCD_DIMENSIONS = {
+    'dim_product': ('product_id', 'product_key', ['product_name', 'category', 'subcategory', 'unit_price']),
+    'dim_customer': ('customer_id', 'customer_key', ['customer_name', 'city', 'state'])
+}
+
+FACT_COLUMNS = ['date_key', 'product_key', 'customer_key', 'quantity_sold',
+                'unit_price', 'discount_amount', 'total_amount']
+
+
+def row_hashes(frame, columns):
+    """
+    Vectorized 64-bit hash of the tracked attributes of every row
+    (strings and rounded prices are normalized so reloads hash identically)
+    """
+    normalized = pd.DataFrame({
+        col: (frame[col].astype(float).round(2) if pd.api.types.is_numeric_dtype(frame[col])
+              else frame[col].astype(object).where(frame[col].notna(), '').astype(str))
+        for col in columns
+    })
+    return pd.util.hash_pandas_object(normalized, index=False).to_numpy().view(np.int64)
+
+
+def date_keys(dates):
+    """Vectorized YYYYMMDD integer keys for a Series of dates"""
+    dates = pd.to_datetime(dates)
+    return (dates.dt.year * 10000 + dates.dt.month * 100 + dates.dt.day).astype('int64')
+
+
+class WarehouseLoader:
+    """
+    Loads cleaned ETLPipeline frames into the star schema
+    - Surrogate keys are assigned by the loader and kept in memory
+      (product_id -> product_key, customer_id -> customer_key for the
+      current versions, plus every version with its effective_date)
+    - dim_product / dim_customer are SCD Type 2: incoming rows are hashed and
+      diffed against the current versions in one vectorized merge; changed
+      members get their current row expired and a new version inserted
+    - Fact foreign keys resolve to the version valid on the order date
+      (as-of merge on effective_date)
+    - fact_sales is inserted with executemany in batches
+    - Each fact batch also updates customer_spend (lifetime spend and
+      segment per customer_id) with per-customer deltas, in the same
+      transaction as the fact rows
+    - With a PartitionedFactStore, the same fact rows (same sale_key) are
+      also written straight into their month partitions
+    """
+
+    def __init__(self, connection, batch_size=10000, exclude_statuses=('Cancelled',),
+                 partition_store=None):
+        """Initialize loader on an open DB-API connection (sqlite3 locally)"""
+        self.connection = connection
+        self.partition_store = partition_store
+        self.customer_spend = CustomerSpendTable(connection)
+        self.batch_size = batch_size
+        self.exclude_statuses = set(exclude_statuses)
+        self.product_keys = {}
+        self.customer_keys = {}
+        self.versions = {}          # table -> DataFrame(natural key, surrogate key, effective_date, row_hash, is_current)
+        self.known_date_keys = set()
+        self.date_coverage = None   # (min_key, max_key) with every day present
+        self.load_report = {'dim_product': 0, 'dim_customer': 0, 'dim_date': 0,
+                            'dim_product_changed': 0, 'dim_customer_changed': 0,
+                            'fact_sales': 0, 'fact_rejected': 0, 'segment_transitions': 0}
+
+    @classmethod
+    def open_sqlite(cls, db_path=DEFAULT_DW_PATH, **kwargs):
+        """Open (or create) a SQLite warehouse and return a ready loader"""
+        connection = sqlite3.connect(db_path)
+        connection.execute("PRAGMA foreign_keys = ON")
+        loader = cls(connection, **kwargs)
+        loader.create_schema()
+        return loader
+
+    def create_schema(self):
+        """Create star schema tables if missing and load existing key maps"""
+        cursor = self.connection.cursor()
+        for statement in SQLITE_SCHEMA:
+            cursor.execute(statement)
+        self.connection.commit()
+        self.customer_spend.create_tables()
+        has_spend = cursor.execute("SELECT 1 FROM customer_spend LIMIT 1").fetchone()
+        if not has_spend and cursor.execute("SELECT 1 FROM fact_sales LIMIT 1").fetchone():
+            self.customer_spend.rebuild()
+        self._load_key_maps()
+
+    def _load_key_maps(self):
+        """Rebuild in-memory surrogate key maps from the dimension tables"""
+        cursor = self.connection.cursor()
+        for table, (natural_key, surrogate_key, _) in SCD_DIMENSIONS.items():
+            self.versions[table] = pd.read_sql_query(
+                f"SELECT {natural_key}, {surrogate_key}, effective_date, row_hash, is_current "
+                f"FROM {table} ORDER BY {surrogate_key}", self.connection)
+        self._refresh_current_keys()
+        self.known_date_keys = {row[0] for row in cursor.execute("SELECT date_key FROM dim_date")}
+        self.date_coverage = None
+        if self.known_date_keys:
+            lo, hi = min(self.known_date_keys), max(self.known_date_keys)
+            days = (key_to_timestamp(hi) - key_to_timestamp(lo)).days + 1
+            if days == len(self.known_date_keys):
+                self.date_coverage = (lo, hi)
+
+    def _refresh_current_keys(self):
+        """natural id -> current surrogate key maps from the version frames"""
+        for table, attr in [('dim_product', 'product_keys'), ('dim_customer', 'customer_keys')]:
+            natural_key, surrogate_key, _ = SCD_DIMENSIONS[table]
+            current = self.versions[table][self.versions[table]['is_current'] == 1]
+            setattr(self, attr, dict(zip(current[natural_key], current[surrogate_key].astype('int64').tolist())))
+
+    def _next_key(self, table):
+        _, surrogate_key, _ = SCD_DIMENSIONS[table]
+        keys = self.versions[table][surrogate_key]
+        return int(keys.max()) + 1 if len(keys) else 1
+
+    # ------------------------------------------------------------------
+    # Dimensions (SCD Type 2)
+    # ------------------------------------------------------------------
+    def apply_scd2(self, table, incoming, as_of=None):
+        """
+        Merge incoming dimension rows (natural key + attributes) into table
+        - new natural keys: first version, effective from SCD_START
+        - tracked attributes changed: current row expires the day before
+          as_of and a new version starts on as_of (a second change on the
+          same day overwrites that day's version in place)
+        - unchanged rows are skipped
+        Returns (new members, changed members)
+        """
+        natural_key, surrogate_key, tracked = SCD_DIMENSIONS[table]
+        as_of = pd.Timestamp(as_of or pd.Timestamp.today()).normalize()
+        effective = as_of.strftime('%Y-%m-%d')
+        expiry = (as_of - pd.Timedelta(days=1)).strftime('%Y-%m-%d')
+
+        incoming = incoming.drop_duplicates(subset=[natural_key], keep='last').reset_index(drop=True)
+        incoming['row_hash'] = row_hashes(incoming, tracked)
+
+        versions = self.versions[table]
+        current = versions.loc[versions['is_current'] == 1,
+                               [natural_key, surrogate_key, 'effective_date', 'row_hash']]
+        diff = incoming.merge(current, on=natural_key, how='left', suffixes=('', '_current'))
+        is_new = diff[surrogate_key].isna().to_numpy()
+        changed = ~is_new & (diff['row_hash'] != diff['row_hash_current']).to_numpy()
+        same_day = changed & (diff['effective_date'] == effective).to_numpy()
+        new_version = changed & ~same_day
+        if not (is_new.any() or changed.any()):
+            return 0, 0
+
+        cursor = self.connection.cursor()
+        attributes = [col for col in incoming.columns if col != natural_key]
+        if same_day.any():
+            overwrite = diff[same_day]
+            cursor.executemany(
+                f"UPDATE {table} SET {', '.join(f'{col} = ?' for col in attributes)} WHERE {surrogate_key} = ?",
+                (overwrite[attributes + [surrogate_key]].astype(object)
+                 .where(overwrite[attributes + [surrogate_key]].notna(), None)
+                 .itertuples(index=False, name=None)))
+        expired_keys = diff.loc[new_version, surrogate_key].astype('int64').tolist()
+        if expired_keys:
+            cursor.executemany(
+                f"UPDATE {table} SET expiry_date = ?, is_current = 0 WHERE {surrogate_key} = ?",
+                [(expiry, key) for key in expired_keys])
+
+        inserts = diff[is_new | new_version]
+        start = self._next_key(table)
+        rows = inserts[[natural_key] + attributes].copy()
+        rows.insert(0, surrogate_key, range(start, start + len(rows)))
+        rows['effective_date'] = np.where(is_new[is_new | new_version], SCD_START, effective)
+        rows['expiry_date'] = SCD_END
+        rows['is_current'] = 1
+        self._insert_rows(table, rows)   # commits the expiry updates with the first batch
+
+        # Keep the in-memory version frames in step with the table
+        if same_day.any():
+            hashes = dict(zip(diff.loc[same_day, surrogate_key].astype('int64'), diff.loc[same_day, 'row_hash']))
+            mask = versions[surrogate_key].isin(list(hashes))
+            versions.loc[mask, 'row_hash'] = versions.loc[mask, surrogate_key].map(hashes)
+        versions.loc[versions[surrogate_key].isin(expired_keys), 'is_current'] = 0
+        self.versions[table] = pd.concat(
+            [versions, rows[[natural_key, surrogate_key, 'effective_date', 'row_hash', 'is_current']]],
+            ignore_index=True)
+        self._refresh_current_keys()
+
+        n_new, n_changed = int(is_new.sum()), int(changed.sum())
+        if n_changed:
+            logging.info("%s: %s changed members (%s new versions) as of %s",
+                         table, n_changed, len(expired_keys), effective)
+        return n_new, n_changed
+
+    def load_dim_product(self, products_df, as_of=None):
+        """SCD2 merge of products into dim_product; returns rows inserted"""
+        incoming = pd.DataFrame({
+            'product_id': products_df['product_id'].values,
+            'product_name': products_df['product_name'].values,
+            'category': products_df['category'].values,
+            'subcategory': products_df['subcategory'].values if 'subcategory' in products_df else None,
+            'unit_price': products_df['price'].astype(float).round(2).values
+        })
+        new, changed = self.apply_scd2('dim_product', incoming, as_of)
+        self.load_report['dim_product'] += new
+        self.load_report['dim_product_changed'] += changed
+        return new + changed
+
+    def load_dim_customer(self, customers_df, as_of=None):
+        """SCD2 merge of customers into dim_customer; returns rows inserted"""
+        incoming = pd.DataFrame({
+            'customer_id': customers_df['customer_id'].values,
+            'customer_name': (customers_df['first_name'].fillna('') + ' ' +
+                              customers_df['last_name'].fillna('')).str.strip().values,
+            'city': customers_df['city'].values,
+            'state': customers_df['city'].map(CITY_STATE).values
+        })
+        new, changed = self.apply_scd2('dim_customer', incoming, as_of)
+        if changed:
+            # customer_segment is maintained by customer_spend, not the source;
+            # new versions take it from there even when the batch has no sales for them
+            self.customer_spend.sync_segments(incoming['customer_id'])
+            self.connection.commit()
+        self.load_report['dim_customer'] += new
+        self.load_report['dim_customer_changed'] += changed
+        return new + changed
+
+    def ensure_dates(self, keys):
+        """
+        Make sure dim_date covers every date key in keys
+        Fast path: a min/max check against the contiguous covered range.
+        Otherwise whole calendar years spanning the new keys are generated
+        in one vectorized pass and only rows not already present are inserted.
+        """
+        keys = pd.Series(keys)
+        if keys.empty:
+            return 0
+        lo, hi = int(keys.min()), int(keys.max())
+        if self.date_coverage and self.date_coverage[0] <= lo and hi <= self.date_coverage[1]:
+            return 0
+
+        if self.date_coverage:
+            lo, hi = min(lo, self.date_coverage[0]), max(hi, self.date_coverage[1])
+        elif self.known_date_keys:
+            lo, hi = min(lo, min(self.known_date_keys)), max(hi, max(self.known_date_keys))
+        start, end = covering_range(lo, hi)
+        rows = build_dim_date(start, end)
+        rows = rows[~rows['date_key'].isin(self.known_date_keys)]
+
+        self._insert_rows('dim_date', rows)
+        self.known_date_keys.update(rows['date_key'].tolist())
+        self.date_coverage = (int(start.strftime('%Y%m%d')), int(end.strftime('%Y%m%d')))
+        self.load_report['dim_date'] += len(rows)
+        logging.info("dim_date extended by %s rows to cover %s", len(rows), self.date_coverage)
+        return len(rows)
+
+    # ------------------------------------------------------------------
+    # Facts
+    # ------------------------------------------------------------------
+    def build_fact_rows(self, orders_df):
+        """
+        Resolve surrogate keys for cleaned orders with vectorized joins
+        Returns (fact rows, rejected rows); fact rows keep the index labels
+        of the order rows they came from
+        """
+        orders = orders_df
+        if 'status' in orders and self.exclude_statuses:
+            orders = orders[~orders['status'].isin(self.exclude_statuses)]
+        orders = orders.dropna(subset=['order_date'])
+
+        facts = orders.assign(_row=np.arange(len(orders)), _order_ts=pd.to_datetime(orders['order_date']))
+        for table in ['dim_product', 'dim_customer']:
+            facts = self._resolve_versions(facts, table)
+        facts = facts.sort_values('_row')
+        resolved = facts['product_key'].notna() & facts['customer_key'].notna()
+        rejected = facts[~resolved]
+        facts = facts[resolved]
+
+        quantity = facts['quantity'].astype('int64')
+        unit_price = facts['unit_price'].astype(float)
+        discount = facts['discount_amount'].astype(float) if 'discount_amount' in facts else 0.0
+        rows = pd.DataFrame({
+            'date_key': date_keys(facts['order_date']),
+            'product_key': facts['product_key'].astype('int64'),
+            'customer_key': facts['customer_key'].astype('int64'),
+            'quantity_sold': quantity,
+            'unit_price': unit_price,
+            'discount_amount': discount,
+            'total_amount': (quantity * unit_price - discount).round(2)
+        })
+        rows.index = orders.index[facts['_row'].to_numpy()]
+        return rows[FACT_COLUMNS], rejected
+
+    def _resolve_versions(self, facts, table):
+        """As-of merge: surrogate key of the version effective on each order date"""
+        natural_key, surrogate_key, _ = SCD_DIMENSIONS[table]
+        versions = self.versions[table][[natural_key, surrogate_key, 'effective_date']]
+        versions = versions.assign(_effective_ts=pd.to_datetime(versions['effective_date']),
+                                   **{natural_key: versions[natural_key].astype(object)})
+        facts = pd.merge_asof(
+            facts.assign(**{natural_key: facts[natural_key].astype(object)}).sort_values('_order_ts'),
+            versions[[natural_key, surrogate_key, '_effective_ts']].sort_values('_effective_ts'),
+            left_on='_order_ts', right_on='_effective_ts', by=natural_key, direction='backward')
+        return facts.drop(columns='_effective_ts')
+
+    def load_fact_sales(self, orders_df):
+        """Bulk-load fact_sales from cleaned orders; returns number inserted"""
+        rows, rejected = self.build_fact_rows(orders_df)
+        if len(rejected):
+            logging.warning("Rejected %s fact rows with unresolved product/customer keys", len(rejected))
+            print(f"[WARNING] Rejected {len(rejected)} fact rows with unresolved product/customer keys")
+            self.load_report['fact_rejected'] += len(rejected)
+        return len(self.append_facts(rows))
+
+    def append_facts(self, rows, before_commit=None):
+        """
+        Insert resolved fact rows under new sale_keys and apply the batch to
+        customer_spend in one transaction, then feed the partition store;
+        returns rows with sale_key
+        before_commit(rows) runs inside that transaction, for bookkeeping
+        that must commit with the facts
+        """
+        self.ensure_dates(rows['date_key'])
+        # AUTOINCREMENT high-water mark: keys of deleted rows (cdc_feed.py) are
+        # never reused, since the cube watermark may already have passed them
+        next_sale_key = self.connection.execute(
+            "SELECT MAX(COALESCE((SELECT MAX(sale_key) FROM fact_sales), 0), "
+            "COALESCE((SELECT seq FROM sqlite_sequence WHERE name = 'fact_sales'), 0)) + 1").fetchone()[0]
+        rows = rows.copy()
+        rows.insert(0, 'sale_key', range(next_sale_key, next_sale_key + len(rows)))
+        try:
+            inserted = self._insert_rows('fact_sales', rows, commit=False)
+            _, transitions = self.customer_spend.apply_batch(rows)
+            if before_commit is not None:
+                before_commit(rows)
+            self.connection.commit()
+        except Exception as e:
+            self.connection.rollback()
+            logging.error("Fact batch rolled back: %s", e)
+            raise
+        self.load_report['fact_sales'] += inserted
+        self.load_report['segment_transitions'] += transitions
+
+        if self.partition_store is not None and inserted:
+            self.partition_store.write_dimensions(self.read_dimensions())
+            written = self.partition_store.append(rows)
+            print(f"[SUCCESS] Wrote {inserted} fact rows into {len(written)} month partition(s)")
+        return rows
+
+    def read_dimensions(self):
+        """Current dimension tables as {'date', 'product', 'customer'} DataFrames"""
+        return {alias: pd.read_sql_query(f"SELECT * FROM dim_{alias}", self.connection)
+                for alias in ['date', 'product', 'customer']}
+
+    def _insert_rows(self, table, rows, commit=True):
+        """
+        executemany in batches of batch_size, one transaction per batch
+        (commit=False leaves every batch in the caller's open transaction)
+        """
+        columns = list(rows.columns)
+        sql = f"INSERT INTO {table} ({', '.join(columns)}) VALUES ({', '.join('?' * len(columns))})"
+        records = rows.astype(object).where(rows.notna(), None).itertuples(index=False, name=None)
+        cursor = self.connection.cursor()
+        batch = []
+        inserted = 0
+        for record in records:
+            batch.append(record)
+            if len(batch) >= self.batch_size:
+                cursor.executemany(sql, batch)
+                if commit:
+                    self.connection.commit()
+                inserted += len(batch)
+                batch = []
+        if batch:
+            cursor.executemany(sql, batch)
+            if commit:
+                self.connection.commit()
+            inserted += len(batch)
+        return inserted
+
+    # ------------------------------------------------------------------
+    # Entry points
+    # ------------------------------------------------------------------
+    def load(self, customers_df, products_df, orders_df, as_of=None):
+        """Load dimensions (SCD2 as of as_of, default today) then facts from cleaned frames"""
+        print("\n" + "="*70)
+        print("WAREHOUSE LOAD - Star schema from cleaned ETL output")
+        print("="*70)
+
+        self.load_dim_product(products_df, as_of)
+        self.load_dim_customer(customers_df, as_of)
+        self.load_fact_sales(orders_df)
+
+        for table, count in self.load_report.items():
+            print(f"   {table:<22} {count:>10}")
+        logging.info("Warehouse load complete: %s", self.load_report)
+        return self.load_report
+
+    def load_from_pipeline(self, pipeline):
+        """Load from an ETLPipeline after run_pipeline()"""
+        to_pandas = pipeline.backend.to_pandas
+        return self.load(to_pandas(pipeline.customers_df), to_pandas(pipeline.products_df),
+                         to_pandas(pipeline.orders_df))
+
+    def load_from_csv(self, directory=ETL_DIR):
+        """Load from the *_cleaned.csv files written by the ETL pipeline"""
+        customers = pd.read_csv(os.path.join(directory, 'customers_cleaned.csv'))
+        products = pd.read_csv(os.path.join(directory, 'products_cleaned.csv'))
+        orders = pd.read_csv(os.path.join(directory, 'orders_cleaned.csv'))
+        return self.load(customers, products, orders)
+
+    def close(self):
+        if self.connection:
+            self.connection.close()
+
+
+def main(argv=None):
+    """Load the cleaned ETL output into a fresh local SQLite fleximart_dw"""
+    parser = argparse.ArgumentParser(description='Load cleaned ETL output into the star schema')
+    parser.add_argument('--partition-dir', help='also write fact_sales into a month-partitioned store')
+    args = parser.parse_args(argv)
+
+    store = None
+    if args.partition_dir:
+        from fact_partitions import PartitionedFactStore, is_partition_store
+        # Only a previous partition store is replaced; never delete anything else the path holds
+        if os.path.isdir(args.partition_dir) and is_partition_store(args.partition_dir):
+            shutil.rmtree(args.partition_dir)
+        elif os.path.exists(args.partition_dir) and not (os.path.isdir(args.partition_dir)
+                                                         and not os.listdir(args.partition_dir)):
+            parser.error(f"--partition-dir {args.partition_dir} exists and is not a partitioned fact store; "
+                         "choose a new or empty directory")
+        store = PartitionedFactStore(args.partition_dir)
+
+    if os.path.exists(DEFAULT_DW_PATH):
+        os.remove(DEFAULT_DW_PATH)
+    loader = WarehouseLoader.open_sqlite(DEFAULT_DW_PATH, partition_store=store)
+    loader.load_from_csv(ETL_DIR)
+    SummaryCubeRefresher(loader.connection).refresh()
+    loader.close()
+    print(f"\n[SUCCESS] Warehouse written to {DEFAULT_DW_PATH}")
+
+
+if __name__ == "__main__":
+    main()
@@ -31,6 +31,8 @@ CREATE TABLE dim_date (
 );
 
 -- Dimension 2: Product Dimension
+-- SCD Type 2: one row per version of a product; a change to name, category,
+-- subcategory or price expires the current row and inserts a new one
 CREATE TABLE dim_product (
     product_key INT PRIMARY KEY AUTO_INCREMENT,
     product_id VARCHAR(20),
@@ -38,10 +40,16 @@ CREATE TABLE dim_product (
     category VARCHAR(50),
     subcategory VARCHAR(50),
     unit_price DECIMAL(10,2),
-    UNIQUE KEY uk_product_id (product_id)
+    effective_date DATE NOT NULL DEFAULT '1900-01-01',
+    expiry_date DATE NOT NULL DEFAULT '9999-12-31',
+    is_current BOOLEAN NOT NULL DEFAULT TRUE,
+    row_hash BIGINT,
+    UNIQUE KEY uk_product_version (product_id, effective_date),
+    INDEX idx_product_current (product_id, is_current)
 );
 
 -- Dimension 3: Customer Dimension
+-- SCD Type 2: a change to name, city or state creates a new version
 CREATE TABLE dim_customer (
     customer_key INT PRIMARY KEY AUTO_INCREMENT,
     customer_id VARCHAR(20),
@@ -49,7 +57,12 @@ CREATE TABLE dim_customer (
     city VARCHAR(50),
     state VARCHAR(50),
     customer_segment VARCHAR(20),
-    UNIQUE KEY uk_customer_id (customer_id)
+    effective_date DATE NOT NULL DEFAULT '1900-01-01',
+    expiry_date DATE NOT NULL DEFAULT '9999-12-31',
+    is_current BOOLEAN NOT NULL DEFAULT TRUE,
+    row_hash BIGINT,
+    UNIQUE KEY uk_customer_version (customer_id, effective_date),
+    INDEX idx_customer_current (customer_id, is_current)
 );
 
 -- ============================================================================
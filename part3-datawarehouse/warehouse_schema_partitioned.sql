@@ -0,0 +1,105 @@
+-- ============================================================================
+-- PARTITIONED FACT TABLE - FLEXIMART DATA WAREHOUSE
+-- ============================================================================
+-- Database: fleximart_dw
+-- Purpose: Month RANGE partitions on fact_sales.date_key so queries bounded
+--          by month / quarter / year only scan the partitions they touch
+-- Replaces: the fact_sales definition in warehouse_schema.sql (dimensions
+--           are unchanged; run warehouse_schema.sql first)
+--
+-- MySQL restrictions on partitioned InnoDB tables:
+-- - every unique key must include the partitioning column, so the primary
+--   key becomes (sale_key, date_key)
+-- - foreign keys are not supported; dimension references are enforced by
+--   the loader (warehouse_loader.py resolves every key before inserting)
+
+USE fleximart_dw;
+
+DROP TABLE IF EXISTS fact_sales;
+
+CREATE TABLE fact_sales (
+    sale_key INT NOT NULL AUTO_INCREMENT,
+    date_key INT NOT NULL,
+    product_key INT NOT NULL,
+    customer_key INT NOT NULL,
+    quantity_sold INT NOT NULL,
+    unit_price DECIMAL(10,2) NOT NULL,
+    discount_amount DECIMAL(10,2) DEFAULT 0,
+    total_amount DECIMAL(10,2) NOT NULL,
+    PRIMARY KEY (sale_key, date_key),
+    INDEX idx_date_key (date_key),
+    INDEX idx_product_key (product_key),
+    INDEX idx_customer_key (customer_key),
+    INDEX idx_fs_date_product (date_key, product_key),
+    INDEX idx_fs_date_customer (date_key, customer_key)
+)
+PARTITION BY RANGE (date_key) (
+    PARTITION p_history VALUES LESS THAN (20240101),
+    PARTITION p2024_01 VALUES LESS THAN (20240201),
+    PARTITION p2024_02 VALUES LESS THAN (20240301),
+    PARTITION p2024_03 VALUES LESS THAN (20240401),
+    PARTITION p2024_04 VALUES LESS THAN (20240501),
+    PARTITION p2024_05 VALUES LESS THAN (20240601),
+    PARTITION p2024_06 VALUES LESS THAN (20240701),
+    PARTITION p2024_07 VALUES LESS THAN (20240801),
+    PARTITION p2024_08 VALUES LESS THAN (20240901),
+    PARTITION p2024_09 VALUES LESS THAN (20241001),
+    PARTITION p2024_10 VALUES LESS THAN (20241101),
+    PARTITION p2024_11 VALUES LESS THAN (20241201),
+    PARTITION p2024_12 VALUES LESS THAN (20250101),
+    PARTITION p2025_01 VALUES LESS THAN (20250201),
+    PARTITION p2025_02 VALUES LESS THAN (20250301),
+    PARTITION p2025_03 VALUES LESS THAN (20250401),
+    PARTITION p2025_04 VALUES LESS THAN (20250501),
+    PARTITION p2025_05 VALUES LESS THAN (20250601),
+    PARTITION p2025_06 VALUES LESS THAN (20250701),
+    PARTITION p2025_07 VALUES LESS THAN (20250801),
+    PARTITION p2025_08 VALUES LESS THAN (20250901),
+    PARTITION p2025_09 VALUES LESS THAN (20251001),
+    PARTITION p2025_10 VALUES LESS THAN (20251101),
+    PARTITION p2025_11 VALUES LESS THAN (20251201),
+    PARTITION p2025_12 VALUES LESS THAN (20260101),
+    PARTITION p_future VALUES LESS THAN MAXVALUE
+);
+
+-- ============================================================================
+-- Partition Maintenance
+-- ============================================================================
+
+-- New month: split p_future before loading data past the last partition
+-- (fact_partitions.reorganize_statement() generates this for any months)
+-- ALTER TABLE fact_sales REORGANIZE PARTITION p_future INTO (
+--     PARTITION p2026_01 VALUES LESS THAN (20260201),
+--     PARTITION p_future VALUES LESS THAN MAXVALUE
+-- );
+
+-- Retention: dropping a month is a metadata operation, not a DELETE
+-- ALTER TABLE fact_sales DROP PARTITION p2024_01;
+
+-- Check pruning: the partitions column should list only the touched months
+EXPLAIN
+SELECT SUM(f.total_amount)
+FROM fact_sales f
+WHERE f.date_key BETWEEN 20240401 AND 20240630;
+
+-- Queries filtered on dim_date attributes prune when the date_key range is
+-- stated on fact_sales (MySQL prunes on the partitioning column only)
+SELECT
+    d.month_name,
+    ROUND(SUM(f.total_amount), 2) as revenue
+FROM fact_sales f
+JOIN dim_date d ON f.date_key = d.date_key
+WHERE d.year = 2024 AND d.quarter = 'Q2'
+  AND f.date_key BETWEEN 20240401 AND 20240630
+GROUP BY d.month, d.month_name
+ORDER BY d.month;
+
+-- Rows per partition
+SELECT partition_name, table_rows
+FROM information_schema.partitions
+WHERE table_schema = 'fleximart_dw' AND table_name = 'fact_sales'
+ORDER BY partition_ordinal_position;
+
+-- ============================================================================
+-- End of Partitioned Fact Table
+-- ============================================================================